@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the backtester's hot paths.
+
+Each benchmark times the current implementation against a reference copy of
+the original (naive) implementation and checks both produce the same output.
+Prices are rounded to cents, so two moving averages, or a price and a
+threshold band around its mean, can be exactly equal; at those ties the float
+result depends on summation order and is reported as a tie rather than a
+mismatch.
+
+    python benchmark.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src import data_loader
+from src.data_generator import (
+    generate_market_csv,
+    market_data_generator,
+    write_market_data,
+)
+from src.engine import Engine, backtest
+from src.models import MarketDataPoint, Order, Portfolio, Signal
+from src.reporting import compute_metrics
+from src.reporting.history import PortfolioHistory
+from src.strategies import (
+    SimpleMovingAverageCrossoverStrategy,
+    MeanReversionStrategy,
+)
+
+
+class NaiveSimpleMovingAverageCrossoverStrategy:
+    """Original SMA crossover: keeps every price and re-sums both windows."""
+
+    def __init__(self, short_window: int, long_window: int):
+        self._prices = {}
+        self._short_window = short_window
+        self._long_window = long_window
+
+    def generate_signals(self, tick):
+        prices = self._prices.setdefault(tick.symbol, [])
+        price = float(tick.price)
+        prices.append(price)
+
+        if len(prices) >= self._long_window:
+            short_ma = sum(prices[-self._short_window :]) / self._short_window
+            long_ma = sum(prices[-self._long_window :]) / self._long_window
+            if short_ma > long_ma:
+                return [Signal("BUY", tick.symbol, 1, price)]
+            elif short_ma < long_ma:
+                return [Signal("SELL", tick.symbol, 1, price)]
+        return [Signal("HOLD", tick.symbol, 0, price)]
+
+
+class NaiveMeanReversionStrategy:
+    """Original mean reversion: list window trimmed with pop(0)."""
+
+    def __init__(self, mean_length: int = 20, threshold: float = 0.05):
+        self._prices = {}
+        self._mean_length = mean_length
+        self._threshold = threshold
+
+    def generate_signals(self, tick):
+        prices = self._prices.setdefault(tick.symbol, [])
+        price = float(tick.price)
+        prices.append(price)
+        if len(prices) > self._mean_length:
+            prices.pop(0)
+
+        if len(prices) >= self._mean_length:
+            mean_price = sum(prices) / self._mean_length
+            if price < mean_price * (1 - self._threshold):
+                return [Signal("BUY", tick.symbol, 1, price)]
+            elif price > mean_price * (1 + self._threshold):
+                return [Signal("SELL", tick.symbol, 1, price)]
+        return []
+
+
+def generated_ticks(num_ticks: int, symbols=("AAPL", "MSFT", "GOOG"), seed: int = 0):
+    """Interleaved ticks from the project's data generator (no sleeping)."""
+    random.seed(seed)
+    feeds = [
+        market_data_generator(symbol, 100.0 + 50 * i, volatility=0.01, interval=0.0)
+        for i, symbol in enumerate(symbols)
+    ]
+    per_symbol = num_ticks // len(symbols)
+    return [next(feed) for _ in range(per_symbol) for feed in feeds]
+
+
+def run_signals(strategy, ticks):
+    return [signal for tick in ticks for signal in strategy.generate_signals(tick)]
+
+
+def run_tick_signals(strategy, ticks):
+    """Signals of each tick, so a tie on one tick cannot shift the others."""
+    return [strategy.generate_signals(tick) for tick in ticks]
+
+
+def sma_tie_checker(short_window: int, long_window: int, tolerance: float = 1e-12):
+    """
+    Returns is_tie(ticks, indices) -> bool telling whether the short and long
+    averages at every given tick are equal up to float rounding. At such ties
+    the signal depends only on summation order, so the naive and rolling sums
+    may legitimately break them differently.
+    """
+
+    def is_tie(ticks, indices):
+        history, wanted = {}, set(indices)
+        for i, tick in enumerate(ticks[: max(indices) + 1]):
+            prices = history.setdefault(tick.symbol, [])
+            prices.append(tick.price)
+            if i in wanted:
+                short_ma = sum(prices[-short_window:]) / short_window
+                long_ma = sum(prices[-long_window:]) / long_window
+                if abs(short_ma - long_ma) > tolerance * tick.price:
+                    return False
+        return True
+
+    return is_tie
+
+
+def mean_reversion_tie_checker(
+    mean_length: int, threshold: float, tolerance: float = 1e-12
+):
+    """
+    Returns is_tie(ticks, indices) -> bool telling whether the price at every
+    given tick sits on the buy or sell threshold of its mean up to float
+    rounding, where the naive and rolling sums may break the tie differently.
+    """
+
+    def is_tie(ticks, indices):
+        history, wanted = {}, set(indices)
+        for i, tick in enumerate(ticks[: max(indices) + 1]):
+            prices = history.setdefault(tick.symbol, [])
+            prices.append(tick.price)
+            if i in wanted:
+                if len(prices) < mean_length:
+                    return False
+                mean_price = sum(prices[-mean_length:]) / mean_length
+                bands = (mean_price * (1 - threshold), mean_price * (1 + threshold))
+                if min(abs(tick.price - band) for band in bands) > tolerance * tick.price:
+                    return False
+        return True
+
+    return is_tie
+
+
+def compare(name, make_current, make_naive, ticks, is_tie=None, repeat=3):
+    current = run_tick_signals(make_current(), ticks)
+    naive = run_tick_signals(make_naive(), ticks)
+    # tick indices whose signals differ
+    mismatches = [i for i, (a, b) in enumerate(zip(current, naive)) if a != b]
+    if mismatches and not (is_tie is not None and is_tie(ticks, mismatches)):
+        raise AssertionError(f"{name}: signals differ at tick {mismatches[0]}")
+
+    t_current = min(
+        timeit.repeat(lambda: run_signals(make_current(), ticks), number=1, repeat=repeat)
+    )
+    t_naive = min(
+        timeit.repeat(lambda: run_signals(make_naive(), ticks), number=1, repeat=repeat)
+    )
+    print(
+        f"{name:<40} {len(ticks):>9} ticks  naive {t_naive:8.3f}s  "
+        f"current {t_current:8.3f}s  x{t_naive / t_current:5.1f}  "
+        f"({len(ticks) - len(mismatches)} identical ticks, "
+        f"{len(mismatches)} float ties)"
+    )
+
+
+def benchmark_strategies():
+    print("=== Strategies: rolling window vs. naive ===")
+    datasets = [
+        ("market_data.csv", data_loader.load_market_data("data/market_data.csv")),
+        ("generator", generated_ticks(300_000)),
+    ]
+    for label, ticks in datasets:
+        for short_window, long_window in [(5, 20), (50, 200)]:
+            compare(
+                f"SMA({short_window},{long_window}) {label}",
+                lambda: SimpleMovingAverageCrossoverStrategy(short_window, long_window),
+                lambda: NaiveSimpleMovingAverageCrossoverStrategy(
+                    short_window, long_window
+                ),
+                ticks,
+                is_tie=sma_tie_checker(short_window, long_window),
+            )
+        for mean_length in [20, 200]:
+            compare(
+                f"MeanReversion({mean_length}) {label}",
+                lambda: MeanReversionStrategy(mean_length, 0.01),
+                lambda: NaiveMeanReversionStrategy(mean_length, 0.01),
+                ticks,
+                is_tie=mean_reversion_tie_checker(mean_length, 0.01),
+            )
+
+
+def naive_max_drawdown(equity):
+    """Original O(n^2) drawdown over every (i, j) pair."""
+    return min(
+        (equity[i] - equity[j]) / equity[j]
+        for i in range(len(equity))
+        for j in range(i)
+    )
+
+
+def benchmark_metrics():
+    print("=== Metrics: running-max drawdown vs. all pairs ===")
+    random.seed(0)
+    equity = [10_000.0]
+    for _ in range(2_999):
+        equity.append(equity[-1] * (1 + random.gauss(0, 0.001)))
+
+    naive = naive_max_drawdown(equity)
+    current = compute_metrics(equity, 0.04).max_drawdown
+    if abs(naive - current) > 1e-12:
+        raise AssertionError(f"max drawdown differs: {naive} != {current}")
+
+    t_naive = min(timeit.repeat(lambda: naive_max_drawdown(equity), number=1, repeat=3))
+    t_current = min(
+        timeit.repeat(lambda: compute_metrics(equity, 0.04), number=1, repeat=3)
+    )
+    print(
+        f"{'max drawdown':<40} {len(equity):>9} points naive {t_naive:8.3f}s  "
+        f"current {t_current:8.3f}s  x{t_naive / t_current:5.1f}"
+    )
+
+
+def naive_record(history, portfolio):
+    """Original per-trade reporting: formatted positions plus a full snapshot."""
+    history.append(portfolio.positions)
+    snap = portfolio.snapshot()
+    equity = float(snap.get("Cash", 0.0))
+    for symbol, info in snap.items():
+        if symbol != "Cash":
+            equity += float(info["quantity"]) * float(info["avg_price"])
+    return equity
+
+
+def benchmark_reporting(num_symbols=500, num_trades=5_000):
+    print("=== Reporting: numeric history vs. formatted snapshots ===")
+    portfolio = Portfolio(1_000_000)
+    symbols = [f"SYM{i}" for i in range(num_symbols)]
+    for symbol in symbols:
+        portfolio.add_order(Order("BUY", symbol, 1, 100.0, "FILLED"))
+    trades = [symbols[i % num_symbols] for i in range(num_trades)]
+
+    def run_naive():
+        history = []
+        return [naive_record(history, portfolio) for _ in trades]
+
+    def run_current():
+        history = PortfolioHistory()
+        for symbol in trades:
+            history.record(portfolio, symbol)
+        return history.equity.tolist()
+
+    if run_naive() != run_current():
+        raise AssertionError("equity curves differ")
+
+    t_naive = min(timeit.repeat(run_naive, number=1, repeat=3))
+    t_current = min(timeit.repeat(run_current, number=1, repeat=3))
+    print(
+        f"{f'record ({num_symbols} symbols)':<40} {num_trades:>9} trades naive {t_naive:8.3f}s  "
+        f"current {t_current:8.3f}s  x{t_naive / t_current:5.1f}"
+    )
+
+
+def benchmark_batch(num_symbols=200, num_timestamps=500):
+    print("=== Engine: batch execution vs. per-signal generator ===")
+    random.seed(0)
+    start = datetime(2025, 1, 1)
+    prices = {f"SYM{i}": 100.0 for i in range(num_symbols)}
+    ticks = []
+    for k in range(num_timestamps):
+        timestamp = start + timedelta(seconds=k)
+        for symbol in prices:
+            prices[symbol] = round(prices[symbol] * (1 + random.gauss(0, 0.01)), 2)
+            ticks.append(MarketDataPoint(timestamp, symbol, prices[symbol]))
+
+    def make_engine():
+        engine = Engine()
+        engine._rng = np.random.default_rng(0)
+        return engine
+
+    def run_naive():
+        engine = make_engine()
+        for _ in engine.run(SimpleMovingAverageCrossoverStrategy(5, 20), ticks):
+            pass
+        return engine
+
+    def run_current():
+        engine = make_engine()
+        engine.run_batch(SimpleMovingAverageCrossoverStrategy(5, 20), ticks)
+        return engine
+
+    naive_equity = run_naive().report.metrics.equity[-1]
+    current_equity = run_current().report.metrics.equity[-1]
+    if abs(naive_equity - current_equity) > 1e-6:
+        raise AssertionError(f"final equity differs: {naive_equity} != {current_equity}")
+
+    t_naive = min(timeit.repeat(run_naive, number=1, repeat=3))
+    t_current = min(timeit.repeat(run_current, number=1, repeat=3))
+    print(
+        f"{f'run vs run_batch ({num_symbols} symbols)':<40} {len(ticks):>9} ticks  "
+        f"naive {t_naive:8.3f}s  current {t_current:8.3f}s  x{t_naive / t_current:5.1f}"
+    )
+
+
+def benchmark_sweep():
+    print("=== Sweep: backtest vs. per-signal generator, one tick per timestamp ===")
+    ticks = data_loader.load_tick_store("data/market_data.csv")
+
+    def run_naive():
+        engine = Engine()
+        engine._rng = np.random.default_rng(0)
+        for _ in engine.run(SimpleMovingAverageCrossoverStrategy(5, 20), ticks):
+            pass
+        return float(engine.report.metrics.equity[-1])
+
+    def run_current():
+        return backtest(ticks, SimpleMovingAverageCrossoverStrategy(5, 20), seed=0)
+
+    naive_equity = run_naive()
+    current_equity = run_current()["final_equity"]
+    if abs(naive_equity - current_equity) > 1e-6:
+        raise AssertionError(f"final equity differs: {naive_equity} != {current_equity}")
+
+    t_naive = min(timeit.repeat(run_naive, number=10, repeat=3)) / 10
+    t_current = min(timeit.repeat(run_current, number=10, repeat=3)) / 10
+    print(
+        f"{'run vs backtest (market_data.csv)':<40} {len(ticks):>9} ticks  "
+        f"naive {t_naive:8.3f}s  current {t_current:8.3f}s  x{t_naive / t_current:5.1f}"
+    )
+
+
+def benchmark_generator(num_ticks=200_000):
+    print("=== Data generator: NumPy blocks vs. per-tick csv.writer ===")
+    symbols = ["AAPL", "MSFT", "GOOG", "AMZN"]
+    per_symbol = num_ticks // len(symbols)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def run_naive():
+            # the original writer handles one symbol per file
+            for symbol in symbols:
+                generate_market_csv(
+                    symbol, 100.0, os.path.join(tmp, f"{symbol}.csv"), per_symbol
+                )
+
+        def run_current(extension):
+            path = os.path.join(tmp, f"ticks.{extension}")
+            write_market_data(path, symbols, num_ticks=per_symbol, seed=0)
+            return path
+
+        # written files must load back into the same ticks
+        stores = [
+            data_loader.load_tick_store(run_current(extension))
+            for extension in ("csv", "bin")
+        ]
+        if not (
+            len(stores[0]) == len(stores[1]) == num_ticks
+            and np.array_equal(stores[0].timestamps, stores[1].timestamps)
+            and np.array_equal(stores[0].prices, stores[1].prices)
+        ):
+            raise AssertionError("csv and binary output differ")
+
+        t_naive = min(timeit.repeat(run_naive, number=1, repeat=3))
+        for extension in ("csv", "bin"):
+            t_current = min(
+                timeit.repeat(lambda: run_current(extension), number=1, repeat=3)
+            )
+            print(
+                f"{f'write {extension}':<40} {num_ticks:>9} ticks  "
+                f"naive {t_naive:8.3f}s  current {t_current:8.3f}s  "
+                f"x{t_naive / t_current:5.1f}"
+            )
+
+
+def main():
+    benchmark_strategies()
+    benchmark_metrics()
+    benchmark_reporting()
+    benchmark_batch()
+    benchmark_sweep()
+    benchmark_generator()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
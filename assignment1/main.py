@@ -8,13 +8,8 @@ import os
 import sys
 from pathlib import Path
 
-# Add ./src directory to Python path
-sys.path.append("./src")
-import data_loader  # type: ignore
-import strategies  # type: ignore
-import engine  # type: ignore
-import reporting  # type: ignore
-from models import MarketDataPoint  # type: ignore
+from src import data_loader, engine, reporting, strategies
+from src.models import MarketDataPoint
 
 import matplotlib.pyplot as plt
 
@@ -32,7 +27,7 @@ def main():
 
     # Load market data
     try:
-        market_data = data_loader.load_market_data("data/market_data.csv")
+        market_data = data_loader.load_tick_store("data/market_data.csv")
         print(f"Loaded {len(market_data)} data points")
     except FileNotFoundError:
         print("Error: market_data.csv not found in data/ directory")
@@ -69,15 +64,11 @@ def main():
         # Generate reports
         print("Generating performance reports...")
 
-        backtest_engine.report.create_performance_data()
-        backtest_engine.report.create_trade_data()
-        backtest_engine.report.create_portfolio_data()
+        backtest_engine.report.write_outputs().result()
 
         print(f"Reports saved to out/ directory")
         print(f"Performance summary saved to performance.md")
 
-        backtest_engine.report.output_performance_report()
-
     print("\nBacktest Done")
 
     return 0
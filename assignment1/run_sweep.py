@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep for the SMA crossover strategy.
+
+Loads the market data once, backtests every (short, long) window pair across
+a process pool and writes the results table to out/sweep_results.csv.
+
+    python run_sweep.py [market_data.csv|.bin] [workers]
+"""
+
+import os
+import sys
+import time
+
+from src import data_loader
+from src.engine import run_sweep, sma_grid, write_sweep_results
+from src.strategies import SimpleMovingAverageCrossoverStrategy
+
+initial_cash = 10000
+
+
+def main():
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "data/market_data.csv"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    os.makedirs("out", exist_ok=True)
+
+    market_data = data_loader.load_tick_store(data_path)
+    print(f"Loaded {len(market_data)} data points")
+
+    grid = sma_grid(range(2, 31, 2), range(10, 201, 10))
+    print(f"Running {len(grid)} SMA crossover configurations...")
+
+    start = time.perf_counter()
+    results = run_sweep(
+        market_data,
+        SimpleMovingAverageCrossoverStrategy,
+        grid,
+        initial_cash=initial_cash,
+        workers=workers,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.2f}s ({len(grid) / elapsed:.1f} backtests/s)")
+
+    print("\nTop 5 by Sharpe ratio:")
+    for row in sorted(results, key=lambda row: row["sharpe"], reverse=True)[:5]:
+        print(
+            f"  SMA{row['params']}: return {row['total_return']:.4f}  "
+            f"sharpe {row['sharpe']:.4f}  max drawdown {row['max_drawdown']:.4f}"
+        )
+
+    write_sweep_results(results, "out/sweep_results.csv")
+    print("\nResults saved to out/sweep_results.csv")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,13 @@
 
 from dataclasses import dataclass
 import datetime
+import os
 import random
 import time
 import csv
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class MarketDataPoint:
@@ -73,6 +76,175 @@ def generate_market_csv(
             writer.writerow([tick.timestamp.isoformat(), tick.symbol, tick.price])
 
 
+def generate_price_paths(
+    symbols: list[str],
+    start_prices=100.0,
+    num_ticks: int = 1_000,
+    volatility=0.01,
+    drift: float = 0.0,
+    correlation=0.0,
+    seed: int | None = None,
+    start: datetime.datetime = datetime.datetime(2025, 1, 1),
+    tick_interval: datetime.timedelta = datetime.timedelta(seconds=1),
+    block_ticks: int = 1_000_000,
+):
+    """
+    Simulates correlated geometric Brownian motion paths for several symbols,
+    produced in NumPy blocks instead of one tick at a time.
+
+    Every time step has one price per symbol. Timestamps are synthetic
+    (`start + step * tick_interval`), so the same seed always gives the same
+    output.
+
+    :param symbols: Ticker symbols.
+    :param start_prices: Initial price, scalar or one per symbol.
+    :param num_ticks: Number of time steps per symbol.
+    :param volatility: Std dev of log returns per tick, scalar or one per symbol.
+    :param drift: Mean log return per tick.
+    :param correlation: Correlation of returns between symbols, either a scalar
+        (same for every pair) or a full correlation matrix.
+    :param seed: Seed for the random generator.
+    :param start: Timestamp of the first step.
+    :param tick_interval: Time between steps.
+    :param block_ticks: Approximate number of ticks (steps x symbols) per block.
+    :yield: (timestamps, prices) with int64 epoch-ns timestamps of shape
+        (steps,) and float64 prices of shape (steps, len(symbols)).
+    """
+    num_symbols = len(symbols)
+    rng = np.random.default_rng(seed)
+
+    sigma = np.broadcast_to(np.asarray(volatility, dtype=np.float64), (num_symbols,))
+    corr = np.asarray(correlation, dtype=np.float64)
+    if corr.ndim == 0:
+        corr = np.full((num_symbols, num_symbols), float(corr))
+        np.fill_diagonal(corr, 1.0)
+    cholesky = np.linalg.cholesky(corr)
+
+    log_price = np.log(
+        np.broadcast_to(np.asarray(start_prices, dtype=np.float64), (num_symbols,))
+    )
+    start_ns = np.datetime64(start, "ns").astype(np.int64)
+    interval_ns = int(tick_interval / datetime.timedelta(microseconds=1)) * 1_000
+    steps_per_block = max(1, block_ticks // num_symbols)
+
+    for first in range(0, num_ticks, steps_per_block):
+        steps = min(steps_per_block, num_ticks - first)
+        shocks = rng.standard_normal((steps, num_symbols)) @ cholesky.T
+        log_returns = (drift - 0.5 * sigma**2) + sigma * shocks
+        log_paths = log_price + np.cumsum(log_returns, axis=0)
+        log_price = log_paths[-1]
+
+        timestamps = start_ns + interval_ns * np.arange(
+            first, first + steps, dtype=np.int64
+        )
+        yield timestamps, np.exp(log_paths)
+
+
+def stream_market_data(symbols: list[str], **path_kwargs):
+    """
+    Fast live-feed simulation: yields MarketDataPoint ticks from
+    generate_price_paths (interleaved across symbols, no sleeping).
+
+    :param symbols: Ticker symbols.
+    :param path_kwargs: Passed to generate_price_paths.
+    :yield: MarketDataPoint(timestamp, symbol, price)
+    """
+    for timestamps, prices in generate_price_paths(symbols, **path_kwargs):
+        times = timestamps.view("datetime64[ns]").astype("datetime64[us]").tolist()
+        for timestamp, row in zip(times, prices.tolist()):
+            for symbol, price in zip(symbols, row):
+                yield MarketDataPoint(timestamp=timestamp, symbol=symbol, price=price)
+
+
+def write_market_data(
+    filename: str,
+    symbols: list[str],
+    file_format: str | None = None,
+    decimals: int = 2,
+    **path_kwargs,
+):
+    """
+    Generates correlated multi-symbol market data with generate_price_paths and
+    writes it block by block as `timestamp,symbol,price` rows.
+
+    :param filename: Path to output file.
+    :param symbols: Ticker symbols.
+    :param file_format: "csv", "parquet" or "binary" (TickStore.to_binary
+        layout); inferred from the file extension (.csv/.parquet/.bin) if None.
+    :param decimals: Decimal places prices are rounded to when written.
+    :param path_kwargs: Passed to generate_price_paths (num_ticks, seed, ...).
+    """
+    if file_format is None:
+        extension = os.path.splitext(filename)[1].lower()
+        file_format = {".parquet": "parquet", ".bin": "binary"}.get(extension, "csv")
+
+    blocks = generate_price_paths(symbols, **path_kwargs)
+    symbol_names = np.asarray(symbols)
+    num_symbols = len(symbols)
+
+    if file_format == "csv":
+        with open(filename, "w", newline="") as csvfile:
+            csvfile.write("timestamp,symbol,price\n")
+            for timestamps, prices in blocks:
+                iso = np.datetime_as_string(timestamps.view("datetime64[ns]"), unit="us")
+                rows = np.char.add(
+                    np.char.add(
+                        np.char.add(np.repeat(iso, num_symbols), ","),
+                        np.tile(symbol_names, len(timestamps)),
+                    ),
+                    np.char.add(",", np.char.mod(f"%.{decimals}f", prices.ravel())),
+                )
+                csvfile.write("\n".join(rows.tolist()))
+                csvfile.write("\n")
+
+    elif file_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet requires pyarrow") from e
+
+        schema = pa.schema(
+            [
+                ("timestamp", pa.timestamp("ns")),
+                ("symbol", pa.dictionary(pa.int32(), pa.string())),
+                ("price", pa.float64()),
+            ]
+        )
+        with pq.ParquetWriter(filename, schema) as writer:
+            for timestamps, prices in blocks:
+                codes = np.tile(np.arange(num_symbols, dtype=np.int32), len(timestamps))
+                writer.write_table(
+                    pa.table(
+                        {
+                            "timestamp": pa.array(
+                                np.repeat(timestamps, num_symbols).view("datetime64[ns]")
+                            ),
+                            "symbol": pa.DictionaryArray.from_arrays(codes, symbols),
+                            "price": np.round(prices.ravel(), decimals),
+                        },
+                        schema=schema,
+                    )
+                )
+
+    elif file_format == "binary":
+        from src.data_loader import TickStore
+
+        append = False
+        for timestamps, prices in blocks:
+            TickStore(
+                np.repeat(timestamps, num_symbols),
+                np.tile(np.arange(num_symbols, dtype=np.int32), len(timestamps)),
+                np.round(prices.ravel(), decimals),
+                symbols,
+                is_sorted=True,
+            ).to_binary(filename, append=append)
+            append = True
+
+    else:
+        raise ValueError(f"Unknown file format: {file_format}")
+
+
 if __name__ == "__main__":
     # Example: generate 500 ticks for AAPL starting at $150.00 into a file
     generate_market_csv(
@@ -1,5 +1,10 @@
 import csv
+import heapq
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+
+import numpy as np
+
 from src.models import MarketDataPoint
 
 
@@ -16,3 +21,288 @@ def load_market_data(file_path: str) -> list[MarketDataPoint]:
             data_points.append(data_point)
 
     return data_points
+
+
+def iter_market_data(file_path: str) -> Iterator[MarketDataPoint]:
+    """
+    Lazily yield MarketDataPoint objects from a CSV file, one row at a time.
+    """
+    with open(file_path, "r", newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Skip header row
+        for timestamp, symbol, price in reader:
+            yield MarketDataPoint(datetime.fromisoformat(timestamp), symbol, float(price))
+
+
+def merge_market_data(*sources: Iterable[MarketDataPoint]) -> Iterator[MarketDataPoint]:
+    """
+    K-way merge of several timestamp-ordered tick streams (e.g. one per day file).
+
+    Only the head tick of each source is held in memory at once. Ticks with equal
+    timestamps keep the order in which their sources were given.
+    """
+    return heapq.merge(*sources, key=lambda tick: tick.timestamp)
+
+
+# on-disk layout of TickStore.to_binary: packed little-endian records, with the
+# symbol names (one per line, in code order) in a "<path>.symbols" sidecar file
+TICK_RECORD_DTYPE = np.dtype(
+    [("timestamp", "<i8"), ("symbol", "<i4"), ("price", "<f8")]
+)
+
+
+class TickStore:
+    """
+    Columnar store of market ticks.
+
+    Ticks are kept as three parallel NumPy arrays instead of one
+    MarketDataPoint per row:
+        timestamps: int64 nanoseconds since the epoch
+        codes:      int32 index into `symbols` (interned symbol names)
+        prices:     float64
+
+    MarketDataPoint objects are only built when the store is iterated or
+    indexed, so strategies written against ticks keep working unchanged.
+    """
+
+    # number of ticks converted to Python objects at a time when iterating
+    _CHUNK_SIZE = 65_536
+    # bytes of CSV text parsed per block by from_csv
+    _READ_BLOCK_BYTES = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        codes: np.ndarray,
+        prices: np.ndarray,
+        symbols: list[str],
+        is_sorted: bool | None = None,
+    ):
+        self.__timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.__codes = np.ascontiguousarray(codes, dtype=np.int32)
+        self.__prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.__symbols = list(symbols)
+
+        if not (
+            len(self.__timestamps) == len(self.__codes) == len(self.__prices)
+        ):
+            raise ValueError("timestamps, codes and prices must have the same length")
+
+        # one vectorized pass is far cheaper than re-sorting later
+        if is_sorted is None:
+            is_sorted = bool(np.all(self.__timestamps[1:] >= self.__timestamps[:-1]))
+        self.__is_sorted = is_sorted
+
+    @classmethod
+    def from_csv(cls, file_path: str) -> "TickStore":
+        """
+        Bulk-parse a `timestamp,symbol,price` CSV file into a TickStore.
+
+        The file is read in blocks of lines; each block is split once and its
+        columns converted by NumPy in a single call, so no per-row objects
+        are created. Blank lines are skipped.
+
+        Raises:
+            ValueError: If a line does not have exactly three fields.
+        """
+        symbol_codes: dict[str, int] = {}
+        timestamps, codes, prices = [], [], []
+
+        with open(file_path, "r", newline="") as file:
+            next(file, None)  # Skip header row
+            line_number = 2  # of the first line in the block
+            while True:
+                lines = file.readlines(cls._READ_BLOCK_BYTES)
+                if not lines:
+                    break
+
+                fields = cls._split_block(lines, file_path, line_number)
+                line_number += len(lines)
+                if not fields:
+                    continue
+
+                timestamps.append(
+                    np.array(fields[0::3], dtype="datetime64[ns]").view(np.int64)
+                )
+                block_symbols, inverse = np.unique(
+                    np.array(fields[1::3]), return_inverse=True
+                )
+                # map block-local codes onto codes shared across blocks
+                remap = np.array(
+                    [
+                        symbol_codes.setdefault(symbol, len(symbol_codes))
+                        for symbol in block_symbols.tolist()
+                    ],
+                    dtype=np.int32,
+                )
+                codes.append(remap[inverse])
+                prices.append(np.array(fields[2::3], dtype=np.float64))
+
+        if not timestamps:
+            return cls.empty()
+
+        return cls(
+            np.concatenate(timestamps),
+            np.concatenate(codes),
+            np.concatenate(prices),
+            list(symbol_codes),
+        )
+
+    @staticmethod
+    def _split_block(lines: list[str], file_path: str, line_number: int) -> list[str]:
+        """
+        Flatten a block of CSV lines into [timestamp, symbol, price, ...].
+
+        Blank lines are skipped and quoted fields are handled by the csv
+        module; a line without exactly three fields raises ValueError.
+        """
+        text = "".join(lines)
+        if '"' not in text:
+            records = [record for record in text.splitlines() if record.strip()]
+            if all(record.count(",") == 2 for record in records):
+                return ",".join(records).split(",") if records else []
+
+        # slow path: quoted fields, or a malformed line to report
+        fields = []
+        reader = csv.reader(lines)
+        for row in reader:
+            if not "".join(row).strip():
+                continue
+            if len(row) != 3:
+                raise ValueError(
+                    f"{file_path}, line {line_number + reader.line_num - 1}: expected 3 fields "
+                    f"(timestamp,symbol,price), got {len(row)}"
+                )
+            fields.extend(row)
+        return fields
+
+    @classmethod
+    def from_points(cls, market_data: list[MarketDataPoint]) -> "TickStore":
+        """
+        Build a TickStore from existing MarketDataPoint objects.
+        """
+        if not market_data:
+            return cls.empty()
+
+        timestamps = np.array(
+            [tick.timestamp for tick in market_data], dtype="datetime64[ns]"
+        ).view(np.int64)
+        symbols, codes = np.unique(
+            [tick.symbol for tick in market_data], return_inverse=True
+        )
+        prices = np.array([tick.price for tick in market_data], dtype=np.float64)
+
+        return cls(timestamps, codes, prices, symbols.tolist())
+
+    @classmethod
+    def from_binary(cls, file_path: str) -> "TickStore":
+        """
+        Load a store written by to_binary (or data_generator's binary format).
+        """
+        records = np.fromfile(file_path, dtype=TICK_RECORD_DTYPE)
+        with open(f"{file_path}.symbols", "r") as file:
+            symbols = file.read().splitlines()
+
+        return cls(records["timestamp"], records["symbol"], records["price"], symbols)
+
+    def to_binary(self, file_path: str, append: bool = False) -> None:
+        """
+        Write the ticks as packed records; with append=True records are added to
+        an existing file (which must use the same symbol codes).
+        """
+        records = np.empty(len(self), dtype=TICK_RECORD_DTYPE)
+        records["timestamp"] = self.__timestamps
+        records["symbol"] = self.__codes
+        records["price"] = self.__prices
+
+        with open(file_path, "ab" if append else "wb") as file:
+            records.tofile(file)
+        with open(f"{file_path}.symbols", "w") as file:
+            file.write("".join(f"{symbol}\n" for symbol in self.__symbols))
+
+    @classmethod
+    def empty(cls) -> "TickStore":
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.float64),
+            [],
+            is_sorted=True,
+        )
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.__timestamps
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self.__codes
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.__prices
+
+    @property
+    def symbols(self) -> list[str]:
+        return self.__symbols
+
+    @property
+    def is_sorted(self) -> bool:
+        return self.__is_sorted
+
+    def sorted(self) -> "TickStore":
+        """
+        Return the store ordered by timestamp (self if already sorted).
+
+        A stable sort is used so ticks sharing a timestamp keep file order.
+        """
+        if self.__is_sorted:
+            return self
+
+        order = np.argsort(self.__timestamps, kind="stable")
+        return TickStore(
+            self.__timestamps[order],
+            self.__codes[order],
+            self.__prices[order],
+            self.__symbols,
+            is_sorted=True,
+        )
+
+    def __len__(self) -> int:
+        return len(self.__prices)
+
+    def __getitem__(self, index: int) -> MarketDataPoint:
+        timestamp = np.datetime64(int(self.__timestamps[index]), "ns")
+        return MarketDataPoint(
+            timestamp.astype("datetime64[us]").item(),
+            self.__symbols[self.__codes[index]],
+            float(self.__prices[index]),
+        )
+
+    def __iter__(self):
+        """
+        Lazily yield MarketDataPoint objects, converting one chunk at a time.
+        """
+        symbols = self.__symbols
+        for start in range(0, len(self), self._CHUNK_SIZE):
+            stop = start + self._CHUNK_SIZE
+            timestamps = (
+                self.__timestamps[start:stop]
+                .view("datetime64[ns]")
+                .astype("datetime64[us]")
+                .tolist()
+            )
+            codes = self.__codes[start:stop].tolist()
+            prices = self.__prices[start:stop].tolist()
+
+            for timestamp, code, price in zip(timestamps, codes, prices):
+                yield MarketDataPoint(timestamp, symbols[code], price)
+
+    def __repr__(self):
+        return f"TickStore(ticks={len(self)}, symbols={len(self.__symbols)}, sorted={self.__is_sorted})"
+
+
+def load_tick_store(file_path: str) -> TickStore:
+    if file_path.endswith(".bin"):
+        return TickStore.from_binary(file_path)
+    return TickStore.from_csv(file_path)
@@ -1,5 +1,6 @@
 """Engine package initialization."""
 
 from .engine import Engine
+from .sweep import backtest, run_sweep, sma_grid, write_sweep_results
 
-__all__ = ["Engine"]
+__all__ = ["Engine", "backtest", "run_sweep", "sma_grid", "write_sweep_results"]
@@ -1,25 +1,38 @@
 # engine.py
+import os
+from collections.abc import Iterable
+
+import numpy as np
+
 from src.models import (
     Order,
     OrderError,
     ExecutionError,
+    ExecutionStatus,
     MarketDataPoint,
     Signal,
     Portfolio,
 )
 from src.strategies import Strategy
+from src.data_loader import TickStore, iter_market_data, merge_market_data
 
 from src.reporting import Report
 
-from numpy import random
-
 
 class Engine:
-    def __init__(self, initial_cash: float = 1_000_000):
+    # batches up to this size are cheaper to execute one signal at a time
+    SCALAR_BATCH_SIZE = 2
+
+    def __init__(
+        self,
+        initial_cash: float = 1_000_000,
+        spill_dir: str | None = None,
+        run_dir: str | None = None,
+    ):
         self.__portfolio = Portfolio(initial_cash)
-        self.__report = Report()
+        self.__report = Report(spill_dir=spill_dir, run_dir=run_dir)
         # seed for reproducible simulated failures in tests
-        self._rng = random.default_rng()
+        self._rng = np.random.default_rng()
 
     def execute_trade(self, signal: Signal):
         try:
@@ -51,12 +64,163 @@ class Engine:
         except Exception as e:
             return None, f"Unexpected error: {e}"
 
-    def run(self, strategy: Strategy, market_data: list[MarketDataPoint]):
-
+    def execute_batch(self, signals: list[Signal]) -> np.ndarray:
+        """
+        Execute many signals at once and return one ExecutionStatus per signal
+        as an int8 array.
+
+        Validation is vectorized, the simulated failures are drawn with a single
+        RNG call (consuming the same random stream as calling execute_trade for
+        each signal) and fills are applied to the portfolio in bulk. HOLD
+        signals are only counted, not logged. Batches of at most
+        SCALAR_BATCH_SIZE signals go through execute_trade instead, where the
+        array setup would cost more than it saves.
+        """
+        if len(signals) <= self.SCALAR_BATCH_SIZE:
+            return np.array(self.__execute_each(signals), dtype=np.int8)
+
+        status = np.full(len(signals), ExecutionStatus.HOLD, dtype=np.int8)
+
+        actions = np.array([signal.action.upper() for signal in signals])
+        quantities = np.array([signal.quantity for signal in signals], dtype=np.float64)
+        prices = np.array([signal.price for signal in signals], dtype=np.float64)
+
+        hold = (actions == "HOLD") | (quantities == 0)
+        buy = actions == "BUY"
+        valid = ~hold & (buy | (actions == "SELL")) & (quantities > 0) & (prices >= 0)
+
+        # invalid orders are rare: let Order.from_signal produce the message
+        errors = {}
+        for i in np.flatnonzero(~hold & ~valid).tolist():
+            try:
+                Order.from_signal(signals[i])
+            except OrderError as e:
+                errors[i] = f"Order creation failed: {getattr(e, 'message', e)}"
+        status[~hold & ~valid] = ExecutionStatus.REJECTED
+
+        # simulate occasional execution failure (5% chance)
+        valid_index = np.flatnonzero(valid)
+        failed = self._rng.random(len(valid_index)) < 0.05
+        status[valid_index[failed]] = ExecutionStatus.FAILED
+        for i in valid_index[failed].tolist():
+            errors[i] = "Order execution failed: Simulated execution failure"
+
+        filled = valid_index[~failed]
+        status[filled] = ExecutionStatus.FILLED
+        if len(filled):
+            self.__portfolio.apply_fills(
+                [signals[i].symbol.upper() for i in filled.tolist()],
+                np.where(buy[filled], quantities[filled], -quantities[filled]),
+                prices[filled],
+            )
+
+        self.__report.execute_batch(signals, status, self.__portfolio, errors)
+        return status
+
+    def __execute_each(self, signals: list[Signal]) -> list[ExecutionStatus]:
+        status = []
+        for signal in signals:
+            if signal.action.upper() == "HOLD" or signal.quantity == 0:
+                status.append(ExecutionStatus.HOLD)
+                continue
+
+            trade, log = self.execute_trade(signal)
+            self.__report.execute_trade(trade, log, self.__portfolio)
+            if trade is not None:
+                status.append(ExecutionStatus.FILLED)
+            elif log.startswith("Order creation failed"):
+                status.append(ExecutionStatus.REJECTED)
+            else:
+                status.append(ExecutionStatus.FAILED)
+        return status
+
+    def __execute_counted(self, signals: list[Signal], counts: list[int]) -> None:
+        # small batches skip the status array altogether
+        if len(signals) <= self.SCALAR_BATCH_SIZE:
+            for code in self.__execute_each(signals):
+                counts[code] += 1
+            return
+
+        status = self.execute_batch(signals)
+        for code, n in enumerate(np.bincount(status, minlength=len(counts)).tolist()):
+            counts[code] += n
+
+    def run(self, strategy: Strategy, market_data: list[MarketDataPoint] | TickStore):
+        yield from self.__process(strategy, self.__ordered(market_data))
+
+    def run_batch(
+        self, strategy: Strategy, market_data: list[MarketDataPoint] | TickStore
+    ) -> dict[str, int]:
+        """
+        Backtest without yielding every signal.
+
+        Signals from all ticks sharing a timestamp are executed together with
+        execute_batch. Returns a summary: the number of ticks and the number of
+        signals per ExecutionStatus.
+        """
+        counts = [0] * len(ExecutionStatus)
+        ticks = 0
+        pending: list[Signal] = []
+        timestamp = None
+
+        for tick in self.__ordered(market_data):
+            if tick.timestamp != timestamp:
+                self.__execute_counted(pending, counts)
+                pending = []
+                timestamp = tick.timestamp
+
+            ticks += 1
+            self.__portfolio.mark(tick.symbol, tick.price)
+            pending.extend(strategy.generate_signals(tick))
+
+        self.__execute_counted(pending, counts)
+
+        summary = {"ticks": ticks}
+        summary.update({status.name.lower(): counts[status] for status in ExecutionStatus})
+        return summary
+
+    @staticmethod
+    def __ordered(market_data: list[MarketDataPoint] | TickStore):
         # ensure data is processed in timestamp order
-        ordered = sorted(market_data, key=lambda x: x.timestamp)
-
-        for tick in ordered:
+        if isinstance(market_data, TickStore):
+            # columnar data knows whether it is already ordered
+            return market_data.sorted()
+        return sorted(market_data, key=lambda x: x.timestamp)
+
+    def run_stream(
+        self, strategy: Strategy, *sources: str | os.PathLike | Iterable[MarketDataPoint]
+    ):
+        """
+        Backtest over one or more timestamp-ordered sources without loading them.
+
+        Each source is either a CSV file path (e.g. one file per day) or an
+        iterable of MarketDataPoint. Sources are k-way merged by timestamp and fed
+        to the strategy tick by tick, so memory stays bounded by the number of
+        sources rather than the number of ticks. Raises ValueError (when
+        iteration starts) if no source is given.
+        """
+        if not sources:
+            raise ValueError("run_stream needs at least one source")
+
+        streams = [
+            (
+                iter_market_data(source)
+                if isinstance(source, (str, os.PathLike))
+                else source
+            )
+            for source in sources
+        ]
+        ticks = streams[0] if len(streams) == 1 else merge_market_data(*streams)
+
+        yield from self.__process(strategy, ticks)
+
+        # push anything still buffered to the spill files
+        self.__report.flush()
+
+    def __process(self, strategy: Strategy, ticks: Iterable[MarketDataPoint]):
+        for tick in ticks:
+            # keep positions marked to market before the strategy acts
+            self.__portfolio.mark(tick.symbol, tick.price)
             signals = strategy.generate_signals(tick)
 
             for signal in signals:
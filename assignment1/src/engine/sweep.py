@@ -0,0 +1,197 @@
+# sweep.py
+import csv
+import itertools
+import os
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.data_loader import TickStore
+from src.strategies import Strategy
+
+from .engine import Engine
+
+
+SWEEP_COLUMNS = [
+    "params",
+    "ticks",
+    "filled",
+    "rejected",
+    "failed",
+    "final_equity",
+    "total_return",
+    "sharpe",
+    "max_drawdown",
+]
+
+
+class SharedTickStore:
+    """
+    Copies a TickStore's columns into shared memory once, so worker processes
+    can attach to them instead of each receiving (or reloading) the data.
+
+    Use as a context manager in the parent; `handle` is a small picklable
+    description that `attach` turns back into a zero-copy TickStore.
+    """
+
+    def __init__(self, market_data: TickStore):
+        market_data = market_data.sorted()
+        self.__blocks = []
+        columns = {}
+        for name in ("timestamps", "codes", "prices"):
+            array = getattr(market_data, name)
+            # SharedMemory refuses size 0
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.__blocks.append(block)
+            columns[name] = (block.name, array.dtype.str)
+
+        self.handle = {
+            "length": len(market_data),
+            "symbols": market_data.symbols,
+            "columns": columns,
+        }
+
+    @staticmethod
+    def attach(handle: dict) -> tuple[TickStore, list[shared_memory.SharedMemory]]:
+        """
+        Build a read-only TickStore over the shared columns. The returned blocks
+        must be kept alive as long as the store is used.
+        """
+        blocks, arrays = [], {}
+        for name, (block_name, dtype) in handle["columns"].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            array = np.ndarray(handle["length"], dtype=dtype, buffer=block.buf)
+            array.flags.writeable = False
+            blocks.append(block)
+            arrays[name] = array
+
+        store = TickStore(
+            arrays["timestamps"],
+            arrays["codes"],
+            arrays["prices"],
+            handle["symbols"],
+            is_sorted=True,
+        )
+        return store, blocks
+
+    def close(self) -> None:
+        for block in self.__blocks:
+            block.close()
+            block.unlink()
+        self.__blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# per-worker state set up once by _init_worker
+_worker_data: TickStore | None = None
+_worker_blocks: list[shared_memory.SharedMemory] = []
+
+
+def _init_worker(handle: dict) -> None:
+    global _worker_data, _worker_blocks
+    _worker_data, _worker_blocks = SharedTickStore.attach(handle)
+
+
+def backtest(
+    market_data: TickStore,
+    strategy: Strategy,
+    initial_cash: float = 1_000_000,
+    seed: int | None = None,
+) -> dict:
+    """
+    Run one batch backtest and summarize it as a row of the sweep table.
+
+    run_batch executes batches of one or two signals through execute_trade,
+    so data with one tick per timestamp costs the same as Engine.run.
+    """
+    engine = Engine(initial_cash=initial_cash)
+    engine._rng = np.random.default_rng(seed)
+    row = engine.run_batch(strategy, market_data)
+    row.pop("hold")
+
+    if row["filled"] + row["rejected"] + row["failed"]:
+        metrics = engine.report.metrics
+        row.update(
+            final_equity=float(metrics.equity[-1]),
+            total_return=metrics.total_return,
+            sharpe=metrics.sharpe,
+            max_drawdown=metrics.max_drawdown,
+        )
+    else:
+        # no orders were attempted, so no equity curve was recorded
+        row.update(
+            final_equity=float(initial_cash),
+            total_return=0.0,
+            sharpe=0.0,
+            max_drawdown=0.0,
+        )
+    return row
+
+
+def _run_one(job: tuple) -> dict:
+    strategy_factory, params, initial_cash, seed = job
+    row = backtest(_worker_data, strategy_factory(*params), initial_cash, seed)
+    return {"params": params, **row}
+
+
+def run_sweep(
+    market_data: TickStore,
+    strategy_factory: Callable[..., Strategy],
+    param_grid: Iterable[Sequence],
+    initial_cash: float = 1_000_000,
+    seed: int | None = 0,
+    workers: int | None = None,
+) -> list[dict]:
+    """
+    Backtest `strategy_factory(*params)` for every parameter set in
+    `param_grid` across a process pool.
+
+    The market data is placed in shared memory once and attached by each
+    worker when it starts; only the parameters and the result rows cross
+    process boundaries. Every run seeds the simulated execution failures
+    with the same `seed`, so each row is reproducible. The failures are drawn
+    per order, though, so configurations that emit different orders see
+    different fills.
+
+    `strategy_factory` must be picklable (e.g. a strategy class). Returns one
+    row per parameter set, in grid order, with the keys in SWEEP_COLUMNS.
+    """
+    param_grid = [tuple(params) for params in param_grid]
+    workers = workers or os.cpu_count() or 1
+    jobs = [(strategy_factory, params, initial_cash, seed) for params in param_grid]
+
+    with SharedTickStore(market_data) as shared:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)) or 1,
+            initializer=_init_worker,
+            initargs=(shared.handle,),
+        ) as pool:
+            # a few jobs per task keeps IPC overhead low for short backtests
+            chunksize = max(1, len(jobs) // (4 * workers))
+            return list(pool.map(_run_one, jobs, chunksize=chunksize))
+
+
+def sma_grid(short_windows: Iterable[int], long_windows: Iterable[int]) -> list[tuple]:
+    """All (short, long) window pairs with short < long."""
+    return [
+        (short, long)
+        for short, long in itertools.product(short_windows, long_windows)
+        if short < long
+    ]
+
+
+def write_sweep_results(results: list[dict], file_path: str) -> None:
+    with open(file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(
+            {**row, "params": " ".join(str(p) for p in row["params"])} for row in results
+        )
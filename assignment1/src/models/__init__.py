@@ -5,8 +5,10 @@ from .models import (
     Order,
     OrderError,
     ExecutionError,
+    ExecutionStatus,
     Signal,
     Portfolio,
+    format_number,
 )
 
 __all__ = [
@@ -14,6 +16,8 @@ __all__ = [
     "Order",
     "OrderError",
     "ExecutionError",
+    "ExecutionStatus",
     "Signal",
     "Portfolio",
+    "format_number",
 ]
@@ -1,7 +1,9 @@
 # models.py
 from dataclasses import dataclass
 from datetime import datetime
-from collections import defaultdict
+from enum import IntEnum
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -23,6 +25,15 @@ class ExecutionError(Exception):
         super().__init__(self.message)
 
 
+class ExecutionStatus(IntEnum):
+    """Outcome of one signal in a batch execution (stored as int8)."""
+
+    HOLD = 0
+    FILLED = 1
+    REJECTED = 2  # OrderError: invalid action, quantity or price
+    FAILED = 3  # ExecutionError: simulated execution failure
+
+
 class Order:
     def __init__(self, action, symbol, quantity, price, status):
         self.__symbol = symbol.upper()
@@ -118,88 +129,221 @@ class Order:
         return f"Order(action={self.__action}, symbol={self.__symbol}, quantity={self.__quantity}, price={self.__price}, status={self.__status})"
 
 
+def format_number(value: float) -> str:
+    """Format integral values without a trailing '.0' (10.0 -> '10')."""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
 class Portfolio:
     """
-    Store open positions in a dictionary. symbol, quantity, and average price.
+    Store open positions in arrays indexed by symbol slot: quantity, average
+    price and last (mark) price.
+
+    Equity is marked to market: nav = cash + sum(quantity * last_price). The
+    market value is kept as a running sum, updated on every fill and every
+    mark(), so reading `nav` is O(1) regardless of the number of symbols.
     """
 
+    _INITIAL_CAPACITY = 64
+
     def __init__(self, initial_cash: float = 1_000_000):
-        self.__portfolio = defaultdict(lambda: {"quantity": 0, "avg_price": 0})
+        self.__slots: dict[str, int] = {}
+        # symbols that have been traded, in first-trade order (for display)
+        self.__traded: dict[str, int] = {}
+        self.__quantity = np.zeros(self._INITIAL_CAPACITY)
+        self.__avg_price = np.zeros(self._INITIAL_CAPACITY)
+        self.__last_price = np.zeros(self._INITIAL_CAPACITY)
+        self.__market_value = 0.0
         self.__cash = float(initial_cash)
 
+    def __slot(self, symbol: str) -> int:
+        slot = self.__slots.get(symbol)
+        if slot is None:
+            slot = self.__slots[symbol] = len(self.__slots)
+            if slot == len(self.__quantity):
+                capacity = 2 * len(self.__quantity)
+                self.__quantity = np.resize(self.__quantity, capacity)
+                self.__avg_price = np.resize(self.__avg_price, capacity)
+                self.__last_price = np.resize(self.__last_price, capacity)
+                self.__quantity[slot:] = 0.0
+                self.__avg_price[slot:] = 0.0
+                self.__last_price[slot:] = 0.0
+        return slot
+
+    def mark(self, symbol: str, price: float):
+        """
+        Update the last traded price of a symbol and the running market value.
+        """
+        slot = self.__slot(symbol)
+        quantity = self.__quantity[slot]
+        if quantity:
+            self.__market_value += float(quantity) * (price - self.__last_price[slot])
+        self.__last_price[slot] = price
+
     def add_order(self, order: Order):
         def sign(x: int) -> int:
             return (x > 0) - (x < 0)  # returns 1, -1, or 0
 
-        symbol_data = self.__portfolio[order.symbol]
-        qty, avg_price = symbol_data["quantity"], symbol_data["avg_price"]
+        slot = self.__slot(order.symbol)
+        self.__traded.setdefault(order.symbol, slot)
+        qty = float(self.__quantity[slot])
+        avg_price = float(self.__avg_price[slot])
+        new_qty, new_avg_price = qty, avg_price
         position = sign(qty)
         volume_cost = order.quantity * order.price
 
         match position:
             case 0:  # No position
-                symbol_data["avg_price"] = order.price
+                new_avg_price = order.price
                 if order.action == "BUY":
-                    symbol_data["quantity"] += order.quantity
+                    new_qty = qty + order.quantity
                     self.__cash -= volume_cost
                 elif order.action == "SELL":
-                    symbol_data["quantity"] -= order.quantity
+                    new_qty = qty - order.quantity
                     self.__cash += volume_cost
 
             case 1:  # Long position
                 if order.action == "BUY":
-                    new_quantity = qty + order.quantity
-                    new_avg_price = (qty * avg_price + volume_cost) / new_quantity
-                    symbol_data["quantity"] = new_quantity
-                    symbol_data["avg_price"] = new_avg_price
+                    new_qty = qty + order.quantity
+                    new_avg_price = (qty * avg_price + volume_cost) / new_qty
                     self.__cash -= volume_cost
 
                 elif order.action == "SELL":
                     if order.quantity == qty:  # Closing entire long
-                        symbol_data.update({"quantity": 0, "avg_price": 0})
+                        new_qty, new_avg_price = 0, 0
                         self.__cash += volume_cost
                     elif order.quantity > qty:  # Overselling
-                        symbol_data["quantity"] = qty - order.quantity
-                        symbol_data["avg_price"] = order.price
+                        new_qty = qty - order.quantity
+                        new_avg_price = order.price
                         self.__cash += volume_cost
                     else:  # Partial sell
-                        symbol_data["quantity"] -= order.quantity
+                        new_qty = qty - order.quantity
                         self.__cash += volume_cost
 
             case -1:  # Short position
                 if order.action == "BUY":
                     abs_qty = abs(qty)
                     if order.quantity == abs_qty:  # Closing entire short
-                        symbol_data.update({"quantity": 0, "avg_price": 0})
+                        new_qty, new_avg_price = 0, 0
                         self.__cash -= volume_cost
                     elif order.quantity > abs_qty:  # Overbuying
-                        symbol_data["quantity"] = qty + order.quantity
-                        symbol_data["avg_price"] = order.price
+                        new_qty = qty + order.quantity
+                        new_avg_price = order.price
                         self.__cash -= volume_cost
                     else:  # Partial cover
-                        symbol_data["quantity"] += order.quantity
+                        new_qty = qty + order.quantity
                         self.__cash -= volume_cost
 
                 elif order.action == "SELL":
-                    new_quantity = qty - order.quantity
-                    new_avg_price = (qty * avg_price - volume_cost) / new_quantity
-                    symbol_data["quantity"] = new_quantity
-                    symbol_data["avg_price"] = new_avg_price
+                    new_qty = qty - order.quantity
+                    new_avg_price = (qty * avg_price - volume_cost) / new_qty
                     self.__cash += volume_cost
 
+        # the fill price is the latest mark for this symbol
+        self.__market_value += (
+            new_qty * order.price - qty * float(self.__last_price[slot])
+        )
+        self.__quantity[slot] = new_qty
+        self.__avg_price[slot] = new_avg_price
+        self.__last_price[slot] = order.price
+
+    def apply_fills(self, symbols: list[str], quantities, prices):
+        """
+        Apply many fills at once. `quantities` are signed (+ buy, - sell).
+
+        Produces the same positions, cash and NAV as calling add_order for each
+        fill in order. Fills are applied in rounds in which every symbol appears
+        at most once, each round as a handful of vectorized array updates.
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        slots = np.empty(len(symbols), dtype=np.intp)
+        rounds = np.empty(len(symbols), dtype=np.intp)
+        seen: dict[int, int] = {}
+        for i, symbol in enumerate(symbols):
+            slot = self.__slot(symbol)
+            self.__traded.setdefault(symbol, slot)
+            slots[i] = slot
+            rounds[i] = seen.get(slot, 0)
+            seen[slot] = rounds[i] + 1
+
+        for r in range(max(seen.values(), default=0)):
+            mask = rounds == r
+            self.__apply_unique_fills(slots[mask], quantities[mask], prices[mask])
+
+    def __apply_unique_fills(self, slots, fill_qty, price):
+        qty = self.__quantity[slots]
+        avg_price = self.__avg_price[slots]
+        new_qty = qty + fill_qty
+
+        # same rules as add_order: opening or adding averages in, reducing keeps
+        # the average, closing resets it and flipping sides starts at the fill price
+        adding = np.sign(qty) == np.sign(fill_qty)
+        flipped = np.sign(new_qty) == -np.sign(qty)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            added_avg = (qty * avg_price + fill_qty * price) / new_qty
+        new_avg_price = np.where(
+            qty == 0,
+            price,
+            np.where(
+                adding,
+                added_avg,
+                np.where(new_qty == 0, 0.0, np.where(flipped, price, avg_price)),
+            ),
+        )
+
+        self.__cash -= float(np.dot(fill_qty, price))
+        self.__market_value += float(
+            np.dot(new_qty, price) - np.dot(qty, self.__last_price[slots])
+        )
+        self.__quantity[slots] = new_qty
+        self.__avg_price[slots] = new_avg_price
+        self.__last_price[slots] = price
+
     @property
     def positions(self):
 
         pos = {
-            symbol: f"{self.__portfolio[symbol]["quantity"]} @ {self.__portfolio[symbol]["avg_price"]}"
-            for symbol in self.__portfolio
+            symbol: f"{format_number(self.__quantity[slot])} @ {format_number(self.__avg_price[slot])}"
+            for symbol, slot in self.__traded.items()
         }
         pos["Cash"] = f"{self.__cash:.2f}"
         return pos
 
+    @property
+    def cash(self) -> float:
+        return self.__cash
+
+    @property
+    def market_value(self) -> float:
+        return self.__market_value
+
+    @property
+    def nav(self) -> float:
+        """
+        Mark-to-market net asset value: cash + sum(quantity * last_price).
+        """
+        return self.__cash + self.__market_value
+
+    def position(self, symbol: str) -> tuple[float, float]:
+        """
+        Return (quantity, avg_price) for a symbol, (0, 0) if never traded.
+        """
+        slot = self.__traded.get(symbol)
+        if slot is None:
+            return 0, 0
+        return float(self.__quantity[slot]), float(self.__avg_price[slot])
+
+    def last_price(self, symbol: str) -> float:
+        slot = self.__slots.get(symbol)
+        return 0.0 if slot is None else float(self.__last_price[slot])
+
     def display(self):
-        print(self.__portfolio)
-        print(self.__cash)
+        snap = self.snapshot()
+        cash = snap.pop("Cash")
+        print(snap)
+        print(cash)
 
     def snapshot(self) -> dict:
         """
@@ -209,10 +353,10 @@ class Portfolio:
         """
         snap = {
             symbol: {
-                "quantity": self.__portfolio[symbol]["quantity"],
-                "avg_price": self.__portfolio[symbol]["avg_price"],
+                "quantity": float(self.__quantity[slot]),
+                "avg_price": float(self.__avg_price[slot]),
             }
-            for symbol in self.__portfolio
+            for symbol, slot in self.__traded.items()
         }
         snap["Cash"] = float(self.__cash)
         return snap
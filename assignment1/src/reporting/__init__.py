@@ -1,5 +1,6 @@
 """Reporting package initialization."""
 
-from .reporting import Report
+from .reporting import Report, new_run_dir
+from .metrics import PerformanceMetrics, compute_metrics
 
-__all__ = ["Report"]
+__all__ = ["Report", "new_run_dir", "PerformanceMetrics", "compute_metrics"]
@@ -0,0 +1,176 @@
+import numpy as np
+
+from src.models import format_number
+
+
+# one record per trade attempt: the traded symbol's position after the trade
+# (symbol -1 when nothing changed) plus cash and equity
+RECORD_DTYPE = np.dtype(
+    [
+        ("symbol", np.int32),
+        ("quantity", np.float64),
+        ("avg_price", np.float64),
+        ("cash", np.float64),
+        ("equity", np.float64),
+    ]
+)
+
+
+class PortfolioHistory:
+    """
+    Append-only numeric portfolio history.
+
+    Instead of a formatted dict of every position per trade, each record holds
+    only the symbol that traded, cash and equity. Recording is a few writes
+    into a preallocated structured array; full per-symbol rows are rebuilt
+    (and formatted) only when `rows()` is called.
+
+    Equity is the portfolio's mark-to-market NAV at the time of the record.
+
+    If `spill_path` is given, `flush()` appends the buffered records to that
+    file in binary form and empties the buffer.
+    """
+
+    def __init__(self, capacity: int = 1024, spill_path: str | None = None):
+        self.__buffer = np.empty(capacity, dtype=RECORD_DTYPE)
+        self.__size = 0
+        self.__symbols: list[str] = []
+        self.__codes: dict[str, int] = {}
+        # positions already held when recording started, as {code: (qty, avg)}
+        self.__initial: dict[int, tuple[float, float]] | None = None
+        self.__spill_path = spill_path
+        self.__spilled = 0
+        if spill_path is not None:
+            open(spill_path, "wb").close()
+
+    def __code(self, symbol: str) -> int:
+        code = self.__codes.get(symbol)
+        if code is None:
+            code = self.__codes[symbol] = len(self.__symbols)
+            self.__symbols.append(symbol)
+        return code
+
+    def __seed(self, portfolio) -> None:
+        # seed with positions opened before the first record
+        self.__initial = {}
+        for held, info in portfolio.snapshot().items():
+            if held == "Cash":
+                continue
+            code = self.__code(held)
+            self.__initial[code] = (info["quantity"], info["avg_price"])
+
+    def record(self, portfolio, symbol: str | None = None) -> None:
+        """
+        Append the portfolio state after a trade in `symbol` (None if no fill).
+        """
+        if self.__initial is None:
+            self.__seed(portfolio)
+
+        if self.__size == len(self.__buffer):
+            self.__buffer = np.resize(self.__buffer, 2 * len(self.__buffer))
+
+        if symbol is None:
+            code, quantity, avg_price = -1, 0.0, 0.0
+        else:
+            code = self.__code(symbol)
+            quantity, avg_price = portfolio.position(symbol)
+
+        self.__buffer[self.__size] = (
+            code,
+            quantity,
+            avg_price,
+            portfolio.cash,
+            portfolio.nav,
+        )
+        self.__size += 1
+
+    def record_many(self, portfolio, symbols: list[str | None]) -> None:
+        """
+        Append one record per entry of `symbols`, all sharing the portfolio's
+        current cash and NAV (e.g. the results of one batch of fills).
+        """
+        if self.__initial is None:
+            self.__seed(portfolio)
+
+        size = self.__size + len(symbols)
+        if size > len(self.__buffer):
+            self.__buffer = np.resize(self.__buffer, max(size, 2 * len(self.__buffer)))
+
+        block = self.__buffer[self.__size : size]
+        no_fill = (0.0, 0.0)
+        block["symbol"] = [
+            -1 if symbol is None else self.__code(symbol) for symbol in symbols
+        ]
+        block[["quantity", "avg_price"]] = [
+            no_fill if symbol is None else portfolio.position(symbol)
+            for symbol in symbols
+        ]
+        block["cash"] = portfolio.cash
+        block["equity"] = portfolio.nav
+        self.__size = size
+
+    def flush(self) -> None:
+        if self.__spill_path is None:
+            return
+        with open(self.__spill_path, "ab") as f:
+            self.__buffer[: self.__size].tofile(f)
+        self.__spilled += self.__size
+        self.__size = 0
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records, including any already spilled to disk."""
+        if self.__spill_path is None:
+            return self.__buffer[: self.__size]
+        if not self.__spilled:
+            # the buffer is reused after a flush, so never hand out a view
+            return self.__buffer[: self.__size].copy()
+        spilled = np.fromfile(self.__spill_path, dtype=RECORD_DTYPE)
+        return np.concatenate([spilled, self.__buffer[: self.__size]])
+
+    def copy(self) -> "PortfolioHistory":
+        """In-memory copy of every record so far (including spilled ones)."""
+        records = self.records.copy()
+        history = PortfolioHistory(capacity=max(len(records), 1))
+        history.__buffer[: len(records)] = records
+        history.__size = len(records)
+        history.__symbols = list(self.__symbols)
+        history.__codes = dict(self.__codes)
+        history.__initial = None if self.__initial is None else dict(self.__initial)
+        return history
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self.records["equity"]
+
+    @property
+    def symbols(self) -> list[str]:
+        return self.__symbols
+
+    def __len__(self) -> int:
+        return self.__spilled + self.__size
+
+    def rows(self) -> list[dict]:
+        """
+        Rebuild formatted rows: {'AAPL': '10 @ 100.5', ..., 'Cash': '99000.00'}.
+        """
+        state = {
+            self.__symbols[code]: f"{format_number(qty)} @ {format_number(avg)}"
+            for code, (qty, avg) in (self.__initial or {}).items()
+        }
+        rows = []
+        records = self.records
+        for code, qty, avg, cash in zip(
+            records["symbol"].tolist(),
+            records["quantity"].tolist(),
+            records["avg_price"].tolist(),
+            records["cash"].tolist(),
+        ):
+            if code >= 0:
+                state[self.__symbols[code]] = (
+                    f"{format_number(qty)} @ {format_number(avg)}"
+                )
+            row = dict(state)
+            row["Cash"] = f"{cash:.2f}"
+            rows.append(row)
+        return rows
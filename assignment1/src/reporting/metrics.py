@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+PERIODS_PER_YEAR = 252
+
+
+@dataclass(frozen=True)
+class PerformanceMetrics:
+    """
+    Performance statistics of one equity curve.
+
+    All ratios are fractions (0.05 == 5%). `max_drawdown` is <= 0, measured
+    from the running peak of the equity curve.
+    """
+
+    equity: np.ndarray
+    returns: np.ndarray
+    drawdown: np.ndarray
+    total_return: float
+    mean_return: float
+    std_return: float
+    volatility: float  # annualized std of periodic returns
+    sharpe: float  # annualized
+    max_drawdown: float
+
+
+def compute_metrics(equity, risk_free_rate: float) -> PerformanceMetrics:
+    """
+    Compute all metrics for an equity curve in O(n) vectorized passes.
+
+    `equity` may be a NumPy array or any sequence of floats; None entries in
+    a sequence are ignored.
+    """
+    if not isinstance(equity, np.ndarray):
+        equity = [e for e in equity if e is not None]
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        raise ValueError("Equity curve is empty")
+
+    # periodic returns, 0 where the previous equity is 0
+    previous = equity[:-1]
+    returns = np.divide(
+        np.diff(equity),
+        previous,
+        out=np.zeros_like(previous),
+        where=previous != 0,
+    )
+
+    # drawdown from the running peak (single pass instead of all (i, j) pairs)
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.divide(
+        equity - peak, peak, out=np.zeros_like(equity), where=peak != 0
+    )
+
+    mean_return = float(returns.mean()) if returns.size else 0.0
+    std_return = float(returns.std()) if returns.size else 0.0
+    sharpe = (
+        (mean_return - risk_free_rate / PERIODS_PER_YEAR)
+        / std_return
+        * np.sqrt(PERIODS_PER_YEAR)
+        if std_return > 0
+        else 0.0
+    )
+    total_return = (
+        float((equity[-1] - equity[0]) / equity[0]) if equity[0] != 0 else 0.0
+    )
+
+    return PerformanceMetrics(
+        equity=equity,
+        returns=returns,
+        drawdown=drawdown,
+        total_return=total_return,
+        mean_return=mean_return,
+        std_return=std_return,
+        volatility=std_return * float(np.sqrt(PERIODS_PER_YEAR)),
+        sharpe=float(sharpe),
+        max_drawdown=float(drawdown.min()),
+    )
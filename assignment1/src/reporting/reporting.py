@@ -1,19 +1,156 @@
 import csv
-import math
-import matplotlib.pyplot as plt
+import io
+import itertools
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from matplotlib.figure import Figure
+
+from src.models import ExecutionStatus
+
+from .history import PortfolioHistory
+from .metrics import PerformanceMetrics, compute_metrics
 
 
 RISK_FREE_RATE = 0.04  # Annual risk-free rate
 
 
+TRADE_HEADER = ["Action", "Symbol", "Quantity", "Price", "Status"]
+
+
+_run_counter = itertools.count()
+
+
+def new_run_dir(root: str = "runs") -> str:
+    """
+    Create and return a fresh output directory for one backtest run,
+    e.g. runs/20250101-093000-4242-0 (timestamp, process id, counter), so
+    concurrent runs in one working directory never share output files.
+    """
+    run_dir = os.path.join(
+        root,
+        f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{next(_run_counter)}",
+    )
+    os.makedirs(run_dir)
+    return run_dir
+
+
+def _write_text(path: str, text: str) -> None:
+    # write to a temporary file and rename, so readers (and concurrent runs)
+    # never see a half-written file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", newline="") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _csv_text(rows, fieldnames=None) -> str:
+    # render all rows in memory so the file is written with a single call
+    buffer = io.StringIO()
+    if fieldnames is None:
+        csv.writer(buffer).writerows(rows)
+    else:
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue()
+
+
 class Report:
-    def __init__(self):
+    """
+    Collects trade logs and portfolio history during a backtest.
+
+    If `spill_dir` is given, buffered records are appended to files in that
+    directory every `flush_every` trades and dropped from memory, so memory
+    stays flat regardless of run length. Accessors and the create_* methods
+    read the spilled records back when they are needed.
+
+    Output files go to `out/` and `performance.md` by default. If `run_dir` is
+    given (see new_run_dir), all of them, including performance.md, are
+    written to that directory instead. Each file is rendered in memory and
+    written in one call; write_outputs(background=True) does all of it on a
+    worker thread.
+    """
+
+    def __init__(
+        self,
+        spill_dir: str | None = None,
+        flush_every: int = 10_000,
+        run_dir: str | None = None,
+    ):
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        if run_dir is None:
+            self.__output_dir, self.__performance_path = "out", "performance.md"
+        else:
+            self.__output_dir = run_dir
+            self.__performance_path = os.path.join(run_dir, "performance.md")
+        self.__writer = None
+
         self.__logs = []
-        self.__trades = [["Action", "Symbol", "Quantity", "Price", "Status"]]
-        # portfolio history will store dictionaries suitable for csv.DictWriter
-        self.__portfolio_history = []
-        # numeric history for performance calculations (list of floats)
-        self.__equity_curve = []
+        self.__trades = [TRADE_HEADER]
+        # numeric portfolio history (cash, equity, traded position) per trade;
+        # formatted rows are only built for create_portfolio_data
+        self.__history = PortfolioHistory(
+            spill_path=(
+                os.path.join(spill_dir, "portfolio_history.bin")
+                if spill_dir is not None
+                else None
+            )
+        )
+        # metrics are computed once on demand and dropped when equity changes
+        self.__metrics = None
+
+        self.__spill_dir = spill_dir
+        self.__flush_every = flush_every
+        if spill_dir is not None:
+            # start from empty spill files, header row goes to disk instead
+            open(self.__spill_path("logs.jsonl"), "w").close()
+            with open(self.__spill_path("trades.csv"), "w", newline="") as f:
+                csv.writer(f).writerow(TRADE_HEADER)
+            self.__trades = []
+
+    def __spill_path(self, name):
+        return os.path.join(self.__spill_dir, name)
+
+    def __output_path(self, name):
+        os.makedirs(self.__output_dir, exist_ok=True)
+        return os.path.join(self.__output_dir, name)
+
+    @property
+    def output_dir(self) -> str:
+        return self.__output_dir
+
+    @property
+    def performance_path(self) -> str:
+        return self.__performance_path
+
+    def flush(self):
+        """
+        Append buffered records to the spill files and clear the buffers.
+        No-op when the report is kept in memory.
+        """
+        if self.__spill_dir is None:
+            return
+
+        with open(self.__spill_path("logs.jsonl"), "a") as f:
+            f.writelines(json.dumps(log) + "\n" for log in self.__logs)
+        with open(self.__spill_path("trades.csv"), "a", newline="") as f:
+            csv.writer(f).writerows(self.__trades)
+        self.__history.flush()
+
+        self.__logs.clear()
+        self.__trades.clear()
+
+    def __read_jsonl(self, name):
+        self.flush()
+        with open(self.__spill_path(name)) as f:
+            return [json.loads(line) for line in f]
 
     def add_trade_log(self, trade=None, log=None):
         # If trade successful
@@ -31,112 +168,121 @@ class Report:
 
     def execute_trade(self, trade, log, portfolio):
         self.add_trade_log(trade, log)
+        self.__metrics = None
 
-        # store human-readable portfolio snapshot for CSV output
-        self.__portfolio_history.append(portfolio.positions)
-
-        # attempt to store a numeric snapshot for performance calculations
-        try:
-            snap = portfolio.snapshot()
-            # compute a simple equity value: cash + sum(quantity * avg_price)
-            equity = float(snap.get("Cash", 0.0))
-            for symbol, info in snap.items():
-                if symbol == "Cash":
-                    continue
-                qty = info.get("quantity", 0)
-                avg = info.get("avg_price", 0.0)
-                equity += float(qty) * float(avg)
-
-            self.__equity_curve.append(equity)
-        except Exception:
-            # if portfolio doesn't implement snapshot we'll skip numeric history
-            self.__equity_curve.append(None)
+        # only the traded symbol can have changed
+        self.__history.record(portfolio, trade.symbol if trade else None)
+
+        if self.__spill_dir is not None and len(self.__logs) >= self.__flush_every:
+            self.flush()
+
+    def execute_batch(self, signals, status, portfolio, errors=None):
+        """
+        Record the non-HOLD results of Engine.execute_batch.
+
+        `status` holds one ExecutionStatus per signal; `errors` maps the index
+        of each rejected or failed signal to its log message.
+        """
+        errors = errors or {}
+        self.__metrics = None
+
+        recorded = []
+        for i, code in enumerate(status.tolist()):
+            if code == ExecutionStatus.HOLD:
+                continue
+            signal = signals[i]
+            if code == ExecutionStatus.FILLED:
+                action, symbol = signal.action.upper(), signal.symbol.upper()
+                self.__trades.append(
+                    [action, symbol, signal.quantity, signal.price, "FILLED"]
+                )
+                self.__logs.append(
+                    f"{action} {signal.quantity} of {symbol} at price {signal.price}. Order status is FILLED"
+                )
+                recorded.append(symbol)
+            else:
+                self.__logs.append(errors.get(i))
+                recorded.append(None)
+        self.__history.record_many(portfolio, recorded)
+
+        if self.__spill_dir is not None and len(self.__logs) >= self.__flush_every:
+            self.flush()
 
     @property
     def portfolio_history(self):
-        return self.__portfolio_history
+        return self.__history.rows()
 
     @property
     def logs(self):
+        if self.__spill_dir is not None:
+            return self.__read_jsonl("logs.jsonl")
         return self.__logs
 
     def display_logs(self):
-        for log in self.__logs:
+        for log in self.logs:
             print(log)
 
-    def create_portfolio_data(self):
+    def create_portfolio_data(self, history: PortfolioHistory | None = None):
+        history = (history or self.__history).rows()
+
+        fieldnames = history[-1].keys()
+        _write_text(
+            self.__output_path("portfolio_data.csv"), _csv_text(history, fieldnames)
+        )
 
-        fieldnames = self.__portfolio_history[-1].keys()
-        with open("out/portfolio_data.csv", "w", newline="") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.__portfolio_history)
+    def create_trade_data(self, trades: list | None = None):
+        if trades is None and self.__spill_dir is not None:
+            self.flush()
+            shutil.copyfile(
+                self.__spill_path("trades.csv"), self.__output_path("trade_data.csv")
+            )
+            return
 
-    def create_trade_data(self):
-        with open("out/trade_data.csv", "w", newline="") as csvfile:
+        _write_text(
+            self.__output_path("trade_data.csv"),
+            _csv_text(self.__trades if trades is None else trades),
+        )
 
-            writer = csv.writer(csvfile)
-            writer.writerows(self.__trades)
+    @property
+    def metrics(self) -> PerformanceMetrics:
+        """
+        Performance metrics of the equity curve, cached until the next trade.
+        """
+        if self.__metrics is None:
+            self.__metrics = compute_metrics(self.__history.equity, RISK_FREE_RATE)
+        return self.__metrics
 
-    def create_performance_data(self):
-        # filter out None entries
-        equity = [e for e in self.__equity_curve if e is not None]
-        if not equity:
-            # nothing to compute
-            return
+    def create_performance_data(self, metrics: PerformanceMetrics | None = None):
+        if metrics is None:
+            if not len(self.__history):
+                # nothing to compute
+                return
+            metrics = self.metrics
 
         # write equity curve
-        with open("out/equity_curve.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["equity"])
-            for v in equity:
-                writer.writerow([v])
-
-        returns = []
-        for i in range(1, len(equity)):
-            prev = equity[i - 1]
-            cur = equity[i]
-            if prev == 0:
-                returns.append(0.0)
-            else:
-                returns.append((cur - prev) / prev)
+        equity_path = self.__output_path("equity_curve.csv")
+        _write_text(
+            equity_path,
+            "equity\n" + "".join(f"{v}\n" for v in metrics.equity.tolist()),
+        )
 
-        avg_ret = sum(returns) / len(returns) if returns else 0.0
-        std_ret = (
-            math.sqrt(sum((r - avg_ret) ** 2 for r in returns) / len(returns))
-            if returns
-            else 0.0
+        _write_text(
+            self.__performance_path,
+            "# Performance Summary\n\n"
+            f"Total Return: {metrics.total_return:.4f}\n\n"
+            f"Sharpe Ratio (annualized): {metrics.sharpe:.4f}\n\n"
+            f"Max Drawdown: {-metrics.max_drawdown:.4f}\n\n"
+            f"Equity curve is saved in `{self.__relative(equity_path)}`.\n",
         )
-        sharpe = (
-            (avg_ret - RISK_FREE_RATE / 252) / (std_ret) * math.sqrt(252)
-            if std_ret > 0
-            else 0.0
+
+        _write_text(
+            self.__output_path("periodic_returns.csv"),
+            "return\n" + "".join(f"{r}\n" for r in metrics.returns.tolist()),
         )
 
-        # max drawdown
-        peak = equity[0]
-        max_dd = 0.0
-        for v in equity:
-            if v > peak:
-                peak = v
-            dd = (peak - v) / peak if peak != 0 else 0.0
-            if dd > max_dd:
-                max_dd = dd
-
-        total_return = (equity[-1] - equity[0]) / equity[0] if equity[0] != 0 else 0.0
-
-        with open("performance.md", "w") as f:
-            f.write("# Performance Summary\n\n")
-            f.write(f"Total Return: {total_return:.4f}\n\n")
-            f.write(f"Sharpe Ratio (annualized): {sharpe:.4f}\n\n")
-            f.write(f"Max Drawdown: {max_dd:.4f}\n\n")
-            f.write("Equity curve is saved in `out/equity_curve.csv`.\n")
-
-        with open("out/periodic_returns.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["return"])
-            for r in returns:
-                writer.writerow([r])
+    def __relative(self, path):
+        # paths in performance.md are relative to the file itself
+        return os.path.relpath(path, os.path.dirname(self.__performance_path) or ".")
 
     def _generate_narrative(
         self, total_return, average_return, std_return, annual_sharpe, max_drawdown
@@ -197,7 +343,7 @@ class Report:
 
         return "\n".join(narrative_lines)
 
-    def performance_report(self):
+    def performance_report(self, metrics: PerformanceMetrics | None = None):
         """
         Generate a performance report.
 
@@ -206,35 +352,20 @@ class Report:
             Sharpe ratio
             Maximum drawdown
         """
-        total_return = (
-            self.__equity_curve[-1] - self.__equity_curve[0]
-        ) / self.__equity_curve[0]
-
-        returns = [
-            (self.__equity_curve[i] - self.__equity_curve[i - 1])
-            / self.__equity_curve[i - 1]
-            for i in range(1, len(self.__equity_curve))
-        ]
-
-        average_return = sum(returns) / len(returns)
-
-        std_return = math.sqrt(
-            sum((r - average_return) ** 2 for r in returns) / len(returns)
-        )
-
-        daily_sharpe = (average_return - RISK_FREE_RATE / 252) / std_return
-        annual_sharpe = daily_sharpe * math.sqrt(252)
-
-        # max drawdown
-        max_drawdown = min(
-            (self.__equity_curve[i] - self.__equity_curve[j]) / self.__equity_curve[j]
-            for i in range(len(self.__equity_curve))
-            for j in range(i)
-        )
-
+        metrics = metrics or self.metrics
+        total_return = metrics.total_return
+        returns = metrics.returns
+        average_return = metrics.mean_return
+        std_return = metrics.std_return
+        annual_sharpe = metrics.sharpe
+        max_drawdown = metrics.max_drawdown
+
+        # figures are built without pyplot so reports can be written from a
+        # background thread
         # create equity curve plot
-        fig, ax = plt.subplots()
-        ax.plot(self.__equity_curve)
+        fig = Figure()
+        ax = fig.subplots()
+        ax.plot(metrics.equity, label="Equity")
 
         ax.set_xlabel("Time")
         ax.set_ylabel("Equity")
@@ -242,15 +373,19 @@ class Report:
         ax.legend()
         fig.autofmt_xdate()
 
-        fig.savefig("out/equity_curve.png")
+        equity_plot = self.__output_path("equity_curve.png")
+        fig.savefig(equity_plot)
 
         # create periodic returns plot
-        fig, ax = plt.subplots()
+        fig = Figure()
+        ax = fig.subplots()
         ax.hist(returns, bins=30)
         ax.set_xlabel("Return")
         ax.set_ylabel("Frequency")
         ax.set_title("Periodic Returns")
-        fig.savefig("out/periodic_returns.png")
+        returns_plot = self.__output_path("periodic_returns.png")
+        fig.savefig(returns_plot)
+        equity_plot, returns_plot = self.__relative(equity_plot), self.__relative(returns_plot)
         narrative = self._generate_narrative(
             total_return=total_return,
             average_return=average_return,
@@ -277,14 +412,62 @@ class Report:
 
 ## Equity Curve Plot
 
-![Equity Curve](./out/equity_curve.png 'equity curve at out/equity_curve.png')
+![Equity Curve](./{equity_plot} 'equity curve at {equity_plot}')
 
 ## Periodic Returns Plot
 
-![Periodic Returns](./out/periodic_returns.png 'periodic returns at out/periodic_returns.png')
+![Periodic Returns](./{returns_plot} 'periodic returns at {returns_plot}')
 """
         return report
 
-    def output_performance_report(self):
-        with open("performance.md", "w") as f:
-            f.write(self.performance_report())
+    def output_performance_report(self, metrics: PerformanceMetrics | None = None):
+        _write_text(self.__performance_path, self.performance_report(metrics))
+
+    def write_outputs(self, background: bool = False) -> Future:
+        """
+        Write every output file: trade data, portfolio data, performance data
+        and the performance report.
+
+        The state to write is captured first, so with background=True the
+        files are rendered and written on a worker thread while the caller
+        keeps trading. Returns a Future that completes (or raises) once all
+        files are on disk; writes from one report run in submission order.
+        """
+        if not len(self.__history):
+            done = Future()
+            done.set_result(None)
+            return done
+
+        # snapshot in the calling thread: later trades must not leak in
+        metrics = self.metrics
+        history = self.__history.copy()
+        if self.__spill_dir is not None:
+            self.flush()
+            trades_path = self.__output_path("trade_data.csv")
+            shutil.copyfile(self.__spill_path("trades.csv"), trades_path)
+            trades = None
+        else:
+            trades = list(self.__trades)
+
+        def write():
+            if trades is not None:
+                self.create_trade_data(trades)
+            self.create_portfolio_data(history)
+            self.create_performance_data(metrics)
+            self.output_performance_report(metrics)
+
+        if not background:
+            done = Future()
+            write()
+            done.set_result(None)
+            return done
+
+        if self.__writer is None:
+            self.__writer = ThreadPoolExecutor(max_workers=1)
+        return self.__writer.submit(write)
+
+    def close(self):
+        """Wait for pending background writes and stop the writer thread."""
+        if self.__writer is not None:
+            self.__writer.shutdown(wait=True)
+            self.__writer = None
@@ -2,6 +2,7 @@
 
 from .strategies import (
     Strategy,
+    RollingWindow,
     SimpleMovingAverageCrossoverStrategy,
     MeanReversionStrategy,
     ExponentialMovingAverageCrossoverStrategy,
@@ -9,6 +10,7 @@ from .strategies import (
 
 __all__ = [
     "Strategy",
+    "RollingWindow",
     "SimpleMovingAverageCrossoverStrategy",
     "MeanReversionStrategy",
     "ExponentialMovingAverageCrossoverStrategy",
@@ -4,6 +4,54 @@ from dataclasses import dataclass
 from collections import defaultdict
 
 
+class RollingWindow:
+    """
+    Fixed-size ring buffer of prices with a running sum.
+
+    append() is O(1) and memory is O(size). The sum is recomputed from the
+    buffer each time the ring wraps around (amortized O(1)) so floating point
+    error from the running add/subtract cannot accumulate.
+    """
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("Window size must be a positive integer")
+        self.__size = size
+        self.__values = [0.0] * size
+        self.__index = 0
+        self.__count = 0
+        self.__total = 0.0
+
+    def append(self, value: float) -> None:
+        index = self.__index
+        self.__total += value - self.__values[index]
+        self.__values[index] = value
+
+        index += 1
+        if index == self.__size:
+            index = 0
+            self.__total = sum(self.__values)
+        self.__index = index
+
+        if self.__count < self.__size:
+            self.__count += 1
+
+    @property
+    def full(self) -> bool:
+        return self.__count == self.__size
+
+    @property
+    def total(self) -> float:
+        return self.__total
+
+    @property
+    def mean(self) -> float:
+        return self.__total / self.__count if self.__count else 0.0
+
+    def __len__(self) -> int:
+        return self.__count
+
+
 class Strategy(ABC):
 
     def __init__(self):
@@ -23,6 +71,9 @@ class SimpleMovingAverageCrossoverStrategy(Strategy):
         self.__short_window = short_window
         self.__long_window = long_window
         self.__last_signal: dict[str, str] = {}
+        # O(window) memory per symbol instead of the full price history
+        self.__short_prices: dict[str, RollingWindow] = {}
+        self.__long_prices: dict[str, RollingWindow] = {}
 
     def generate_signals(
         self, tick: MarketDataPoint
@@ -32,15 +83,17 @@ class SimpleMovingAverageCrossoverStrategy(Strategy):
         symbol = tick.symbol
         price = float(tick.price)
 
-        self._prices[symbol].append(price)
-
-        if len(self._prices[symbol]) >= self.__long_window:
-            short_ma = (
-                sum(self._prices[symbol][-self.__short_window :]) / self.__short_window
-            )
-            long_ma = (
-                sum(self._prices[symbol][-self.__long_window :]) / self.__long_window
-            )
+        if symbol not in self.__long_prices:
+            self.__short_prices[symbol] = RollingWindow(self.__short_window)
+            self.__long_prices[symbol] = RollingWindow(self.__long_window)
+        short_prices = self.__short_prices[symbol]
+        long_prices = self.__long_prices[symbol]
+        short_prices.append(price)
+        long_prices.append(price)
+
+        if long_prices.full:
+            short_ma = short_prices.mean
+            long_ma = long_prices.mean
             if short_ma > long_ma:
                 # if self.__last_signal.get(symbol) == "BUY":
                 #     return signals
@@ -67,20 +120,19 @@ class MeanReversionStrategy(Strategy):
         super().__init__()
         self.__mean_length = mean_length
         self.__threshold = threshold
+        self.__windows: dict[str, RollingWindow] = {}
 
     def generate_signals(self, tick: MarketDataPoint) -> list[Signal]:
         signals = []
         symbol = tick.symbol
         price = float(tick.price)
-        if symbol not in self._prices:
-            self._prices[symbol] = []
-        self._prices[symbol].append(price)
-
-        if len(self._prices[symbol]) > self.__mean_length:
-            self._prices[symbol].pop(0)
+        if symbol not in self.__windows:
+            self.__windows[symbol] = RollingWindow(self.__mean_length)
+        window = self.__windows[symbol]
+        window.append(price)
 
-        if len(self._prices[symbol]) >= self.__mean_length:
-            mean_price = sum(self._prices[symbol]) / self.__mean_length
+        if window.full:
+            mean_price = window.mean
             # print(f"Mean price for {symbol}: {mean_price}")
             if price < mean_price * (1 - self.__threshold):
                 signals.append(Signal("BUY", symbol, 1, price))
@@ -0,0 +1,489 @@
+"""
+Benchmarks for the trading engine.
+
+Each benchmark runs the engine on a synthetic price panel (no downloads) and
+checks that the fast path produces exactly the same trades as the reference
+path before timing both.
+
+    python benchmark.py
+"""
+
+import copy
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from engine import Engine, MultiEngine, PreparedData, WalkForward
+from portfolio import CostModel, ExecutionModel
+from strategies.ema import (
+    ExponentialMovingAverage,
+    MovingAverage,
+    RelativeStrengthIndex,
+    RollingStandardDeviation,
+    exponential_moving_average_matrix,
+    moving_average_matrix,
+    relative_strength_index_matrix,
+    rolling_standard_deviation_matrix,
+)
+from strategies import (
+    BenchmarkStrategy,
+    MACDStrategy,
+    MovingAverageStrategy,
+    RSIStrategy,
+    Strategy,
+    VolatilityBreakoutStrategy,
+)
+from tests.conftest import tick_only
+
+
+def synthetic_prices(days: int = 2520, tickers: int = 100, seed: int = 0) -> pd.DataFrame:
+    """
+    Random-walk close prices shaped like PriceLoader.load_data output.
+
+    Args:
+        days: Number of trading days
+        tickers: Number of tickers
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Dates as index and tickers as columns
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.015, (days, tickers))
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    index = pd.bdate_range("2005-01-03", periods=days, name="Date")
+    return pd.DataFrame(prices, index=index, columns=[f"T{i:03d}" for i in range(tickers)])
+
+
+def signal_lists_only(strategy: Strategy) -> Strategy:
+    """Force per-tick Signal lists (with HOLDs) by hiding the sparse row path."""
+    strategy.generate_row_actions = lambda timestamp, symbols, prices: None  # type: ignore
+    return strategy
+
+
+def run_engine(
+    make_strategy: Callable[[], Strategy], data: pd.DataFrame, **engine_options: Any
+) -> Engine:
+    engine = Engine(make_strategy(), **engine_options)
+    engine.run(data)
+    return engine
+
+
+def assert_same_trades(
+    reference: Engine, current: Engine, name: str, nav_rtol: float = 0.0
+) -> None:
+    """
+    Raise AssertionError unless both engines traded identically.
+
+    Args:
+        reference: Engine run on the reference path
+        current: Engine run on the path under test
+        name: Label used in the error message
+        nav_rtol: Relative tolerance of the NAV comparison (0 means exact),
+            for paths that sum positions in a different order
+    """
+    pd.testing.assert_frame_equal(
+        reference.get_report().get_signal_dataframe(),
+        current.get_report().get_signal_dataframe(),
+        check_exact=True,
+        obj=f"{name} trades",
+    )
+    pd.testing.assert_frame_equal(
+        reference.get_report().get_nav_dataframe(),
+        current.get_report().get_nav_dataframe(),
+        check_exact=not nav_rtol,
+        rtol=nav_rtol,
+        obj=f"{name} NAV",
+    )
+
+
+def compare(
+    name: str,
+    make_reference: Callable[[], Strategy],
+    make_current: Callable[[], Strategy],
+    data: pd.DataFrame,
+    repeat: int = 3,
+    reference_options: Optional[Dict[str, Any]] = None,
+    current_options: Optional[Dict[str, Any]] = None,
+    nav_rtol: float = 0.0,
+) -> None:
+    reference_options = reference_options or {}
+    current_options = current_options or {}
+    reference = run_engine(make_reference, data, **reference_options)
+    current = run_engine(make_current, data, **current_options)
+    assert_same_trades(reference, current, name, nav_rtol)
+
+    trades = len(current.get_report().get_signal_dataframe())
+    t_reference = min(
+        timeit.repeat(
+            lambda: run_engine(make_reference, data, **reference_options),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    t_current = min(
+        timeit.repeat(
+            lambda: run_engine(make_current, data, **current_options),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    print(
+        f"{name:<40} {trades:>8} trades  reference {t_reference:7.3f}s  "
+        f"current {t_current:7.3f}s  x{t_reference / t_current:5.1f}"
+    )
+
+
+def benchmark_signal_matrix(data: Optional[pd.DataFrame] = None) -> None:
+    print("=== Strategies: signal matrix vs. per-tick signals ===")
+    if data is None:
+        data = synthetic_prices()
+    for strategy in [
+        MovingAverageStrategy,
+        MACDStrategy,
+        RSIStrategy,
+        VolatilityBreakoutStrategy,
+    ]:
+        compare(
+            strategy.__name__,
+            lambda: tick_only(strategy()),
+            strategy,
+            data,
+            reference_options={"array_portfolio": False},
+            current_options={"array_portfolio": False},
+        )
+
+
+def benchmark_portfolio(data: Optional[pd.DataFrame] = None) -> None:
+    print("=== Portfolio: array-backed vs. dict positions ===")
+    if data is None:
+        data = synthetic_prices(tickers=500)
+    for strategy in [BenchmarkStrategy, MACDStrategy]:
+        compare(
+            strategy.__name__,
+            strategy,
+            strategy,
+            data,
+            reference_options={"array_portfolio": False},
+            current_options={"array_portfolio": True},
+            # the dot product sums positions in a different order
+            nav_rtol=1e-12,
+        )
+
+
+def benchmark_execution(data: Optional[pd.DataFrame] = None) -> None:
+    print("=== Execution: built-in fills vs. frictionless ExecutionModel ===")
+    if data is None:
+        data = synthetic_prices(tickers=500)
+    for strategy in [BenchmarkStrategy, MACDStrategy]:
+        compare(
+            strategy.__name__,
+            strategy,
+            strategy,
+            data,
+            current_options={"execution": ExecutionModel()},
+        )
+
+    costs = CostModel(commission=1.0, commission_bps=5.0, slippage_bps=10.0)
+    print(f"=== Execution: per-order fills vs. vectorized ArrayPortfolio fills, {costs} ===")
+    for strategy in [MACDStrategy, VolatilityBreakoutStrategy]:
+        compare(
+            strategy.__name__,
+            strategy,
+            strategy,
+            data,
+            reference_options={"execution": costs},
+            current_options={"execution": costs, "array_portfolio": True},
+            nav_rtol=1e-12,
+        )
+    seconds = timeit.timeit(
+        lambda: run_engine(MACDStrategy, data, array_portfolio=True), number=1
+    )
+    print(f"  MACDStrategy on an ArrayPortfolio without costs: {seconds:.3f}s")
+
+
+def reference_moving_average(values: List[float], window: int) -> List[float]:
+    """Previous MovingAverage.update: list.pop(0) and a full re-sum per tick."""
+    history: List[float] = []
+    result = []
+    for value in values:
+        history.append(value)
+        if len(history) > window:
+            history.pop(0)
+        result.append(sum(history) / len(history))
+    return result
+
+
+def reference_rsi(values: List[float], period: int) -> List[float]:
+    """Previous RSIStrategy._get_rsi: np.diff over the window per tick."""
+    history: List[float] = []
+    result = []
+    for value in values:
+        ready = len(history) >= period
+        history.append(value)
+        if len(history) > period:
+            history.pop(0)
+        if not ready:
+            result.append(np.nan)
+            continue
+        deltas = np.diff(history)
+        up = np.where(deltas > 0, deltas, 0.0).sum() / period
+        down = -np.where(deltas < 0, deltas, 0.0).sum() / period
+        rs = up / down if down != 0 else 0
+        result.append(100 - (100 / (1 + rs)))
+    return result
+
+
+def reference_rolling_std(values: List[float], window: int) -> List[float]:
+    """Previous VolatilityBreakoutStrategy._rolling_vol: np.std of a slice."""
+    history: List[float] = []
+    result = []
+    for value in values:
+        history.append(value)
+        result.append(np.std(history[-window:]) if len(history) >= window else np.nan)
+    return result
+
+
+def per_tick(make_indicator: Callable[[], Any], values: List[float]) -> List[float]:
+    indicator = make_indicator()
+    result = []
+    for value in values:
+        current = indicator.update(value)
+        result.append(np.nan if current is None else current)
+    return result
+
+
+def benchmark_indicators(ticks: int = 20_000, repeat: int = 3) -> None:
+    print("=== Indicators: O(1) kernels vs. window recomputation (per tick) ===")
+    prices = synthetic_prices(days=ticks, tickers=1)["T000"].tolist()
+    returns = np.diff(prices) / np.asarray(prices[:-1])
+    cases = [
+        (
+            "MovingAverage(50)",
+            lambda: reference_moving_average(prices, 50),
+            lambda: per_tick(lambda: MovingAverage(50), prices),
+        ),
+        (
+            "RelativeStrengthIndex(14)",
+            lambda: reference_rsi(prices, 14),
+            lambda: per_tick(lambda: RelativeStrengthIndex(14), prices),
+        ),
+        (
+            "RollingStandardDeviation(20)",
+            lambda: reference_rolling_std(returns.tolist(), 20),
+            lambda: per_tick(lambda: RollingStandardDeviation(20), returns.tolist()),
+        ),
+    ]
+    for name, reference, current in cases:
+        # running sums round differently from re-summing the window
+        np.testing.assert_allclose(current(), reference(), rtol=1e-9, atol=1e-12)
+        t_reference = min(timeit.repeat(reference, number=1, repeat=repeat))
+        t_current = min(timeit.repeat(current, number=1, repeat=repeat))
+        print(
+            f"{name:<40} {ticks:>8} ticks   reference {t_reference:7.3f}s  "
+            f"current {t_current:7.3f}s  x{t_reference / t_current:5.1f}"
+        )
+
+    print("=== Indicators: panel kernels vs. row-by-row updates ===")
+    panel = synthetic_prices().to_numpy()
+    panel_cases = [
+        ("moving_average_matrix(50)", MovingAverage, moving_average_matrix, 50),
+        (
+            "exponential_moving_average_matrix(26)",
+            ExponentialMovingAverage,
+            exponential_moving_average_matrix,
+            26,
+        ),
+        (
+            "relative_strength_index_matrix(14)",
+            RelativeStrengthIndex,
+            relative_strength_index_matrix,
+            14,
+        ),
+        (
+            "rolling_standard_deviation_matrix(20)",
+            RollingStandardDeviation,
+            rolling_standard_deviation_matrix,
+            20,
+        ),
+    ]
+    for name, indicator, kernel, size in panel_cases:
+        np.testing.assert_allclose(
+            kernel(panel, size),
+            indicator(size).update_many(panel),
+            rtol=1e-9,
+            atol=1e-9,
+        )
+        t_reference = min(
+            timeit.repeat(
+                lambda: indicator(size).update_many(panel), number=1, repeat=repeat
+            )
+        )
+        t_current = min(timeit.repeat(lambda: kernel(panel, size), number=1, repeat=repeat))
+        print(
+            f"{name:<40} {panel.size:>8} values  reference {t_reference:7.3f}s  "
+            f"current {t_current:7.3f}s  x{t_reference / t_current:5.1f}"
+        )
+
+
+def benchmark_multi_engine(data: Optional[pd.DataFrame] = None, repeat: int = 3) -> None:
+    print("=== MultiEngine: shared signal matrices vs. one Engine.run per engine ===")
+    if data is None:
+        data = synthetic_prices()
+    strategies: Dict[str, Callable[[], Strategy]] = {
+        "MovingAverageStrategy": MovingAverageStrategy,
+        "MACDStrategy": MACDStrategy,
+        "RSIStrategy": RSIStrategy,
+        "VolatilityBreakoutStrategy": VolatilityBreakoutStrategy,
+    }
+    # each strategy under several portfolio/execution settings, i.e. several
+    # engines per signal matrix
+    settings: Dict[str, Dict[str, Any]] = {
+        "long": {},
+        "array": {"array_portfolio": True},
+        "costs": {"execution": CostModel(commission=1.0, slippage_bps=5.0)},
+    }
+    engines = {
+        f"{name} {setting}": (make, options)
+        for name, make in strategies.items()
+        for setting, options in settings.items()
+    }
+
+    def separate() -> Dict[str, Engine]:
+        return {
+            name: run_engine(make, data, **options)
+            for name, (make, options) in engines.items()
+        }
+
+    def shared() -> MultiEngine:
+        multi = MultiEngine(
+            {name: Engine(make(), **options) for name, (make, options) in engines.items()}
+        )
+        multi.run(data)
+        return multi
+
+    reference = separate()
+    current = shared().engines
+    for name in engines:
+        assert_same_trades(reference[name], current[name], name)
+
+    t_reference = min(timeit.repeat(separate, number=1, repeat=repeat))
+    t_current = min(timeit.repeat(shared, number=1, repeat=repeat))
+    label = f"{len(strategies)} strategies x {len(settings)} settings"
+    print(
+        f"{label:<40} {'':>15} reference {t_reference:7.3f}s  "
+        f"current {t_current:7.3f}s  x{t_reference / t_current:5.1f}"
+    )
+
+
+def benchmark_walk_forward(data: Optional[pd.DataFrame] = None) -> None:
+    print("=== WalkForward: serial windows vs. memory-mapped worker processes ===")
+    if data is None:
+        data = synthetic_prices()
+    grid = {"short_window": [10, 20], "long_window": [50, 100]}
+
+    def evaluate(processes: Optional[int]) -> WalkForward:
+        evaluation = WalkForward(
+            MovingAverageStrategy, grid, train_size=252, test_size=63, processes=processes
+        )
+        evaluation.run(data)
+        return evaluation
+
+    start = timeit.default_timer()
+    serial = evaluate(None)
+    t_reference = timeit.default_timer() - start
+    start = timeit.default_timer()
+    parallel = evaluate(4)
+    t_current = timeit.default_timer() - start
+    assert serial.get_equity_curve().equals(parallel.get_equity_curve()), "equity curves differ"
+    label = f"{len(serial.get_reports())} windows x 4 parameter sets"
+    print(
+        f"{label:<40} {'':>15} reference {t_reference:7.3f}s  "
+        f"current {t_current:7.3f}s  x{t_reference / t_current:5.1f}"
+    )
+
+
+def traced_rows(produce: Callable[[int], list], rows: range) -> Tuple[int, int, int]:
+    """
+    Keep the output of `produce` for every row and measure it with tracemalloc.
+
+    Returns:
+        (signals, retained bytes, peak bytes)
+    """
+    tracemalloc.start()
+    kept = [produce(row) for row in rows]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sum(len(signals) for signals in kept), current, peak
+
+
+def benchmark_sparse_signals(data: Optional[pd.DataFrame] = None) -> None:
+    print("=== Strategies: sparse row actions vs. per-symbol Signal lists ===")
+    if data is None:
+        data = synthetic_prices(days=600, tickers=500)
+    symbols = [str(symbol) for symbol in data.columns]
+    prices = data.to_numpy(dtype=np.float64)
+    timestamps = list(data.index)
+    warm = range(0, 100)
+    measured = range(100, len(prices))
+
+    for strategy in [
+        MovingAverageStrategy,
+        MACDStrategy,
+        RSIStrategy,
+        VolatilityBreakoutStrategy,
+    ]:
+        # bring both copies to the same state past the warm-up period
+        warmed = strategy()
+        for row in warm:
+            warmed.generate_row_actions(timestamps[row], symbols, prices[row])
+        lists, sparse = copy.deepcopy(warmed), copy.deepcopy(warmed)
+        # without a signal matrix, signals_at runs the strategy's row actions
+        engine = Engine(sparse)
+        engine.start(PreparedData(symbols, prices, timestamps))
+
+        def signal_list(row: int) -> list:
+            return lists.generate_signals_from_row(timestamps[row], symbols, prices[row])
+
+        def row_actions(row: int) -> list:
+            return engine.signals_at(row)
+
+        list_count, list_bytes, list_peak = traced_rows(signal_list, measured)
+        sparse_count, sparse_bytes, sparse_peak = traced_rows(row_actions, measured)
+        print(
+            f"{strategy.__name__:<40} Signals {list_count:>8} -> {sparse_count:>7}  "
+            f"retained {list_bytes / 2**20:7.1f} -> {sparse_bytes / 2**20:5.1f} MiB  "
+            f"peak {list_peak / 2**20:7.1f} -> {sparse_peak / 2**20:5.1f} MiB"
+        )
+
+    for strategy in [
+        MovingAverageStrategy,
+        MACDStrategy,
+        RSIStrategy,
+        VolatilityBreakoutStrategy,
+    ]:
+        compare(
+            strategy.__name__,
+            lambda: signal_lists_only(tick_only(strategy())),
+            lambda: tick_only(strategy()),
+            data,
+        )
+
+
+def main() -> int:
+    benchmark_indicators()
+    benchmark_signal_matrix()
+    benchmark_portfolio()
+    benchmark_execution()
+    benchmark_multi_engine()
+    benchmark_walk_forward()
+    benchmark_sparse_signals()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
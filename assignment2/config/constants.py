@@ -15,7 +15,9 @@ DEFAULT_BATCH_SIZE: Final[int] = 50
 DEFAULT_RETRY_ATTEMPTS: Final[int] = 3
 DEFAULT_DELAY_BETWEEN_BATCHES: Final[float] = 2.0  # seconds
 DEFAULT_DELAY_BETWEEN_REQUESTS: Final[float] = 0.5  # seconds
+DEFAULT_DOWNLOAD_WORKERS: Final[int] = 4
 DEFAULT_MIN_DATA_POINTS: Final[int] = 100
+DEFAULT_CACHE_BYTES: Final[int] = 256 * 1024 * 1024  # loaded series kept in memory
 
 # Portfolio configuration
 DEFAULT_INITIAL_CASH: Final[float] = 1_000_000
@@ -23,6 +25,11 @@ DEFAULT_INITIAL_CASH: Final[float] = 1_000_000
 # Strategy configuration
 DEFAULT_SHORT_WINDOW: Final[int] = 20
 DEFAULT_LONG_WINDOW: Final[int] = 50
+DEFAULT_INDICATOR_CHUNK_SIZE: Final[int] = 4096  # values buffered per series before spilling
+
+# Walk-forward configuration
+DEFAULT_WALK_FORWARD_TRAIN_DAYS: Final[int] = 756  # three years of trading days
+DEFAULT_WALK_FORWARD_TEST_DAYS: Final[int] = 252  # one year of trading days
 
 # Logging configuration
 DEFAULT_LOG_FORMAT: Final[str] = "%(asctime)s - %(levelname)s - %(message)s"
@@ -31,6 +38,8 @@ DEFAULT_LOG_FORMAT: Final[str] = "%(asctime)s - %(levelname)s - %(message)s"
 PARQUET_EXTENSION: Final[str] = ".parquet"
 CSV_EXTENSION: Final[str] = ".csv"
 JSON_EXTENSION: Final[str] = ".json"
+NPY_EXTENSION: Final[str] = ".npy"
+F64_EXTENSION: Final[str] = ".f64"  # raw float64 values
 
 # HTTP configuration
 DEFAULT_TIMEOUT: Final[int] = 30
@@ -1,6 +1,8 @@
 """Engine module for the trading engine"""
 
-from engine.engine import Engine
+from engine.engine import Engine, PreparedData
+from engine.multi_engine import MultiEngine
 from engine.report import Report
+from engine.walk_forward import WalkForward
 
-__all__ = ["Engine", "Report"]
+__all__ = ["Engine", "MultiEngine", "PreparedData", "Report", "WalkForward"]
@@ -0,0 +1,64 @@
+"""
+Growable columnar buffers for the report.
+
+This module provides an append-only table stored as one NumPy structured
+array, so tracking a row is a few writes instead of a new dict.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+class ColumnBuffer:
+    """
+    Append-only table backed by a preallocated structured array.
+
+    Capacity doubles when the array is full, so appends are amortized O(1).
+    `columns` returns views of the filled part without copying.
+    """
+
+    def __init__(self, fields: List[Tuple[str, Any]], capacity: int = 1024) -> None:
+        """
+        Initialize the ColumnBuffer.
+
+        Args:
+            fields: (name, dtype) pairs, one per column
+            capacity: Number of rows allocated up front
+        """
+        self._buffer = np.empty(max(capacity, 1), dtype=np.dtype(fields))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Column names, in order."""
+        return self._buffer.dtype.names
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._buffer):
+            self._buffer = np.resize(self._buffer, max(size, 2 * len(self._buffer)))
+
+    def append(self, *values: Any) -> None:
+        """
+        Append one row.
+
+        Args:
+            values: One value per column, in column order
+        """
+        self._reserve(self._size + 1)
+        self._buffer[self._size] = values
+        self._size += 1
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only views of the filled rows, keyed by column name."""
+        filled = self._buffer[: self._size]
+        views = {}
+        for name in self.names:
+            view = filled[name].view()
+            view.flags.writeable = False
+            views[name] = view
+        return views
@@ -6,24 +6,54 @@ execution, portfolio management, and performance tracking.
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd  # type: ignore
 
 from config.constants import DEFAULT_INITIAL_CASH
 
 from engine.report import Report
-from models import MarketDataPoint, Signal, SignalList, PriceDict, MarketAction
-from portfolio import Portfolio
+from models import Signal, SignalList, PriceDict, MarketAction
+from portfolio import ArrayPortfolio, ExecutionModel, Portfolio
 from strategies import Strategy
 
 
+class PreparedData(NamedTuple):
+    """Price data converted once for the backtest loop (see Engine.prepare)."""
+
+    symbols: List[str]
+    # contiguous float64 matrix (dates x tickers)
+    prices: np.ndarray
+    timestamps: List[datetime]
+
+    def rows(self, start: int, stop: int) -> "PreparedData":
+        """
+        Select the rows [start, stop) without copying the prices.
+
+        Args:
+            start: First row
+            stop: Row after the last one
+
+        Returns:
+            The selected rows as PreparedData
+        """
+        return PreparedData(
+            self.symbols, self.prices[start:stop], self.timestamps[start:stop]
+        )
+
+
 class Engine:
     """
     Main trading engine that orchestrates strategy execution and portfolio management.
 
     This class handles the core backtesting functionality, executing trading
     strategies on historical data and tracking portfolio performance.
+
+    `run` backtests a DataFrame in one call. Callers driving several engines
+    over the same data (MultiEngine, WalkForward) convert it once with
+    `prepare` and either call `run_prepared` or step the engine themselves:
+    `start`, then `step` for every row in order, then `finish`.
     """
 
     def __init__(
@@ -32,18 +62,59 @@ class Engine:
         cash: float = DEFAULT_INITIAL_CASH,
         short: bool = False,
         negative_cash: bool = False,
+        array_portfolio: bool = False,
+        execution: Optional[ExecutionModel] = None,
     ) -> None:
+        """
+        Initialize the Engine.
 
+        Args:
+            strategy: Strategy generating the signals
+            cash: Initial cash balance
+            short: Whether short selling is allowed
+            negative_cash: Whether cash may go negative
+            array_portfolio: Opt in to ArrayPortfolio, which tracks positions
+                in vectors aligned with the data columns (NAV is one dot
+                product per day); the default is the dict-based Portfolio
+            execution: Execution model sizing and pricing each day's orders;
+                None (or the frictionless ExecutionModel) fills every signal
+                as is (no costs)
+        """
         self._strategy = strategy
-        self._portfolio = Portfolio(cash=cash, short=short, negative_cash=negative_cash)
+        portfolio_type = ArrayPortfolio if array_portfolio else Portfolio
+        self._portfolio = portfolio_type(
+            cash=cash, short=short, negative_cash=negative_cash
+        )
         self._report = Report()
-
-    def _execute_strategy(self, *data: MarketDataPoint) -> SignalList:
+        # the frictionless model fills exactly like the built-in loop, which
+        # skips the array round trip
+        self._execution = None if type(execution) is ExecutionModel else execution
+        # data and signal matrix of the current run (see start)
+        self._data: Optional[PreparedData] = None
+        self._signal_codes: Optional[np.ndarray] = None
+
+    @property
+    def strategy(self) -> Strategy:
+        """The strategy generating the signals."""
+        return self._strategy
+
+    def _execute_strategy(
+        self,
+        timestamp: datetime,
+        symbols: List[str],
+        prices: np.ndarray,
+    ) -> SignalList:
         """
-        Execute the strategy and return the signals.
+        Execute the strategy on one row of prices and return the signals.
+
+        Strategies with sparse row actions only produce Signals for the
+        symbols that trade; the others go through generate_signals_from_row
+        (their HOLD signals are skipped later).
 
         Args:
-            *data: Variable number of MarketDataPoint objects (1 per symbol)
+            timestamp: Timestamp of the row
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
 
         Returns:
             List of trading signals
@@ -52,22 +123,119 @@ class Engine:
             ValueError: If invalid market data is provided
         """
         # Simple data validation
-        if not data:
+        if not symbols:
             return []
 
-        for point in data:
-            if point.price <= 0:
-                raise ValueError(f"Invalid price {point.price} for {point.symbol}")
+        invalid = np.flatnonzero(prices <= 0)
+        if invalid.size:
+            i = invalid[0]
+            raise ValueError(f"Invalid price {prices[i]} for {symbols[i]}")
 
-        return self._strategy.generate_signals(*data)
+        actions = self._strategy.generate_row_actions(timestamp, symbols, prices)
+        if actions is not None:
+            return self._signals_from_actions(*actions, symbols, prices)
+        return self._strategy.generate_signals_from_row(timestamp, symbols, prices)
 
-    def run(self, data: pd.DataFrame) -> None:
+    def signal_matrix(self, data: PreparedData) -> Optional[np.ndarray]:
         """
-        Run the backtest on the provided data.
+        Ask the strategy for all signals of the panel at once.
+
+        Args:
+            data: Prepared price data
+
+        Returns:
+            int8 signal matrix, or None if the strategy has no vectorized path
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        symbols, price_matrix = data.symbols, data.prices
+        if not symbols:
+            return None
+
+        invalid = price_matrix <= 0
+        if invalid.any():
+            row, col = np.argwhere(invalid)[0]
+            raise ValueError(f"Invalid price {price_matrix[row, col]} for {symbols[col]}")
+
+        return self._strategy.generate_signal_matrix(price_matrix, symbols)
+
+    def _signals_from_row(
+        self, codes: np.ndarray, symbols: List[str], prices: np.ndarray
+    ) -> SignalList:
+        """
+        Turn one row of a signal matrix into BUY/SELL signals (HOLDs dropped).
+
+        Args:
+            codes: int8 signal codes aligned with symbols
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            List of trading signals, in column order
+        """
+        columns = np.flatnonzero(codes)
+        return self._signals_from_actions(columns, codes[columns], symbols, prices)
+
+    def _signals_from_actions(
+        self,
+        columns: np.ndarray,
+        codes: np.ndarray,
+        symbols: List[str],
+        prices: np.ndarray,
+    ) -> SignalList:
+        """
+        Build the Signals of sparse row actions.
+
+        Args:
+            columns: Column indices of the actionable signals
+            codes: int8 codes (1 BUY, -1 SELL) aligned with columns
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            List of trading signals, in the order of columns
+        """
+        quantity = self._strategy.matrix_signal_quantity
+        return [
+            Signal(
+                action=MarketAction.BUY if code > 0 else MarketAction.SELL,
+                symbol=symbols[column],
+                quantity=quantity,
+                price=price,
+            )
+            for column, code, price in zip(
+                columns.tolist(), codes.tolist(), prices[columns].tolist()
+            )
+        ]
+
+    @staticmethod
+    def _to_timestamps(index: pd.Index) -> List[datetime]:
+        """
+        Convert the frame index to timestamps once for the whole run.
+
+        Args:
+            index: Index of the price data
+
+        Returns:
+            List of timestamps, one per row
+        """
+        if not pd.api.types.is_datetime64_any_dtype(index):
+            index = pd.to_datetime(index.astype(str))
+        return list(index)
+
+    @staticmethod
+    def prepare(data: pd.DataFrame) -> PreparedData:
+        """
+        Validate the price data and convert it for the backtest loop.
 
         Args:
             data: Historical price data for backtesting
 
+        Returns:
+            The column names, a contiguous float64 matrix (dates x tickers)
+            and one timestamp per row
+
         Raises:
             ValueError: If data is invalid or empty
         """
@@ -82,31 +250,77 @@ class Engine:
         ):
             raise ValueError("Data index must be datetime-like")
 
-        self._report.set_price_data(data)
+        # Convert the frame once: a contiguous float64 matrix plus symbol and
+        # timestamp arrays, so the loop below builds no pandas objects
+        symbols = [str(symbol) for symbol in data.columns]
+        price_matrix = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+        timestamps = Engine._to_timestamps(data.index)
+        return PreparedData(symbols, price_matrix, timestamps)
 
-        # looping over trading days
-        for _, row in data.iterrows():
-            # Create market data points with proper timestamp conversion
-            timestamp = (
-                row.name
-                if isinstance(row.name, datetime)
-                else pd.to_datetime(str(row.name))
-            )
+    def start(
+        self, data: PreparedData, signal_matrix: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Begin a run over `data`; the rows are then fed with `step`.
 
-            prices: PriceDict = {
-                str(symbol): float(row[symbol]) for symbol in row.index  # type: ignore
-            }
-            market_data = [
-                MarketDataPoint(
-                    timestamp=timestamp,
-                    symbol=str(symbol),
-                    price=float(row[symbol]),  # type: ignore
-                )
-                for symbol in row.index
-            ]
+        Args:
+            data: Prepared price data
+            signal_matrix: The strategy's signal matrix for `data` (see
+                signal_matrix), or None to run the strategy row by row
+        """
+        self._data = data
+        self._signal_codes = signal_matrix
+        if isinstance(self._portfolio, ArrayPortfolio):
+            self._portfolio.set_symbols(data.symbols)
+
+    def _started(self) -> PreparedData:
+        if self._data is None:
+            raise ValueError("The engine has not been started; call start() first")
+        return self._data
 
-            # Execute strategy
-            signals = self._execute_strategy(*market_data)
+    def signals_at(self, i: int) -> SignalList:
+        """
+        Generate the BUY/SELL signals of row `i` of the current run.
+
+        Without a signal matrix this runs the strategy on the row, so it must
+        be called once per row, in order.
+
+        Args:
+            i: Row index
+
+        Returns:
+            List of trading signals
+
+        Raises:
+            ValueError: If the engine has not been started, or the row holds
+                invalid market data
+        """
+        data = self._started()
+        row = data.prices[i]
+        if self._signal_codes is None:
+            return self._execute_strategy(data.timestamps[i], data.symbols, row)
+        return self._signals_from_row(self._signal_codes[i], data.symbols, row)
+
+    def step(self, i: int, signals: Optional[SignalList] = None) -> None:
+        """
+        Execute the signals of row `i` and record the result.
+
+        Args:
+            i: Row index; rows must be stepped in order
+            signals: Signals of the row, if already generated by an engine
+                running the same strategy (they must equal signals_at(i));
+                by default signals_at(i)
+
+        Raises:
+            ValueError: If the engine has not been started, or the row holds
+                invalid market data
+        """
+        data = self._started()
+        if signals is None:
+            signals = self.signals_at(i)
+        timestamp, symbols, row = data.timestamps[i], data.symbols, data.prices[i]
+
+        if self._execution is None:
             executed_signals: SignalList = []
 
             # Execute signals
@@ -119,33 +333,239 @@ class Engine:
                 except Exception:
                     # Log error but continue with other signals
                     continue
+        else:
+            executed_signals = self._execute_orders(i, symbols, row, signals)
 
-            # update report
+        # update report
 
+        # an array portfolio values a row directly; a dict one needs a PriceDict
+        if isinstance(self._portfolio, ArrayPortfolio):
+            nav = self._portfolio.get_nav(row)
+        else:
+            prices: PriceDict = dict(zip(symbols, row.tolist()))
             nav = self._portfolio.get_nav(prices)
-            cash = self._portfolio.cash
+        cash = self._portfolio.cash
+
+        # Track portfolio snapshot with all positions and market values
+        portfolio_snapshot: Dict[str, Any] = {
+            "nav": nav,
+            "cash": cash,
+            "total_invested": nav - cash,
+        }
+
+        self._report.update(timestamp, nav, cash, portfolio_snapshot, executed_signals)
+
+    def _execute_orders(
+        self, i: int, symbols: List[str], row: np.ndarray, signals: SignalList
+    ) -> SignalList:
+        """
+        Fill one day's orders through the execution model.
 
-            # Track NAV and portfolio state
-            timestamp = (
-                row.name
-                if isinstance(row.name, datetime)
-                else pd.to_datetime(str(row.name))
+        An ArrayPortfolio takes the whole day in one vectorized pass (see
+        ArrayPortfolio.execute_fills); the dict Portfolio, or orders naming a
+        symbol twice, are filled one by one.
+
+        Args:
+            i: Row index
+            symbols: Ticker symbols, one per column
+            row: float64 vector of prices aligned with symbols
+            signals: Signals generated for this row
+
+        Returns:
+            The executed orders as signals carrying the filled quantity and
+            fill price
+        """
+        if isinstance(self._portfolio, ArrayPortfolio):
+            orders = self._order_arrays(i, row, signals)
+            if orders is not None:
+                return self._fill_orders(row, *orders)
+
+        orders = [signal for signal in signals if signal.action != MarketAction.HOLD]
+        if not orders:
+            return []
+
+        sides = np.array(
+            [1.0 if order.action == MarketAction.BUY else -1.0 for order in orders]
+        )
+        quantities = np.array([order.quantity for order in orders], dtype=np.float64)
+        prices = np.array([order.price for order in orders], dtype=np.float64)
+        positions = np.array(
+            [self._portfolio.get_position(order.symbol)["quantity"] for order in orders],
+            dtype=np.float64,
+        )
+        if isinstance(self._portfolio, ArrayPortfolio):
+            nav = self._portfolio.get_nav(row)
+        else:
+            nav = self._portfolio.get_nav(dict(zip(symbols, row.tolist())))
+
+        filled, fill_prices, fees = self._execution.fill(
+            sides, quantities, prices, positions, nav, self._portfolio.allow_short
+        )
+
+        executed_signals: SignalList = []
+        for order, side, quantity, price, fee in zip(
+            orders, sides.tolist(), filled.tolist(), fill_prices.tolist(), fees.tolist()
+        ):
+            if quantity <= 0:
+                continue
+            try:
+                self._portfolio.execute_fill(order.symbol, side * quantity, price, fee)
+            except Exception:
+                # Log error but continue with other orders
+                continue
+            executed_signals.append(
+                Signal(
+                    action=order.action,
+                    symbol=order.symbol,
+                    quantity=int(quantity),
+                    price=price,
+                )
             )
+        return executed_signals
+
+    def _order_arrays(
+        self, i: int, row: np.ndarray, signals: SignalList
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Describe one day's orders as ArrayPortfolio columns.
+
+        Matrix strategies are read straight from the signal matrix row;
+        per-tick strategies from their signals.
 
-            # Track portfolio snapshot with all positions and market values
-            portfolio_snapshot: Dict[str, Any] = {
-                "nav": nav,
-                "cash": cash,
-                "total_invested": nav - cash,
-            }
+        Args:
+            i: Row index
+            row: float64 vector of prices aligned with the portfolio columns
+            signals: Signals generated for this row
 
-            self._report.update(
-                timestamp, nav, cash, portfolio_snapshot, executed_signals
+        Returns:
+            (columns, sides, quantities, prices) of the orders, or None if
+            an order repeats a symbol (the fills then depend on each other)
+        """
+        if self._signal_codes is not None:
+            codes = self._signal_codes[i]
+            columns = np.flatnonzero(codes)
+            quantities = np.full(
+                len(columns), self._strategy.matrix_signal_quantity, dtype=np.float64
             )
+            return columns, codes[columns].astype(np.float64), quantities, row[columns]
+
+        assert isinstance(self._portfolio, ArrayPortfolio)
+        orders = [signal for signal in signals if signal.action != MarketAction.HOLD]
+        columns = self._portfolio.columns([order.symbol for order in orders])
+        if len(np.unique(columns)) != len(columns):
+            return None
+        sides = np.array(
+            [1.0 if order.action == MarketAction.BUY else -1.0 for order in orders]
+        )
+        quantities = np.array([order.quantity for order in orders], dtype=np.float64)
+        prices = np.array([order.price for order in orders], dtype=np.float64)
+        return columns, sides, quantities, prices
+
+    def _fill_orders(
+        self,
+        row: np.ndarray,
+        columns: np.ndarray,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+    ) -> SignalList:
+        """
+        Fill one day's orders on the ArrayPortfolio in one vectorized pass.
 
-        # Calculate final performance metrics
+        Args:
+            row: float64 vector of prices aligned with the portfolio columns
+            columns: Portfolio column of each order
+            sides: 1 for BUY, -1 for SELL, one per order
+            quantities: Requested quantities, one per order
+            prices: Signal prices, one per order
+
+        Returns:
+            The executed orders as signals carrying the filled quantity and
+            fill price
+        """
+        if not len(columns):
+            return []
+        portfolio = self._portfolio
+        assert isinstance(portfolio, ArrayPortfolio)
+
+        filled, fill_prices, fees = self._execution.fill(
+            sides,
+            quantities,
+            prices,
+            portfolio.quantities[columns],
+            portfolio.get_nav(row),
+            portfolio.allow_short,
+        )
+        orders = np.flatnonzero(filled > 0)
+        executed = portfolio.execute_fills(
+            columns[orders],
+            sides[orders] * filled[orders],
+            fill_prices[orders],
+            fees[orders],
+        )
+        orders = orders[executed]
+
+        portfolio_symbols = portfolio.symbols
+        return [
+            Signal(
+                action=MarketAction.BUY if side > 0 else MarketAction.SELL,
+                symbol=portfolio_symbols[column],
+                quantity=int(quantity),
+                price=price,
+            )
+            for column, side, quantity, price in zip(
+                columns[orders].tolist(),
+                sides[orders].tolist(),
+                filled[orders].tolist(),
+                fill_prices[orders].tolist(),
+            )
+        ]
+
+    def finish(self) -> None:
+        """Close the current run: calculate the final performance metrics."""
         self._report.calculate_performance_metrics()
 
+    def run_prepared(self, data: PreparedData, warmup: int = 0) -> None:
+        """
+        Run the backtest on data converted by `prepare`.
+
+        Args:
+            data: Prepared price data
+            warmup: Leading rows that only warm up the strategy's indicators:
+                they are neither traded nor recorded
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        # strategies with a vectorized path compute every signal up front;
+        # stateful ones are fed row by row
+        signal_matrix = self.signal_matrix(data)
+        self.start(data, signal_matrix)
+        if signal_matrix is None:
+            for i in range(warmup):
+                self.signals_at(i)
+
+        # looping over trading days
+        for i in range(warmup, len(data.timestamps)):
+            self.step(i)
+
+        # Calculate final performance metrics
+        self.finish()
+
+    def run(self, data: pd.DataFrame) -> None:
+        """
+        Run the backtest on the provided data.
+
+        Args:
+            data: Historical price data for backtesting
+
+        Raises:
+            ValueError: If data is invalid or empty
+        """
+        prepared = self.prepare(data)
+        self._report.set_price_data(data)
+        self.run_prepared(prepared)
+
     def get_report(self) -> Report:
         """
         Get the report object for accessing historical data.
@@ -0,0 +1,231 @@
+"""
+Multi-strategy engine.
+
+This module runs several strategies over the same price data: the data is
+validated and converted once, and engines whose strategies produce the same
+signal matrix share it (and the signals built from it) instead of computing
+it once each. Every strategy keeps its own Engine, Portfolio and Report.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd  # type: ignore
+
+from config.constants import DEFAULT_INITIAL_CASH
+
+from engine.engine import Engine, PreparedData
+from engine.report import Report
+from portfolio import ExecutionModel
+from strategies import Strategy
+
+# prepared price data of the current worker process (see _init_worker)
+_WORKER_DATA: Optional[PreparedData] = None
+
+
+def _init_worker(data: PreparedData) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _run_group(engines: List[Engine], data: PreparedData) -> None:
+    """
+    Run engines whose strategies share one signal matrix.
+
+    The first engine computes the matrix and each row's signals; every engine
+    executes them on its own portfolio. Without a matrix (per-tick strategy)
+    the engines run their strategies themselves.
+
+    Args:
+        engines: Engines with equal Strategy.signal_matrix_key (or just one)
+        data: Prepared price data
+    """
+    leader = engines[0]
+    signal_matrix = leader.signal_matrix(data)
+    if signal_matrix is None:
+        for engine in engines:
+            engine.run_prepared(data)
+        return
+
+    for engine in engines:
+        engine.start(data, signal_matrix)
+    for i in range(len(data.timestamps)):
+        signals = leader.signals_at(i)
+        for engine in engines:
+            engine.step(i, signals)
+    for engine in engines:
+        engine.finish()
+
+
+def _run_in_worker(engines: List[Engine]) -> List[Engine]:
+    assert _WORKER_DATA is not None, "worker was not initialized"
+    _run_group(engines, _WORKER_DATA)
+    return engines
+
+
+class MultiEngine:
+    """
+    Backtests several strategies over the same data.
+
+    Each strategy gets its own Engine, so portfolios and reports are
+    independent and identical to running the engines one by one. Engines are
+    grouped by Strategy.signal_matrix_key: a group computes one signal matrix
+    and one signal list per row, which every engine in it executes (e.g. one
+    strategy under several execution models or portfolio settings). With
+    `processes` set, the groups run in worker processes that receive the
+    prepared data once.
+    """
+
+    def __init__(
+        self,
+        strategies: Union[
+            Mapping[str, Union[Strategy, Engine]], Sequence[Union[Strategy, Engine]]
+        ],
+        cash: float = DEFAULT_INITIAL_CASH,
+        short: bool = False,
+        negative_cash: bool = False,
+        array_portfolio: bool = False,
+        processes: Optional[int] = None,
+        execution: Optional[ExecutionModel] = None,
+    ) -> None:
+        """
+        Initialize the MultiEngine.
+
+        Args:
+            strategies: Strategies keyed by name, or a sequence of strategies
+                (named after their class); an Engine may be given in place of
+                a strategy and keeps its own options
+            cash: Initial cash balance of every portfolio
+            short: Whether short selling is allowed
+            negative_cash: Whether cash may go negative
+            array_portfolio: Use array-backed portfolios (see Engine)
+            processes: Run the engine groups on a process pool of this size
+            execution: Execution model shared by every engine (see Engine)
+
+        Raises:
+            ValueError: If there are no strategies, names collide, or
+                processes is not positive
+        """
+        if not isinstance(strategies, Mapping):
+            named = {
+                type(
+                    strategy.strategy if isinstance(strategy, Engine) else strategy
+                ).__name__: strategy
+                for strategy in strategies
+            }
+            if len(named) != len(strategies):
+                raise ValueError(
+                    "Strategies share a class name; pass them as a dict keyed by name"
+                )
+            strategies = named
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        if processes is not None and processes <= 0:
+            raise ValueError(f"processes must be positive, got {processes}")
+
+        self._engines: Dict[str, Engine] = {
+            name: strategy
+            if isinstance(strategy, Engine)
+            else Engine(
+                strategy,
+                cash=cash,
+                short=short,
+                negative_cash=negative_cash,
+                array_portfolio=array_portfolio,
+                execution=execution,
+            )
+            for name, strategy in strategies.items()
+        }
+        self._processes = processes
+
+    @property
+    def engines(self) -> Dict[str, Engine]:
+        """
+        Engines keyed by strategy name.
+
+        After a process-pool run these are the engines returned by the
+        workers, so their strategies are copies of the ones passed in.
+        """
+        return dict(self._engines)
+
+    def get_report(self, name: str) -> Report:
+        """
+        Get the report of one strategy.
+
+        Args:
+            name: Strategy name
+
+        Returns:
+            Report of that strategy's engine
+        """
+        return self._engines[name].get_report()
+
+    def get_reports(self) -> Dict[str, Report]:
+        """
+        Get every report.
+
+        Returns:
+            Reports keyed by strategy name
+        """
+        return {name: engine.get_report() for name, engine in self._engines.items()}
+
+    def _groups(self) -> List[List[str]]:
+        """
+        Group the engines that can share a signal matrix.
+
+        Returns:
+            Engine names per group, in insertion order; engines whose
+            strategy has no signal_matrix_key form groups of one
+        """
+        groups: Dict[Hashable, List[str]] = {}
+        for name, engine in self._engines.items():
+            key = engine.strategy.signal_matrix_key()
+            groups.setdefault(name if key is None else key, []).append(name)
+        return list(groups.values())
+
+    def run(self, data: pd.DataFrame) -> None:
+        """
+        Run every strategy on the provided data.
+
+        Args:
+            data: Historical price data for backtesting
+
+        Raises:
+            ValueError: If data is invalid or empty
+        """
+        prepared = Engine.prepare(data)
+        groups = self._groups()
+
+        if self._processes is None:
+            for names in groups:
+                _run_group([self._engines[name] for name in names], prepared)
+        else:
+            self._run_processes(groups, prepared)
+
+        for engine in self._engines.values():
+            engine.get_report().set_price_data(data)
+
+    def _run_processes(self, groups: List[List[str]], data: PreparedData) -> None:
+        """
+        Run each engine group in a worker process.
+
+        The prepared data is sent once per worker; each task ships a group of
+        engines there and back.
+
+        Args:
+            groups: Engine names per group (see _groups)
+            data: Prepared price data
+        """
+        with ProcessPoolExecutor(
+            max_workers=min(self._processes, len(groups)),
+            initializer=_init_worker,
+            initargs=(data,),
+        ) as pool:
+            results = list(
+                pool.map(
+                    _run_in_worker,
+                    [[self._engines[name] for name in names] for names in groups],
+                )
+            )
+        for names, engines in zip(groups, results):
+            self._engines.update(zip(names, engines))
@@ -6,17 +6,22 @@ for tracking portfolio performance, signals, and market data throughout
 the backtesting process.
 """
 
-from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import matplotlib.pyplot as plt  # type: ignore
+import numpy as np
 import pandas as pd  # type: ignore
 
-from models import MarketDataPoint, Signal, SignalList
+from engine.buffers import ColumnBuffer
+from models import MarketAction, MarketDataPoint, Signal, SignalList
 
 RISK_FREE_RATE = 0.02
 
+# signal actions are stored as their position in MarketAction
+_ACTIONS = list(MarketAction)
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+
 
 class Report:
     """
@@ -25,6 +30,9 @@ class Report:
     This class manages historical data tracking including NAV history,
     portfolio snapshots, signal history, and performance metrics.
     It also provides visualization capabilities for performance analysis.
+
+    History is kept in columnar buffers; the DataFrames built from them are
+    memoized until the next update.
     """
 
     def __init__(self) -> None:
@@ -34,9 +42,22 @@ class Report:
         Sets up empty data structures for tracking portfolio performance
         and trading activity.
         """
-        self._nav_history: List[Dict[str, Any]] = []
-        self._portfolio_history: List[Dict[str, Any]] = []
-        self._signal_history: List[Dict[str, Any]] = []
+        # one row per update; signals and snapshots refer to it by row number
+        self._timestamps: List[datetime] = []
+        self._nav_history = ColumnBuffer([("nav", np.float64), ("cash", np.float64)])
+        self._portfolio_history: Optional[ColumnBuffer] = None
+        self._signal_history = ColumnBuffer(
+            [
+                ("row", np.int64),
+                ("action", np.int8),
+                ("symbol", np.int32),
+                ("quantity", np.int64),
+                ("price", np.float64),
+            ]
+        )
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
         self._performance_metrics: Dict[str, Any] = {}
         self._price_data: pd.DataFrame = pd.DataFrame()
 
@@ -67,7 +88,8 @@ class Report:
             nav: Net Asset Value at the timestamp
             cash: Cash balance at the timestamp
         """
-        self._nav_history.append({"timestamp": timestamp, "nav": nav, "cash": cash})
+        self._timestamps.append(timestamp)
+        self._nav_history.append(nav, cash)
 
     def _track_portfolio(
         self, timestamp: datetime, portfolio_snapshot: Dict[str, Any]
@@ -75,28 +97,50 @@ class Report:
         """
         Track portfolio state over time.
 
+        The columns are taken from the first snapshot; later snapshots must
+        have the same keys.
+
         Args:
             timestamp: When the portfolio state was recorded
             portfolio_snapshot: Dictionary containing portfolio state data
         """
-        self._portfolio_history.append({"timestamp": timestamp, **portfolio_snapshot})
+        if self._portfolio_history is None:
+            self._portfolio_history = ColumnBuffer(
+                [("row", np.int64)]
+                + [(str(key), np.float64) for key in portfolio_snapshot]
+            )
+        fields = self._portfolio_history.names[1:]
+        if len(portfolio_snapshot) != len(fields):
+            raise ValueError(
+                f"Portfolio snapshot keys {list(portfolio_snapshot)} do not match {list(fields)}"
+            )
+        try:
+            values = [portfolio_snapshot[field] for field in fields]
+        except KeyError as e:
+            raise ValueError(f"Portfolio snapshot is missing {e}")
+        self._portfolio_history.append(len(self._timestamps) - 1, *values)
+
+    def _symbol_code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return code
 
     def _track_signal(self, timestamp: datetime, signal: Signal) -> None:
         """
         Track individual trading signals.
 
         Args:
-            timestamp: When the signal was generated
+            timestamp: When the signal was generated (the last NAV row)
             signal: The trading signal to record
         """
         self._signal_history.append(
-            {
-                "timestamp": timestamp,
-                "action": signal.action.value,
-                "symbol": signal.symbol,
-                "quantity": signal.quantity,
-                "price": signal.price,
-            }
+            len(self._timestamps) - 1,
+            _ACTION_CODES[signal.action],
+            self._symbol_code(signal.symbol),
+            signal.quantity,
+            signal.price,
         )
 
     def update(
@@ -117,11 +161,54 @@ class Report:
             portfolio_snapshot: Current portfolio state
             signals: List of signals generated at this timestamp
         """
+        self._frames.clear()
         self._track_nav(timestamp, nav, cash)
         self._track_portfolio(timestamp, portfolio_snapshot)
         for signal in signals:
             self._track_signal(timestamp, signal)
 
+    def _index(self) -> pd.DatetimeIndex:
+        """Timestamps of all updates, parsed once per update batch."""
+        index = self._frames.get("index")
+        if index is None:
+            index = self._frames["index"] = pd.DatetimeIndex(
+                pd.to_datetime(self._timestamps), name="timestamp"
+            )
+        return index
+
+    def _nav_frame(self) -> pd.DataFrame:
+        """Memoized NAV frame (shared: callers must not modify it)."""
+        frame = self._frames.get("nav")
+        if frame is None:
+            if not len(self._nav_history):
+                frame = pd.DataFrame()
+            else:
+                frame = pd.DataFrame(self._nav_history.columns, index=self._index())
+            self._frames["nav"] = frame
+        return frame
+
+    def _signal_frame(self) -> pd.DataFrame:
+        """Memoized signal frame (shared: callers must not modify it)."""
+        frame = self._frames.get("signal")
+        if frame is None:
+            if not len(self._signal_history):
+                frame = pd.DataFrame()
+            else:
+                columns = self._signal_history.columns
+                actions = np.array([action.value for action in _ACTIONS], dtype=object)
+                symbols = np.array(self._symbols, dtype=object)
+                frame = pd.DataFrame(
+                    {
+                        "action": actions[columns["action"]],
+                        "symbol": symbols[columns["symbol"]],
+                        "quantity": columns["quantity"],
+                        "price": columns["price"],
+                    },
+                    index=self._index()[columns["row"]],
+                )
+            self._frames["signal"] = frame
+        return frame
+
     def calculate_performance_metrics(self) -> None:
         """
         Calculate comprehensive performance metrics.
@@ -129,25 +216,26 @@ class Report:
         Computes various performance metrics including total return,
         Sharpe ratio, maximum drawdown, and volatility.
         """
-        if not self._nav_history:
+        if not len(self._nav_history):
             return
 
-        nav_df = self.get_nav_dataframe()
+        nav_df = self._nav_frame()
         if nav_df.empty:
             return
 
         # Calculate returns
-        nav_df["daily_return"] = nav_df["nav"].pct_change()
-        nav_df["cumulative_return"] = (nav_df["nav"] / nav_df["nav"].iloc[0] - 1) * 100
+        nav = nav_df["nav"]
+        daily_return = nav.pct_change()
+        cumulative_return = (nav / nav.iloc[0] - 1) * 100
 
         # Basic metrics
-        total_return = nav_df["cumulative_return"].iloc[-1]
+        total_return = cumulative_return.iloc[-1]
         annualized_return = ((100 + total_return) / 100) ** (
             252 / len(nav_df)
         )  # Assuming daily data
         # 100+ total_return
         # Volatility (annualized)
-        daily_volatility = nav_df["daily_return"].std()
+        daily_volatility = daily_return.std()
         annualized_volatility = daily_volatility * (252**0.5)
 
         # sharpe_ratio = (
@@ -157,12 +245,12 @@ class Report:
         # )
 
         # Maximum drawdown
-        returns = nav_df["nav"].pct_change().fillna(0)
+        returns = daily_return.fillna(0)
         cumulative = (1 + returns).cumprod()
         max_dd = (cumulative.cummax() - cumulative).max() * 100
 
         # Win rate (if we have signal data)
-        signal_df = self.get_signal_dataframe()
+        signal_df = self._signal_frame()
 
         # Store metrics
         self._performance_metrics = {
@@ -173,11 +261,11 @@ class Report:
             * (annualized_return - 1 - RISK_FREE_RATE)
             / (100 * annualized_volatility) if annualized_volatility > 0 else 0,
             "max_drawdown_pct": max_dd,
-            "total_trades": len(
-                [x for x in signal_df["action"] if x in ["BUY", "SELL"]]
+            "total_trades": int(
+                signal_df["action"].isin(["BUY", "SELL"]).sum()
             ) if not signal_df.empty else 0,
             "data_points": len(nav_df),
-            "total assets": nav_df["nav"].iloc[-1],  # Exclude nav column
+            "total assets": nav.iloc[-1],  # Exclude nav column
         }
 
     def get_signal_dataframe(self) -> pd.DataFrame:
@@ -187,13 +275,7 @@ class Report:
         Returns:
             DataFrame with timestamp index containing signal data
         """
-        if not self._signal_history:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(self._signal_history)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        return df
+        return self._signal_frame().copy()
 
     def get_nav_dataframe(self) -> pd.DataFrame:
         """
@@ -202,21 +284,28 @@ class Report:
         Returns:
             DataFrame with timestamp index containing NAV and cash data
         """
-        if not self._nav_history:
-            return pd.DataFrame()
+        return self._nav_frame().copy()
 
-        df = pd.DataFrame(self._nav_history)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        return df
+    def get_portfolio_dataframe(self) -> pd.DataFrame:
+        """
+        Get portfolio snapshot history as DataFrame.
+
+        Returns:
+            DataFrame with timestamp index, one column per snapshot key
+        """
+        if self._portfolio_history is None or not len(self._portfolio_history):
+            return pd.DataFrame()
+        columns = dict(self._portfolio_history.columns)
+        rows = columns.pop("row")
+        return pd.DataFrame(columns, index=self._index()[rows])
 
     def performance_dataframe(self) -> pd.DataFrame:
         df = pd.DataFrame()
 
-        if not self._nav_history:
+        if not len(self._nav_history):
             print("No NAV history to plot.")
 
-        nav_df = self.get_nav_dataframe()
+        nav_df = self._nav_frame()
         if nav_df.empty:
             print("No NAV history to plot.")
             return df
@@ -256,7 +345,7 @@ class Report:
             print(f"No price data available for symbol: {symbol}")
             return
 
-        signal_df = self.get_signal_dataframe()
+        signal_df = self._signal_frame()
         if signal_df.empty:
             print("No signal data available for plotting.")
             return
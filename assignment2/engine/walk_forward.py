@@ -0,0 +1,297 @@
+"""
+Walk-forward evaluation.
+
+This module splits a price panel into rolling train/test windows, picks the
+best strategy parameters on each train window and backtests them on the
+following test window. The out-of-sample test runs are chained into one
+equity curve.
+"""
+
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from config.constants import (
+    DEFAULT_INITIAL_CASH,
+    DEFAULT_WALK_FORWARD_TEST_DAYS,
+    DEFAULT_WALK_FORWARD_TRAIN_DAYS,
+    NPY_EXTENSION,
+)
+
+from engine.engine import Engine, PreparedData
+from engine.report import Report
+from portfolio import ExecutionModel
+from strategies import Strategy
+
+Params = Dict[str, Any]
+# (train start, test start, test end) row positions; train is [start, split)
+Window = Tuple[int, int, int]
+# (best params, train score, test report)
+WindowResult = Tuple[Params, float, Report]
+
+# prepared price data of the current worker process (see _init_worker)
+_WORKER_DATA: Optional[PreparedData] = None
+
+
+def _init_worker(symbols: List[str], matrix_path: str, timestamps: List[datetime]) -> None:
+    global _WORKER_DATA
+    # every worker maps the same file, so the panel is shared, not copied
+    _WORKER_DATA = PreparedData(
+        symbols, np.load(matrix_path, mmap_mode="r"), timestamps
+    )
+
+
+def _run_in_worker(evaluation: "WalkForward", window: Window) -> WindowResult:
+    assert _WORKER_DATA is not None, "worker was not initialized"
+    return evaluation._evaluate(_WORKER_DATA, window)
+
+
+class WalkForward:
+    """
+    Walk-forward optimization and out-of-sample evaluation of a strategy.
+
+    For each window every parameter set is backtested on the train rows and
+    scored by one of the report's performance metrics (higher is better).
+    The best set is then run on the test rows with a fresh portfolio. Test
+    windows follow each other without overlap, so their NAVs chain into a
+    single out-of-sample equity curve. Test runs first feed the train rows
+    to the strategy without trading, so indicators are warm on the first
+    test row; train runs start cold.
+
+    With `processes` set, windows are evaluated in worker processes that
+    memory-map one copy of the price matrix.
+    """
+
+    def __init__(
+        self,
+        make_strategy: Callable[..., Strategy],
+        parameters: Union[Mapping[str, Sequence[Any]], Sequence[Params]],
+        train_size: int = DEFAULT_WALK_FORWARD_TRAIN_DAYS,
+        test_size: int = DEFAULT_WALK_FORWARD_TEST_DAYS,
+        step: Optional[int] = None,
+        objective: str = "sharpe_ratio",
+        cash: float = DEFAULT_INITIAL_CASH,
+        short: bool = False,
+        negative_cash: bool = False,
+        array_portfolio: bool = False,
+        execution: Optional[ExecutionModel] = None,
+        processes: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the WalkForward evaluation.
+
+        Args:
+            make_strategy: Strategy class or factory called with one
+                parameter set as keyword arguments (must be picklable when
+                processes is set)
+            parameters: Grid of values per parameter name, or an explicit
+                sequence of parameter sets
+            train_size: Rows in each train window
+            test_size: Rows in each test window (the last one may be shorter)
+            step: Rows between consecutive windows; defaults to test_size
+            objective: Performance metric maximized on the train window
+            cash: Initial cash balance of every portfolio
+            short: Whether short selling is allowed
+            negative_cash: Whether cash may go negative
+            array_portfolio: Use array-backed portfolios (see Engine)
+            execution: Execution model of every engine (see Engine)
+            processes: Evaluate windows on a process pool of this size
+
+        Raises:
+            ValueError: If there are no parameter sets, a size is not
+                positive, step would overlap test windows, or processes is
+                not positive
+        """
+        if isinstance(parameters, Mapping):
+            names = list(parameters)
+            parameter_sets = [
+                dict(zip(names, values))
+                for values in itertools.product(*(parameters[name] for name in names))
+            ]
+        else:
+            parameter_sets = [dict(params) for params in parameters]
+        if not parameter_sets:
+            raise ValueError("At least one parameter set is required")
+        if train_size <= 0 or test_size <= 0:
+            raise ValueError(
+                f"Window sizes must be positive, got train={train_size}, test={test_size}"
+            )
+        step = test_size if step is None else step
+        if step < test_size:
+            raise ValueError(f"step must be at least test_size ({test_size}), got {step}")
+        if processes is not None and processes <= 0:
+            raise ValueError(f"processes must be positive, got {processes}")
+
+        self._make_strategy = make_strategy
+        self._parameter_sets = parameter_sets
+        self._train_size = train_size
+        self._test_size = test_size
+        self._step = step
+        self._objective = objective
+        self._engine_options: Dict[str, Any] = {
+            "cash": cash,
+            "short": short,
+            "negative_cash": negative_cash,
+            "array_portfolio": array_portfolio,
+            "execution": execution,
+        }
+        self._processes = processes
+        # (train start date, test start date, result) per window
+        self._results: List[Tuple[datetime, datetime, WindowResult]] = []
+
+    def _windows(self, rows: int) -> List[Window]:
+        """
+        Split `rows` rows into walk-forward windows.
+
+        Args:
+            rows: Number of rows in the price panel
+
+        Returns:
+            (train start, test start, test end) per window, in order
+        """
+        windows = []
+        start = 0
+        while start + self._train_size < rows:
+            split = start + self._train_size
+            windows.append((start, split, min(split + self._test_size, rows)))
+            start += self._step
+        return windows
+
+    def _backtest(self, params: Params, data: PreparedData, warmup: int = 0) -> Engine:
+        engine = Engine(self._make_strategy(**params), **self._engine_options)
+        engine.run_prepared(data, warmup)
+        return engine
+
+    def _evaluate(self, data: PreparedData, window: Window) -> WindowResult:
+        """
+        Optimize on the train rows of a window and run the test rows.
+
+        Args:
+            data: Prepared price data of the whole panel
+            window: (train start, test start, test end) row positions
+
+        Returns:
+            (best params, train score, test report)
+        """
+        start, split, end = window
+        train = data.rows(start, split)
+        best: Optional[Params] = None
+        best_score = -np.inf
+        for params in self._parameter_sets:
+            engine = self._backtest(params, train)
+            score = float(
+                engine.get_report().get_performance_metrics().get(self._objective, np.nan)
+            )
+            # NaN scores (e.g. no trades) never win
+            if best is None or score > best_score:
+                best, best_score = params, score
+        assert best is not None
+        # warm the indicators up on the train rows, trade only the test rows
+        engine = self._backtest(best, data.rows(start, end), warmup=split - start)
+        return best, best_score, engine.get_report()
+
+    def run(self, data: pd.DataFrame) -> None:
+        """
+        Run the walk-forward evaluation on the provided data.
+
+        Args:
+            data: Historical price data
+
+        Raises:
+            ValueError: If data is invalid, empty or shorter than one train
+                window plus a test row
+        """
+        prepared = Engine.prepare(data)
+        timestamps = prepared.timestamps
+        windows = self._windows(len(timestamps))
+        if not windows:
+            raise ValueError(
+                f"Need more than {self._train_size} rows for a walk-forward window, "
+                f"got {len(timestamps)}"
+            )
+
+        if self._processes is None:
+            results = [self._evaluate(prepared, window) for window in windows]
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                matrix_path = os.path.join(directory, "prices" + NPY_EXTENSION)
+                np.save(matrix_path, prepared.prices)
+                with ProcessPoolExecutor(
+                    max_workers=min(self._processes, len(windows)),
+                    initializer=_init_worker,
+                    initargs=(prepared.symbols, matrix_path, timestamps),
+                ) as pool:
+                    results = list(
+                        pool.map(_run_in_worker, [self] * len(windows), windows)
+                    )
+
+        self._results = [
+            (timestamps[start], timestamps[split], result)
+            for (start, split, _), result in zip(windows, results)
+        ]
+        for (_, split, end), (_, _, report) in zip(windows, results):
+            report.set_price_data(data.iloc[split:end])
+
+    def get_reports(self) -> List[Report]:
+        """
+        Get the test report of every window.
+
+        Returns:
+            Out-of-sample reports, in window order
+        """
+        return [report for _, _, (_, _, report) in self._results]
+
+    def get_results(self) -> pd.DataFrame:
+        """
+        Summarize every window.
+
+        Returns:
+            DataFrame with one row per window: the train and test start
+            dates, the last test date, the chosen parameters, their train
+            score and the test performance metrics
+        """
+        rows = []
+        for train_start, test_start, (params, score, report) in self._results:
+            nav = report.get_nav_dataframe()
+            rows.append(
+                {
+                    "train_start": train_start,
+                    "test_start": test_start,
+                    "test_end": nav.index[-1] if not nav.empty else test_start,
+                    "params": params,
+                    f"train_{self._objective}": score,
+                    **report.get_performance_metrics(),
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def get_equity_curve(self) -> pd.Series:
+        """
+        Chain the test windows into one out-of-sample equity curve.
+
+        Every test run starts from the same cash; each window's NAV is
+        rescaled so that this cash equals the previous window's final NAV,
+        as if the capital had been carried over.
+
+        Returns:
+            NAV series indexed by timestamp, in units of the initial cash
+        """
+        cash = float(self._engine_options["cash"])
+        level = cash
+        pieces = []
+        for report in self.get_reports():
+            nav = report.get_nav_dataframe()["nav"]
+            if nav.empty:
+                continue
+            scaled = nav * (level / cash)
+            pieces.append(scaled)
+            level = float(scaled.iloc[-1])
+        if not pieces:
+            return pd.Series(dtype=np.float64, name="nav")
+        return pd.concat(pieces).rename("nav")
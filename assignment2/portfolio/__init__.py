@@ -1,3 +1,12 @@
 from portfolio.portfolio import Portfolio
+from portfolio.array_portfolio import ArrayPortfolio
+from portfolio.history import PositionLog
+from portfolio.execution import CostModel, ExecutionModel
 
-__all__ = ["Portfolio"]
+__all__ = [
+    "Portfolio",
+    "ArrayPortfolio",
+    "PositionLog",
+    "ExecutionModel",
+    "CostModel",
+]
@@ -0,0 +1,309 @@
+"""
+Array-backed portfolio.
+
+This module provides a Portfolio whose positions live in numpy vectors
+aligned with a fixed ticker order, so the NAV of a whole price row is a
+single dot product.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config.constants import DEFAULT_INITIAL_CASH
+from models import PositionDict, PriceDict
+from portfolio.portfolio import Portfolio
+
+
+class ArrayPortfolio(Portfolio):
+    """
+    Portfolio with quantity and average price vectors instead of nested dicts.
+
+    Symbols are mapped to columns in the order given to `set_symbols` (the
+    engine passes its ticker order), so `get_nav` accepts a price vector in
+    that order and computes cash + quantities . prices. Symbols traded
+    outside that order are appended as new columns. The public API and the
+    execution constraints (short selling, negative cash) are the same as for
+    Portfolio.
+    """
+
+    def __init__(
+        self,
+        symbols: Optional[List[str]] = None,
+        cash: float = DEFAULT_INITIAL_CASH,
+        short: bool = False,
+        negative_cash: bool = False,
+    ) -> None:
+        """
+        Initialize the ArrayPortfolio class.
+
+        Args:
+            symbols: Initial column order. Defaults to no columns.
+            cash: The initial cash balance. Defaults to DEFAULT_INITIAL_CASH.
+            short: Whether short selling is allowed. Defaults to False.
+            negative_cash: Whether cash may go negative. Defaults to False.
+        """
+        super().__init__(cash=cash, short=short, negative_cash=negative_cash)
+        self._cash = cash
+        self._symbols: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._quantities = np.zeros(0)
+        self._avg_prices = np.zeros(0)
+        # columns that have been traded (listed in `assets` even when flat)
+        self._touched = np.zeros(0, dtype=bool)
+        # indices of the touched columns, rebuilt when a column is first traded
+        self._held: Optional[np.ndarray] = None
+        if symbols is not None:
+            self.set_symbols(symbols)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Column order of the position vectors."""
+        return list(self._symbols)
+
+    def set_symbols(self, symbols: List[str]) -> None:
+        """
+        Align the position vectors with `symbols`.
+
+        Existing positions are kept. Symbols already held but missing from
+        `symbols` are not allowed, since their value would drop out of the NAV.
+
+        Args:
+            symbols: The new column order
+
+        Raises:
+            ValueError: If a symbol is repeated or a held symbol is missing
+        """
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("Symbols must be unique")
+        columns = {symbol: i for i, symbol in enumerate(symbols)}
+        for symbol in self._symbols:
+            if symbol not in columns and self._touched[self._columns[symbol]]:
+                raise ValueError(f"Position in {symbol} is not in the new symbols")
+
+        quantities = np.zeros(len(symbols))
+        avg_prices = np.zeros(len(symbols))
+        touched = np.zeros(len(symbols), dtype=bool)
+        for symbol, old in self._columns.items():
+            new = columns.get(symbol)
+            if new is not None:
+                quantities[new] = self._quantities[old]
+                avg_prices[new] = self._avg_prices[old]
+                touched[new] = self._touched[old]
+
+        self._symbols = list(symbols)
+        self._columns = columns
+        self._quantities = quantities
+        self._avg_prices = avg_prices
+        self._touched = touched
+        self._held = None
+
+    def _column(self, symbol: str) -> int:
+        column = self._columns.get(symbol)
+        if column is None:
+            column = self._columns[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+            self._quantities = np.append(self._quantities, 0.0)
+            self._avg_prices = np.append(self._avg_prices, 0.0)
+            self._touched = np.append(self._touched, False)
+        return column
+
+    def columns(self, symbols: List[str]) -> np.ndarray:
+        """
+        Map symbols to their columns, appending columns for new symbols.
+
+        Args:
+            symbols: The asset symbols
+
+        Returns:
+            Column index of each symbol
+        """
+        return np.array(
+            [self._column(symbol) for symbol in symbols], dtype=np.intp
+        )
+
+    def _held_columns(self) -> np.ndarray:
+        if self._held is None:
+            self._held = np.flatnonzero(self._touched)
+        return self._held
+
+    @property
+    def quantities(self) -> np.ndarray:
+        """Read-only view of the quantity vector (in `symbols` order)."""
+        view = self._quantities.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def assets(self) -> PositionDict:
+        """
+        Get the current asset positions.
+
+        Returns:
+            A dictionary mapping asset symbols to their position details.
+        """
+        assets: PositionDict = {"CASH": {"quantity": self._cash, "avg_price": 1.0}}
+        for column in self._held_columns().tolist():
+            assets[self._symbols[column]] = {
+                "quantity": float(self._quantities[column]),
+                "avg_price": float(self._avg_prices[column]),
+            }
+        return assets
+
+    def get_nav(self, prices: Union[PriceDict, np.ndarray]) -> float:
+        """
+        Calculate the Net Asset Value (NAV) of the portfolio.
+
+        Args:
+            prices: A price vector in `symbols` order, or a dictionary mapping
+                asset symbols to their current prices.
+
+        Returns:
+            The total NAV of the portfolio.
+        """
+        if isinstance(prices, np.ndarray):
+            if prices.shape != self._quantities.shape:
+                raise ValueError(
+                    f"Expected {len(self._symbols)} prices, got {prices.shape}"
+                )
+            # only traded columns count, like the dict Portfolio: a missing
+            # (NaN) price of a never-held symbol must not poison the NAV
+            columns = self._held_columns()
+            if len(columns) == len(prices):
+                return self._cash + float(self._quantities @ prices)
+            return self._cash + float(self._quantities[columns] @ prices[columns])
+
+        columns = self._held_columns()
+        try:
+            row = [prices[self._symbols[column]] for column in columns.tolist()]
+        except KeyError as e:
+            raise ValueError(f"Price for symbol {e} not provided in prices dict")
+        return self._cash + float(self._quantities[columns] @ np.array(row, dtype=float))
+
+    @property
+    def cash(self) -> float:
+        """
+        Get the current cash balance.
+
+        Returns:
+            The current cash balance.
+        """
+        return float(self._cash)
+
+    def get_position(self, symbol: str) -> dict[str, float]:
+        """
+        Get the current position for a specific asset.
+
+        Args:
+            symbol: The asset symbol
+        Returns:
+            A dictionary with 'quantity' and 'avg_price' keys.
+        """
+        quantity, avg_price = self._position(symbol)
+        return {"quantity": quantity, "avg_price": avg_price}
+
+    def execute_fills(
+        self,
+        columns: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        fees: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Execute one day's fills at once, with array operations.
+
+        The result is the same as calling execute_fill for each fill in
+        order and skipping those that fail: a fill that would short (when not
+        allowed) or overdraw cash (when not allowed) is rejected, and later
+        fills see the cash left by the ones accepted before them.
+
+        Args:
+            columns: Column of each fill (see columns); must be unique
+            quantities: Quantities bought (positive) or sold (negative)
+            prices: Fill prices per unit
+            fees: Transaction costs paid from cash
+
+        Returns:
+            Boolean mask of the executed fills
+        """
+        current = self._quantities[columns]
+        new_quantities = current + quantities
+        accepted = (quantities != 0) & (prices >= 0) & (fees >= 0)
+        if not self._allow_short:
+            accepted &= new_quantities >= 0
+
+        costs = quantities * prices
+        changes = -costs - fees
+        cash = self._cash
+        pending = np.flatnonzero(accepted)
+        if not self._negative_cash:
+            # fills are checked in order: each rejection changes the cash seen
+            # by the fills after it, so scan again from the one that failed
+            accepted[:] = False
+            while pending.size:
+                running = np.cumsum(np.concatenate(([cash], changes[pending])))
+                failed = np.flatnonzero(
+                    running[:-1] - costs[pending] - fees[pending] < 0
+                )
+                end = failed[0] if failed.size else pending.size
+                accepted[pending[:end]] = True
+                cash = running[end]
+                pending = pending[end + 1 :]
+        elif pending.size:
+            cash = np.cumsum(np.concatenate(([cash], changes[pending])))[-1]
+        self._cash = float(cash)
+
+        columns = columns[accepted]
+        quantities = quantities[accepted]
+        prices = prices[accepted]
+        current = current[accepted]
+        new_quantities = new_quantities[accepted]
+        avg_prices = self._avg_prices[columns]
+        # same rules as Portfolio._update_position: adding to a position
+        # averages the prices, closing or flipping it restarts at the fill
+        # price, reducing it keeps the average
+        adding = np.where(quantities > 0, current >= 0, current <= 0)
+        closing = np.where(
+            quantities > 0, quantities >= -current, -quantities >= current
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averaged = (
+                np.abs(current) * avg_prices + np.abs(quantities) * prices
+            ) / np.abs(new_quantities)
+        new_avg_prices = np.where(
+            adding, averaged, np.where(closing, prices, avg_prices)
+        )
+
+        self._quantities[columns] = new_quantities
+        self._avg_prices[columns] = new_avg_prices
+        if not self._touched[columns].all():
+            self._touched[columns] = True
+            self._held = None
+        if columns.size:
+            self._history.record_many(
+                [self._symbols[column] for column in columns.tolist()],
+                new_quantities.tolist(),
+                new_avg_prices.tolist(),
+            )
+            self._history.record("CASH", self._cash, 1.0)
+        return accepted
+
+    def _position(self, symbol: str) -> Tuple[float, float]:
+        column = self._columns.get(symbol)
+        if column is None:
+            return 0.0, 0.0
+        return self._quantities.item(column), self._avg_prices.item(column)
+
+    def _cash_balance(self) -> float:
+        return self._cash
+
+    def _store_position(
+        self, symbol: str, quantity: float, avg_price: float, cash_change: float
+    ) -> None:
+        column = self._column(symbol)
+        self._cash += cash_change
+        self._quantities[column] = quantity
+        self._avg_prices[column] = avg_price
+        if not self._touched[column]:
+            self._touched[column] = True
+            self._held = None
@@ -0,0 +1,118 @@
+"""
+Execution models.
+
+This module turns a day's BUY/SELL signals into fills: how many units are
+traded, at what price and for what fee. Every model works on arrays holding
+all of the day's orders at once.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# (quantities, fill prices, fees), one entry per order
+Fills = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class ExecutionModel:
+    """
+    Frictionless execution: every order is filled in full at its signal
+    price with no fees.
+
+    Subclasses override `fill` to add costs or sizing.
+    """
+
+    def fill(
+        self,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        positions: np.ndarray,
+        nav: float,
+        allow_short: bool,
+    ) -> Fills:
+        """
+        Size and price one day's orders.
+
+        Args:
+            sides: 1 for BUY, -1 for SELL, one per order
+            quantities: Requested quantities (positive), one per order
+            prices: Signal prices, one per order
+            positions: Current quantity held of each order's symbol
+            nav: Portfolio NAV at today's prices, before trading
+            allow_short: Whether the portfolio allows short positions
+
+        Returns:
+            (quantities, fill prices, fees): whole, non-negative quantities
+            (0 skips the order), the price per unit and the total fee of
+            each order
+        """
+        return quantities, prices, np.zeros(len(quantities))
+
+
+@dataclass(frozen=True)
+class CostModel(ExecutionModel):
+    """
+    Execution with commissions, slippage, an order size cap and optional
+    target-weight sizing.
+
+    Attributes:
+        commission: Fixed fee per filled order
+        commission_bps: Fee in basis points of the filled notional
+        slippage_bps: Price penalty in basis points (half spread plus
+            impact): buys fill above and sells below the signal price
+        max_order_quantity: Cap on the units of a single order
+        target_weight: If set, a BUY moves the position towards
+            target_weight * NAV of the symbol and a SELL towards minus that
+            (or flat when shorting is not allowed); signal quantities are
+            ignored
+    """
+
+    commission: float = 0.0
+    commission_bps: float = 0.0
+    slippage_bps: float = 0.0
+    max_order_quantity: Optional[float] = None
+    target_weight: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for name in ("commission", "commission_bps", "slippage_bps"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} cannot be negative")
+        if self.max_order_quantity is not None and self.max_order_quantity <= 0:
+            raise ValueError("max_order_quantity must be positive")
+        if self.target_weight is not None and self.target_weight <= 0:
+            raise ValueError("target_weight must be positive")
+
+    def fill(
+        self,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        positions: np.ndarray,
+        nav: float,
+        allow_short: bool,
+    ) -> Fills:
+        """
+        Size and price one day's orders (see ExecutionModel.fill).
+        """
+        quantities = quantities.astype(np.float64)
+
+        if self.target_weight is not None:
+            target = sides * self.target_weight * nav / prices
+            if not allow_short:
+                target = np.maximum(target, 0.0)
+            # trade whole units towards the target, only in the signal's direction
+            order = np.trunc(target) - positions
+            quantities = np.where(order * sides > 0, np.abs(order), 0.0)
+
+        if self.max_order_quantity is not None:
+            quantities = np.minimum(quantities, np.floor(self.max_order_quantity))
+
+        fill_prices = prices * (1 + sides * self.slippage_bps / 10_000)
+        fees = np.where(
+            quantities > 0,
+            self.commission + quantities * fill_prices * self.commission_bps / 10_000,
+            0.0,
+        )
+        return quantities, fill_prices, fees
@@ -0,0 +1,153 @@
+"""
+Sparse position history.
+
+This module provides a delta log of portfolio positions: each recorded
+timestamp stores only the positions that changed since the previous one,
+instead of a copy of every position.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models import PositionDict, PositionHistory
+
+# symbol -> (quantity, avg_price)
+PositionDelta = Dict[str, Tuple[float, float]]
+
+
+class PositionLog:
+    """
+    Append-only log of position changes keyed by timestamp.
+
+    Changes are collected with `record` and stored with `commit`. Every
+    committed timestamp is kept, but a delta is only stored for timestamps
+    with changes, so the log grows with the number of trading days rather
+    than with days x positions. The holdings on any date are rebuilt by
+    replaying the deltas up to that date.
+    """
+
+    def __init__(self, initial: Optional[PositionDict] = None) -> None:
+        """
+        Initialize the PositionLog.
+
+        Args:
+            initial: Positions held before the first timestamp
+        """
+        self._initial: PositionDelta = {
+            symbol: (position["quantity"], position["avg_price"])
+            for symbol, position in (initial or {}).items()
+        }
+        self._timestamps: List[datetime] = []
+        # timestamps with changes (sorted) and their deltas
+        self._change_timestamps: List[datetime] = []
+        self._deltas: List[PositionDelta] = []
+        self._pending: PositionDelta = {}
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self) -> List[datetime]:
+        """Recorded timestamps, in ascending order."""
+        return list(self._timestamps)
+
+    def record(self, symbol: str, quantity: float, avg_price: float) -> None:
+        """
+        Stage the new position of a symbol for the next commit.
+
+        Args:
+            symbol: The asset symbol
+            quantity: The new quantity
+            avg_price: The new average price
+        """
+        self._pending[symbol] = (quantity, avg_price)
+
+    def record_many(
+        self, symbols: List[str], quantities: List[float], avg_prices: List[float]
+    ) -> None:
+        """
+        Stage the new positions of several symbols for the next commit.
+
+        Args:
+            symbols: The asset symbols
+            quantities: The new quantities, aligned with symbols
+            avg_prices: The new average prices, aligned with symbols
+        """
+        self._pending.update(zip(symbols, zip(quantities, avg_prices)))
+
+    def commit(self, timestamp: datetime) -> None:
+        """
+        Store the staged changes under `timestamp`.
+
+        Committing the last timestamp again merges the new changes into it.
+
+        Args:
+            timestamp: The timestamp of the snapshot
+
+        Raises:
+            ValueError: If timestamp is earlier than the last one recorded
+        """
+        pending = self._pending
+        self._pending = {}
+
+        if self._timestamps and timestamp <= self._timestamps[-1]:
+            if timestamp < self._timestamps[-1]:
+                raise ValueError(
+                    f"History timestamp {timestamp} is before {self._timestamps[-1]}"
+                )
+        else:
+            self._timestamps.append(timestamp)
+
+        if not pending:
+            return
+        if self._change_timestamps and self._change_timestamps[-1] == timestamp:
+            self._deltas[-1].update(pending)
+        else:
+            self._change_timestamps.append(timestamp)
+            self._deltas.append(pending)
+
+    def positions_at(self, timestamp: datetime) -> PositionDict:
+        """
+        Reconstruct the positions held at `timestamp`.
+
+        Uses the latest snapshot at or before `timestamp`; the cost is
+        proportional to the number of timestamps with changes up to it.
+
+        Args:
+            timestamp: The date to look up
+
+        Returns:
+            The positions as of that snapshot (the initial positions if
+            `timestamp` precedes every snapshot).
+        """
+        end = bisect_right(self._change_timestamps, timestamp)
+        state = dict(self._initial)
+        for delta in self._deltas[:end]:
+            state.update(delta)
+        return self._to_positions(state)
+
+    def to_dict(self) -> PositionHistory:
+        """
+        Materialize the full history as timestamp -> positions.
+
+        Returns:
+            A PositionHistory with an independent PositionDict per timestamp.
+        """
+        history: PositionHistory = {}
+        state = dict(self._initial)
+        changes = zip(self._change_timestamps, self._deltas)
+        change_timestamp, delta = next(changes, (None, None))
+        for timestamp in self._timestamps:
+            if timestamp == change_timestamp:
+                state.update(delta)
+                change_timestamp, delta = next(changes, (None, None))
+            history[timestamp] = self._to_positions(state)
+        return history
+
+    @staticmethod
+    def _to_positions(state: PositionDelta) -> PositionDict:
+        return {
+            symbol: {"quantity": quantity, "avg_price": avg_price}
+            for symbol, (quantity, avg_price) in state.items()
+        }
@@ -6,6 +6,7 @@ including position tracking, NAV calculations, and signal execution.
 """
 
 from collections import defaultdict
+from typing import Tuple
 
 from config.constants import DEFAULT_INITIAL_CASH
 from models import (
@@ -17,9 +18,15 @@ from models import (
     SignalList,
     PortfolioUpdateError,
 )
+from portfolio.history import PositionLog
 from datetime import datetime
 
 
+def _empty_position() -> dict[str, float]:
+    # module level (not a lambda) so portfolios can be pickled
+    return {"quantity": 0, "avg_price": 0.0}
+
+
 class Portfolio:
     """
     Manages a collection of financial assets with position tracking and NAV calculations.
@@ -43,14 +50,12 @@ class Portfolio:
             allow_short: Whether short selling is allowed. Defaults to False.
         """
         self._initial_cash = cash
-        self._assets: PositionDict = defaultdict(
-            lambda: {"quantity": 0, "avg_price": 0.0}
-        )
+        self._assets: PositionDict = defaultdict(_empty_position)
         self._allow_short = short
         self._negative_cash = negative_cash
-        self._history: PositionHistory = dict()
 
         self._assets.update({"CASH": {"quantity": cash, "avg_price": 1.0}})
+        self._history = PositionLog(self._assets)
 
     @property
     def assets(self) -> PositionDict:
@@ -70,7 +75,19 @@ class Portfolio:
         Returns:
             A dictionary mapping timestamps to position snapshots.
         """
-        return dict(self._history)  # Return a regular dict for immutability
+        return self._history.to_dict()
+
+    def get_positions_at(self, timestamp: datetime) -> PositionDict:
+        """
+        Get the positions recorded at or before a timestamp.
+
+        Args:
+            timestamp: The date to look up.
+
+        Returns:
+            The positions of the latest snapshot at or before `timestamp`.
+        """
+        return self._history.positions_at(timestamp)
 
     def get_nav(self, prices: PriceDict) -> float:
         """
@@ -97,6 +114,11 @@ class Portfolio:
 
         return nav
 
+    @property
+    def allow_short(self) -> bool:
+        """Whether short positions are allowed."""
+        return self._allow_short
+
     @property
     def cash(self) -> float:
         """
@@ -107,7 +129,9 @@ class Portfolio:
         """
         return float(self._assets["CASH"]["quantity"])
 
-    def _validate_update(self, symbol: str, quantity: float, price: float) -> None:
+    def _validate_update(
+        self, symbol: str, quantity: float, price: float, fee: float = 0.0
+    ) -> None:
         """
         Validate a position update.
 
@@ -117,6 +141,7 @@ class Portfolio:
             symbol: The asset symbol.
             quantity: The quantity to buy (positive) or sell (negative).
             price: The price per unit of the asset.
+            fee: Transaction cost paid from cash.
 
         Raises:
             ValueError: If the update is invalid.
@@ -126,11 +151,8 @@ class Portfolio:
         if price < 0:
             raise PortfolioUpdateError("Price cannot be negative")
 
-        # position = self._assets.get(symbol, {"quantity": 0, "avg_price": 0.0})
-        position = self.get_position(symbol)
-
-        new_quantity = position["quantity"] + quantity
-        cash_after = self._assets["CASH"]["quantity"] - (quantity * price)
+        new_quantity = self._position(symbol)[0] + quantity
+        cash_after = self._cash_balance() - (quantity * price) - fee
 
         if not self._allow_short and new_quantity < 0:
             raise PortfolioUpdateError(f"Short selling not allowed for {symbol}")
@@ -159,6 +181,26 @@ class Portfolio:
         else:
             raise PortfolioUpdateError(f"Unknown market action: {signal.action}")
 
+    def execute_fill(
+        self, symbol: str, quantity: float, price: float, fee: float = 0.0
+    ) -> None:
+        """
+        Execute a fill produced by an execution model.
+
+        Args:
+            symbol: The asset symbol.
+            quantity: The quantity bought (positive) or sold (negative).
+            price: The fill price per unit.
+            fee: Transaction cost paid from cash.
+
+        Raises:
+            PortfolioUpdateError: If the fill violates the portfolio's constraints.
+        """
+        if fee < 0:
+            raise PortfolioUpdateError("Fee cannot be negative")
+        self._validate_update(symbol, quantity, price, fee)
+        self._update_position(symbol, quantity, price, fee)
+
     def update_history(self, timestamp: datetime) -> None:
         """
         Record the current portfolio state at a given timestamp.
@@ -166,8 +208,8 @@ class Portfolio:
         Args:
             timestamp: The timestamp for the snapshot.
         """
-        # Deep copy to ensure historical integrity
-        self._history[timestamp] = self._assets.copy()
+        # only the positions changed since the last snapshot are stored
+        self._history.commit(timestamp)
 
     def get_position(self, symbol: str) -> dict[str, float]:
         """
@@ -181,7 +223,47 @@ class Portfolio:
         # return dict(self._assets.get(symbol, {"quantity": 0, "avg_price": 0.0}))
         return self._assets[symbol].copy()
 
-    def _update_position(self, symbol: str, quantity: float, price: float) -> None:
+    def _position(self, symbol: str) -> Tuple[float, float]:
+        """
+        Read a position without copying it.
+
+        Args:
+            symbol: The asset symbol
+        Returns:
+            (quantity, avg_price)
+        """
+        position = self._assets[symbol]
+        return position["quantity"], position["avg_price"]
+
+    def _cash_balance(self) -> float:
+        """Raw cash balance (as stored)."""
+        return self._assets["CASH"]["quantity"]
+
+    def _store_position(
+        self, symbol: str, quantity: float, avg_price: float, cash_change: float
+    ) -> None:
+        """
+        Write a new position and adjust cash.
+
+        Args:
+            symbol: The asset symbol.
+            quantity: The new quantity.
+            avg_price: The new average price.
+            cash_change: Amount added to (negative: taken from) cash.
+        """
+        self._assets["CASH"]["quantity"] += cash_change
+        self._assets.update(
+            {
+                symbol: {
+                    "quantity": quantity,
+                    "avg_price": avg_price,
+                }
+            }
+        )
+
+    def _update_position(
+        self, symbol: str, quantity: float, price: float, fee: float = 0.0
+    ) -> None:
         """
         Update the position for a given asset.
 
@@ -189,14 +271,13 @@ class Portfolio:
             symbol: The asset symbol.
             quantity: The quantity to buy (positive) or sell (negative).
             price: The price per unit of the asset.
+            fee: Transaction cost paid from cash (not added to avg_price).
         """
 
         if quantity == 0:
             return  # No change in position
 
-        p = self.get_position(symbol)
-        curr_quantity = p["quantity"]
-        curr_avg_price = p["avg_price"]
+        curr_quantity, curr_avg_price = self._position(symbol)
 
         if quantity > 0:  # Buying
             # buying more of the asset
@@ -239,12 +320,8 @@ class Portfolio:
                 )
 
         # Update cash position
-        self._assets["CASH"]["quantity"] -= quantity * price
-        self._assets.update(
-            {
-                symbol: {
-                    "quantity": new_quantity,
-                    "avg_price": new_avg_price,
-                }
-            }
+        self._store_position(
+            symbol, new_quantity, new_avg_price, -(quantity * price) - fee
         )
+        self._history.record(symbol, new_quantity, new_avg_price)
+        self._history.record("CASH", self._cash_balance(), 1.0)
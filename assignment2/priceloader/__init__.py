@@ -1,5 +1,17 @@
 """Data Loader Module"""
 
 from priceloader.priceloader import PriceLoader
+from priceloader.download import BulkDownloader, FetchBackend, YFinanceBackend
+from priceloader.cache import SeriesCache
+from priceloader.panel import PanelCache
+from priceloader.store import PriceStore
 
-__all__ = ["PriceLoader"]
+__all__ = [
+    "PriceLoader",
+    "BulkDownloader",
+    "FetchBackend",
+    "PanelCache",
+    "PriceStore",
+    "SeriesCache",
+    "YFinanceBackend",
+]
@@ -0,0 +1,73 @@
+"""
+In-process LRU cache of loaded price series.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+class SeriesCache:
+    """
+    Thread-safe least-recently-used cache of Series under a memory budget.
+
+    Entries are keyed by the caller (PriceLoader uses the ticker together with
+    its store signature, so a rewritten file is never served stale). When the
+    total size exceeds `max_bytes` the least recently used entries are
+    evicted; a Series larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise ValueError(f"Cache budget must not be negative, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[pd.Series, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[pd.Series]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, series: pd.Series) -> None:
+        size = int(series.memory_usage(index=True, deep=True))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (series, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def discard(self, predicate) -> None:
+        """Remove every entry whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._size -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the cached Series."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
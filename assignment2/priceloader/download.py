@@ -0,0 +1,342 @@
+"""
+Batched, concurrent and resumable price downloads.
+
+This module provides the download pipeline used by PriceLoader: tickers are
+grouped into multi-ticker batches, fetched on a thread pool through a
+pluggable backend with rate limiting and retries, and tracked in a manifest
+so an interrupted run picks up where it stopped.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Protocol
+
+import pandas as pd
+
+from config.constants import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_DELAY_BETWEEN_BATCHES,
+    DEFAULT_DELAY_BETWEEN_REQUESTS,
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_RETRY_ATTEMPTS,
+    JSON_EXTENSION,
+)
+from priceloader.store import PriceStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = f"download_manifest{JSON_EXTENSION}"
+
+# manifest status per ticker
+STATUS_DONE = "done"
+STATUS_EMPTY = "empty"
+STATUS_FAILED = "failed"
+# incremental update that found no new rows
+STATUS_UNCHANGED = "unchanged"
+
+
+class FetchBackend(Protocol):
+    """Source of close prices for several tickers at once."""
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.Series]:
+        """Fetch close prices.
+
+        Args:
+            tickers: Tickers to fetch in one request
+            start: Start date (inclusive)
+            end: End date (exclusive)
+
+        Returns:
+            Dict of ticker -> close price Series indexed by date. Tickers
+            without data are left out.
+
+        Raises:
+            Exception: If the request itself failed (it will be retried)
+        """
+        ...
+
+
+class YFinanceBackend:
+    """Fetch backend using yfinance multi-ticker downloads."""
+
+    def __init__(self) -> None:
+        # imported here so offline backends work without yfinance installed
+        import yfinance as yf
+
+        self._yf = yf
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.Series]:
+        df = self._yf.download(
+            tickers, start=start, end=end, progress=False, threads=False
+        )
+        if df is None or df.empty:
+            return {}
+
+        close = df["Close"] if "Close" in df.columns else df.iloc[:, 0]
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=tickers[0])
+
+        result = {}
+        for ticker in tickers:
+            if ticker not in close.columns:
+                continue
+            series = close[ticker].dropna()
+            if not series.empty:
+                result[ticker] = series
+        return result
+
+
+class RateLimiter:
+    """Spaces out requests across threads by a minimum interval."""
+
+    def __init__(
+        self,
+        min_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self) -> None:
+        """Block until the next request slot is available."""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_time)
+            self._next_time = start + self._min_interval
+        if start > now:
+            self._sleep(start - now)
+
+
+class DownloadManifest:
+    """
+    Thread-safe record of per-ticker download status, persisted as JSON.
+
+    The file is rewritten atomically after every update so a crash never
+    leaves a truncated manifest behind.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        if self._path.exists():
+            with open(self._path, "r") as f:
+                self._entries = json.load(f)
+
+    def get(self, ticker: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            entry = self._entries.get(ticker)
+            return dict(entry) if entry is not None else None
+
+    def update(
+        self, statuses: Dict[str, str], start: str, end: str, extend: bool = False
+    ) -> None:
+        """Record the status of a batch of tickers and save the manifest.
+
+        Args:
+            statuses: Dict of ticker -> status
+            start: Start date of the downloaded range
+            end: End date of the downloaded range
+            extend: If True, the range was appended to what is stored; only
+                the end date of completed tickers is moved forward
+        """
+        with self._lock:
+            for ticker, status in statuses.items():
+                entry = self._entries.get(ticker)
+                if not extend:
+                    self._entries[ticker] = {"status": status, "start": start, "end": end}
+                elif (
+                    entry is not None
+                    and entry["status"] == STATUS_DONE
+                    and status in (STATUS_DONE, STATUS_UNCHANGED)
+                ):
+                    entry["end"] = max(entry["end"], end)
+            tmp_path = self._path.with_name(self._path.name + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self._path)
+
+    def status(self, ticker: str, start: str, end: str) -> Optional[str]:
+        """Status of a ticker if its recorded range covers start..end.
+
+        Dates are ISO strings (YYYY-MM-DD), so they compare as text.
+
+        Returns:
+            The recorded status, or None if unknown or not covering the range
+        """
+        entry = self.get(ticker)
+        if entry is None or entry["start"] > start or entry["end"] < end:
+            return None
+        return entry["status"]
+
+
+class BulkDownloader:
+    """
+    Concurrent multi-ticker downloader with retries and resume support.
+
+    Each batch of up to `batch_size` tickers is one backend request. Requests
+    run on `max_workers` threads, are spaced by `request_delay` seconds and
+    retried up to `retry_attempts` times with exponential backoff starting at
+    `retry_delay`. Every finished batch is written to the manifest, so tickers
+    already downloaded for the same date range are skipped on the next run.
+
+    With `append=True` the fetched prices are appended after each ticker's
+    last stored date instead of replacing the stored series.
+    """
+
+    def __init__(
+        self,
+        backend: FetchBackend,
+        data_dir: Path,
+        start_date: str,
+        end_date: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        retry_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        request_delay: float = DEFAULT_DELAY_BETWEEN_REQUESTS,
+        retry_delay: float = DEFAULT_DELAY_BETWEEN_BATCHES,
+        sleep: Callable[[float], None] = time.sleep,
+        append: bool = False,
+    ) -> None:
+        """Initialize the BulkDownloader.
+
+        Args:
+            backend: Source of price data
+            data_dir: Directory for the per-ticker files and the manifest
+            start_date: Start date for downloads
+            end_date: End date for downloads
+            batch_size: Tickers per backend request
+            max_workers: Number of concurrent requests
+            retry_attempts: Attempts per batch before giving up
+            request_delay: Minimum seconds between requests
+            retry_delay: Backoff before the first retry (doubles each time)
+            sleep: Sleep function (replaceable in tests)
+            append: Append to the stored series instead of replacing them
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+        if retry_attempts <= 0:
+            raise ValueError(f"Retry attempts must be positive, got {retry_attempts}")
+
+        self.backend = backend
+        self.data_dir = Path(data_dir)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.append = append
+        self._sleep = sleep
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = PriceStore(self.data_dir)
+        self._rate_limiter = RateLimiter(request_delay, sleep=sleep)
+        self.manifest = DownloadManifest(self.data_dir / MANIFEST_FILENAME)
+
+    def pending(self, tickers: List[str], force: bool = False) -> List[str]:
+        """Tickers that still need downloading.
+
+        Tickers unknown to the manifest are skipped if their data exists (as
+        before the manifest existed). Known tickers are skipped if they were
+        downloaded for a range covering the current one and their data still
+        exists, or if the backend had no data for that range.
+        """
+        if force:
+            return list(tickers)
+
+        pending = []
+        for ticker in tickers:
+            if self.manifest.get(ticker) is None:
+                complete = self.store.exists(ticker)
+            else:
+                status = self.manifest.status(ticker, self.start_date, self.end_date)
+                complete = status == STATUS_EMPTY or (
+                    status == STATUS_DONE and self.store.exists(ticker)
+                )
+            if not complete:
+                pending.append(ticker)
+        return pending
+
+    def download(self, tickers: List[str], force: bool = False) -> Dict[str, str]:
+        """Download every pending ticker.
+
+        Args:
+            tickers: Tickers to download
+            force: If True, download even tickers that are already complete
+
+        Returns:
+            Dict of ticker -> status for the tickers attempted in this run
+        """
+        pending = self.pending(tickers, force)
+        skipped = len(tickers) - len(pending)
+        if skipped:
+            logger.info(f"Skipping {skipped} tickers that are already downloaded")
+        if not pending:
+            return {}
+
+        batches = [
+            pending[i : i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+        logger.info(f"Downloading {len(pending)} tickers in {len(batches)} batches")
+
+        statuses: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for batch_statuses in pool.map(self._download_batch, batches):
+                statuses.update(batch_statuses)
+        return statuses
+
+    def _fetch_with_retry(self, batch: List[str]) -> Optional[Dict[str, pd.Series]]:
+        for attempt in range(self.retry_attempts):
+            self._rate_limiter.wait()
+            try:
+                return self.backend.fetch(batch, self.start_date, self.end_date)
+            except Exception as e:
+                if attempt + 1 == self.retry_attempts:
+                    logger.error(f"Failed to download batch {batch[0]}..{batch[-1]}: {e}")
+                    return None
+                delay = self.retry_delay * 2**attempt
+                logger.warning(
+                    f"Download of batch {batch[0]}..{batch[-1]} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                self._sleep(delay)
+        return None
+
+    def _download_batch(self, batch: List[str]) -> Dict[str, str]:
+        data = self._fetch_with_retry(batch)
+        if data is None:
+            statuses = {ticker: STATUS_FAILED for ticker in batch}
+        else:
+            statuses = {}
+            for ticker in batch:
+                statuses[ticker] = self._save(ticker, data.get(ticker))
+
+        self.manifest.update(
+            statuses, self.start_date, self.end_date, extend=self.append
+        )
+        return statuses
+
+    def _save(self, ticker: str, series: Optional[pd.Series]) -> str:
+        if self.append:
+            rows = self.store.append(ticker, series) if series is not None else 0
+            if not rows:
+                return STATUS_UNCHANGED
+            logger.info(f"Appended {rows} rows for {ticker}")
+            return STATUS_DONE
+
+        if series is None or series.empty:
+            logger.warning(f"No data found for {ticker}")
+            return STATUS_EMPTY
+        self.store.write(ticker, series)
+        logger.info(f"Successfully saved data for {ticker}")
+        return STATUS_DONE
@@ -0,0 +1,153 @@
+"""
+Consolidated, memory-mapped price panel.
+
+Loading the whole universe from per-ticker files means opening hundreds of
+Parquet files and aligning their indexes on every call. The panel cache does
+that once: the aligned close prices are saved as a single `.npy` matrix with
+one contiguous row per ticker, next to its date index and a metadata file.
+
+Later loads memory-map the matrix and copy only the requested tickers' rows.
+The metadata records the size and modification time of every ticker file the
+panel was built from; if any of them changed (or a requested ticker is not in
+the panel) the panel is rebuilt.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import JSON_EXTENSION, NPY_EXTENSION
+from priceloader.store import PriceStore
+
+logger = logging.getLogger(__name__)
+
+PANEL_DIRECTORY = "_panel"
+PRICES_FILENAME = f"prices{NPY_EXTENSION}"
+DATES_FILENAME = f"dates{NPY_EXTENSION}"
+META_FILENAME = f"meta{JSON_EXTENSION}"
+
+
+class PanelCache:
+    """Wide price panel built from a PriceStore and cached on disk."""
+
+    def __init__(self, store: PriceStore) -> None:
+        self.store = store
+        self.directory = store.data_dir / PANEL_DIRECTORY
+        self._lock = threading.Lock()
+
+    def signature(self, ticker: str) -> List[List]:
+        """A ticker's store signature in its JSON form."""
+        return [list(entry) for entry in self.store.signature(ticker)]
+
+    def _read_meta(self) -> Optional[Dict]:
+        path = self.directory / META_FILENAME
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def is_valid(self, tickers: List[str], meta: Optional[Dict] = None) -> bool:
+        """Whether the panel holds `tickers` and no ticker file changed since."""
+        if meta is None:
+            meta = self._read_meta()
+        if meta is None:
+            return False
+        signatures = meta["signatures"]
+        if any(ticker not in signatures for ticker in tickers):
+            return False
+        return all(
+            self.signature(ticker) == signature
+            for ticker, signature in signatures.items()
+        )
+
+    def build(self, tickers: List[str]) -> Dict:
+        """Read every ticker's data and save the aligned panel.
+
+        Args:
+            tickers: Tickers to include. Tickers without stored data are left out.
+
+        Returns:
+            The metadata of the new panel
+        """
+        data = {}
+        signatures = {}
+        for ticker in tickers:
+            # take the signature first, so a concurrent write invalidates the panel
+            signature = self.signature(ticker)
+            series = self.store.read(ticker)
+            if series is None:
+                continue
+            data[ticker] = series
+            signatures[ticker] = signature
+        df = pd.DataFrame(data)
+        logger.info(f"Building price panel of {df.shape[1]} tickers x {df.shape[0]} dates")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # one contiguous row per ticker, so loading a subset reads only its rows
+        self._save_array(PRICES_FILENAME, np.ascontiguousarray(df.to_numpy(np.float64).T))
+        self._save_array(DATES_FILENAME, df.index.to_numpy())
+        meta = {
+            "tickers": list(df.columns),
+            "index_name": df.index.name,
+            "signatures": signatures,
+        }
+        # metadata last: it is what marks the panel as complete
+        tmp_path = self.directory / (META_FILENAME + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.directory / META_FILENAME)
+        return meta
+
+    def load(self, tickers: List[str]) -> pd.DataFrame:
+        """Load the close prices of `tickers`, rebuilding the panel if stale.
+
+        Matches building the frame from per-ticker Series: columns are in the
+        order requested and dates on which none of the requested tickers has
+        a price are dropped.
+
+        Args:
+            tickers: Tickers to load (all must have stored data)
+
+        Returns:
+            pd.DataFrame: Wide format with dates as index and tickers as columns
+        """
+        with self._lock:
+            meta = self._read_meta()
+            if not self.is_valid(tickers, meta):
+                known = [] if meta is None else list(meta["signatures"])
+                meta = self.build(known + [t for t in tickers if t not in known])
+
+            prices = np.load(self.directory / PRICES_FILENAME, mmap_mode="r")
+            dates = np.load(self.directory / DATES_FILENAME)
+
+        position = {ticker: i for i, ticker in enumerate(meta["tickers"])}
+        rows = [position[ticker] for ticker in tickers if ticker in position]
+        values = prices[rows]
+        # dates where only tickers outside the subset traded
+        has_data = ~np.isnan(values).all(axis=0)
+        index = pd.DatetimeIndex(dates[has_data], name=meta["index_name"])
+        return pd.DataFrame(
+            values[:, has_data].T,
+            index=index,
+            columns=[meta["tickers"][i] for i in rows],
+        )
+
+    def clear(self) -> None:
+        """Delete the cached panel."""
+        with self._lock:
+            for name in (META_FILENAME, PRICES_FILENAME, DATES_FILENAME):
+                path = self.directory / name
+                if path.exists():
+                    path.unlink()
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        # write then rename, so a reader never maps a partial file
+        tmp_path = self.directory / (name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, self.directory / name)
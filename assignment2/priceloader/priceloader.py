@@ -1,11 +1,24 @@
-import yfinance as yf
 import pandas as pd
 import csv
 import os
-from typing import List, Optional, Dict, Union
+from typing import List, Optional, Dict, Tuple, Union
 from pathlib import Path
 import logging
 
+from config.constants import DEFAULT_CACHE_BYTES
+from priceloader.cache import SeriesCache
+from priceloader.download import (
+    MANIFEST_FILENAME,
+    STATUS_EMPTY,
+    STATUS_UNCHANGED,
+    BulkDownloader,
+    DownloadManifest,
+    FetchBackend,
+    YFinanceBackend,
+)
+from priceloader.panel import PanelCache
+from priceloader.store import PriceStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, handlers=[logging.FileHandler("trading_engine.log")]
@@ -22,6 +35,8 @@ class PriceLoader:
         data_dir: str = "data",
         start_date: str = "2005-01-01",
         end_date: str = "2025-01-01",
+        backend: Optional[FetchBackend] = None,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
     ):
         """Initialize the PriceLoader.
 
@@ -30,13 +45,21 @@ class PriceLoader:
             data_dir: Directory to store/load data files
             start_date: Start date for data downloads
             end_date: End date for data downloads
+            backend: Source of price data. Defaults to yfinance (created on
+                first download)
+            cache_bytes: Memory budget of the in-process cache of loaded
+                series (0 disables it)
 
         # NOTE: Assumption if tickers is None is you want all sp500 tickers. Probably only use this if you are downloading all sp500 tickers.
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.store = PriceStore(self.data_dir)
+        self.panel = PanelCache(self.store)
+        self.cache = SeriesCache(cache_bytes)
         self.start_date = start_date
         self.end_date = end_date
+        self._backend = backend
 
         if tickers is not None:
             self.tickers = tickers
@@ -54,9 +77,16 @@ class PriceLoader:
             next(reader)  # Skip header
             return [row[0] for row in reader]
 
+    @property
+    def backend(self) -> FetchBackend:
+        """The fetch backend, created on first use."""
+        if self._backend is None:
+            self._backend = YFinanceBackend()
+        return self._backend
+
     def _get_file_path(self, ticker: str) -> Path:
-        """Get the file path for a ticker's data."""
-        return self.data_dir / f"{ticker}.parquet"
+        """Get the path of a ticker's data (its partition directory)."""
+        return self.store.partition_dir(ticker)
 
     def _download_single_ticker(self, ticker: str) -> bool:
         """Download data for a single ticker.
@@ -66,16 +96,15 @@ class PriceLoader:
         """
         try:
             logger.info(f"Downloading data for {ticker}...")
-            df = yf.download(ticker, start=self.start_date, end=self.end_date)
+            close_prices = self.backend.fetch(
+                [ticker], self.start_date, self.end_date
+            ).get(ticker)
 
-            if df is None or df.empty:
+            if close_prices is None or close_prices.empty:
                 logger.warning(f"No data found for {ticker}")
                 return False
 
-            # Extract close prices
-            close_prices = df["Close"] if "Close" in df.columns else df.iloc[:, 0]
-            file_path = self._get_file_path(ticker)
-            close_prices.to_parquet(file_path)
+            self.store.write(ticker, close_prices)
             logger.info(f"Successfully saved data for {ticker}")
             return True
 
@@ -93,7 +122,7 @@ class PriceLoader:
         """
         file_path = self._get_file_path(ticker)
 
-        if not file_path.exists():
+        if not self.store.exists(ticker):
             if auto_download:
                 logger.info(f"Data for {ticker} not found locally, downloading...")
                 if not self._download_single_ticker(ticker):
@@ -103,46 +132,142 @@ class PriceLoader:
                 return None
 
         try:
-            df = pd.read_parquet(file_path)
-            # Convert DataFrame to Series (take first column if multiple)
-            if isinstance(df, pd.DataFrame):
-                return df.iloc[:, 0]  # Return first column as Series
-            return df  # Already a Series
+            return self._read_cached(ticker)
         except Exception as e:
             logger.error(f"Error reading data for {ticker}: {e}")
             return None
 
+    def _read_cached(self, ticker: str) -> Optional[pd.Series]:
+        """Read a ticker through the cache, keyed by its store signature.
+
+        The returned Series is shared with the cache and must not be modified.
+        """
+        key = (ticker, self.store.signature(ticker))
+        series = self.cache.get(key)
+        if series is None:
+            series = self.store.read(ticker)
+            if series is not None:
+                # entries for older versions of the files can never hit again
+                self.cache.discard(lambda cached: cached[0] == ticker)
+                self.cache.put(key, series)
+        return series
+
     def download_data(
-        self, tickers: Optional[List[str]] = None, force_download: bool = False
-    ) -> None:
+        self,
+        tickers: Optional[List[str]] = None,
+        force_download: bool = False,
+        **downloader_options,
+    ) -> Dict[str, str]:
         """Download data for specified tickers.
 
+        Tickers are fetched in concurrent multi-ticker batches with rate
+        limiting and retries (see BulkDownloader). Progress is kept in a
+        manifest in the data directory, so an interrupted run resumes with the
+        tickers that are still missing.
+
         Args:
             tickers: List of tickers to download. If None, uses all tickers.
             force_download: If True, download even if file exists.
+            **downloader_options: Overrides for BulkDownloader (batch_size,
+                max_workers, retry_attempts, request_delay, retry_delay)
+
+        Returns:
+            Dict of ticker -> status ("done", "empty" or "failed") for the
+            tickers downloaded in this call
         """
         if tickers is None:
             tickers = self.tickers
 
-        for ticker in tickers:
-            file_path = self._get_file_path(ticker)
+        downloader = BulkDownloader(
+            self.backend,
+            self.data_dir,
+            self.start_date,
+            self.end_date,
+            **downloader_options,
+        )
+        return downloader.download(tickers, force=force_download)
 
-            if file_path.exists() and not force_download:
-                logger.info(f"Data for {ticker} already exists, skipping...")
-                continue
+    def update_data(
+        self,
+        tickers: Optional[List[str]] = None,
+        end_date: Optional[str] = None,
+        **downloader_options,
+    ) -> Dict[str, str]:
+        """Incrementally bring stored data up to date.
+
+        For each ticker the last stored date is read and only the missing tail
+        is fetched and appended to its date-partitioned store. Tickers sharing
+        a last date are fetched together in batches. Tickers with no stored
+        data get a full download from start_date, unless the manifest records
+        that the backend had no data for them (e.g. delisted); those are
+        skipped, and download_data(force_download=True) retries them.
+
+        Args:
+            tickers: List of tickers to update. If None, uses all tickers.
+            end_date: Fetch up to this date (exclusive). Defaults to tomorrow,
+                i.e. including today's prices.
+            **downloader_options: Overrides for BulkDownloader
+
+        Returns:
+            Dict of ticker -> status ("done", "unchanged", "empty" or "failed")
+        """
+        if tickers is None:
+            tickers = self.tickers
+        if end_date is None:
+            end_date = (pd.Timestamp.today().normalize() + pd.Timedelta(days=1)).strftime(
+                "%Y-%m-%d"
+            )
+
+        manifest = DownloadManifest(self.data_dir / MANIFEST_FILENAME)
+        statuses: Dict[str, str] = {}
 
-            self._download_single_ticker(ticker)
+        # group by the first missing date so each group is one fetch range
+        groups: Dict[Optional[str], List[str]] = {}
+        for ticker in tickers:
+            last = self.store.last_date(ticker)
+            if last is None:
+                entry = manifest.get(ticker)
+                if entry is not None and entry["status"] == STATUS_EMPTY:
+                    statuses[ticker] = STATUS_EMPTY
+                    continue
+            start = (
+                None
+                if last is None
+                else (last + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+            )
+            groups.setdefault(start, []).append(ticker)
+
+        for start, group in groups.items():
+            if start is not None and start >= end_date:
+                statuses.update({ticker: STATUS_UNCHANGED for ticker in group})
+                continue
+            downloader = BulkDownloader(
+                self.backend,
+                self.data_dir,
+                self.start_date if start is None else start,
+                end_date,
+                append=start is not None,
+                **downloader_options,
+            )
+            statuses.update(downloader.download(group, force=True))
+        return statuses
 
     def load_data(
         self,
         tickers: Optional[List[str]] = None,
         auto_download: bool = False,
+        use_panel: bool = True,
     ) -> pd.DataFrame:
         """Load data for multiple tickers into a single DataFrame.
 
+        By default the data comes from the consolidated panel cache (see
+        PanelCache), which is built on first use and rebuilt whenever a
+        ticker's files change; only the requested tickers are read from it.
+
         Args:
             tickers: List of tickers to load. If None, uses all tickers.
             auto_download: If True, download missing data automatically
+            use_panel: If False, read every ticker's own files instead
 
         Returns:
             pd.DataFrame: Wide format with dates as index and tickers as columns
@@ -150,6 +275,9 @@ class PriceLoader:
         if tickers is None:
             tickers = self.tickers
 
+        if use_panel:
+            return self._load_panel(tickers, auto_download)
+
         data = {}
         failed_tickers = []
 
@@ -171,8 +299,37 @@ class PriceLoader:
 
         return df
 
+    def _load_panel(self, tickers: List[str], auto_download: bool) -> pd.DataFrame:
+        available = []
+        failed_tickers = []
+        for ticker in tickers:
+            if self.store.exists(ticker) or (
+                auto_download and self._download_single_ticker(ticker)
+            ):
+                available.append(ticker)
+            else:
+                failed_tickers.append(ticker)
+
+        if not available:
+            raise ValueError("No data could be loaded for any tickers")
+
+        if failed_tickers:
+            logger.info(f"Failed to load data for: {failed_tickers}")
+
+        return self.panel.load(available)
+
+    def _row_count(self, ticker: str) -> int:
+        try:
+            info = self.store.info(ticker)
+        except Exception as e:
+            logger.error(f"Error reading metadata for {ticker}: {e}")
+            return 0
+        return info["rows"] if info is not None else 0
+
     def get_data_info(self, ticker: Optional[str] = None) -> Union[Dict[str, int], int]:
-        """Get information about loaded data.
+        """Get information about stored data.
+
+        Row counts come from the Parquet metadata; no data is loaded.
 
         Args:
             ticker: Specific ticker to check. If None, checks all tickers.
@@ -181,15 +338,22 @@ class PriceLoader:
             Dict of ticker -> length, or single length if ticker specified
         """
         if ticker is not None:
-            ticker_data = self._load_single_ticker(ticker, auto_download=False)
-            return len(ticker_data) if ticker_data is not None else 0
+            return self._row_count(ticker)
+
+        return {tick: self._row_count(tick) for tick in self.tickers}
 
-        info = {}
-        for tick in self.tickers:
-            ticker_data = self._load_single_ticker(tick, auto_download=False)
-            info[tick] = len(ticker_data) if ticker_data is not None else 0
+    def get_date_range(
+        self, ticker: str
+    ) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last stored date of a ticker, from Parquet metadata.
 
-        return info
+        Returns:
+            (start, end) or None if no data is stored
+        """
+        info = self.store.info(ticker)
+        if info is None or info["start"] is None:
+            return None
+        return info["start"], info["end"]
 
     def print_data_info(self, ticker: Optional[str] = None) -> None:
         """Print data information in a formatted way."""
@@ -0,0 +1,191 @@
+"""
+Date-partitioned on-disk store of close prices.
+
+Each ticker is a directory with one Parquet file per calendar year
+(data/AAPL/2024.parquet). Appending new prices only rewrites the partition of
+the last stored year and adds partitions for new years, so a refresh costs
+time proportional to the new data. Single-file stores written by older
+versions (data/AAPL.parquet) are still read and are converted to partitions
+the first time they are appended to.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from config.constants import PARQUET_EXTENSION
+
+logger = logging.getLogger(__name__)
+
+
+class PriceStore:
+    """Reads and writes per-ticker close price series under `data_dir`."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+
+    def legacy_path(self, ticker: str) -> Path:
+        """Path of a single-file (unpartitioned) ticker store."""
+        return self.data_dir / f"{ticker}{PARQUET_EXTENSION}"
+
+    def partition_dir(self, ticker: str) -> Path:
+        return self.data_dir / ticker
+
+    def partitions(self, ticker: str) -> List[Path]:
+        """Partition files of a ticker, oldest year first."""
+        directory = self.partition_dir(ticker)
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob(f"*{PARQUET_EXTENSION}"))
+
+    def files(self, ticker: str) -> List[Path]:
+        """All files holding data for a ticker."""
+        partitions = self.partitions(ticker)
+        if partitions:
+            return partitions
+        legacy = self.legacy_path(ticker)
+        return [legacy] if legacy.exists() else []
+
+    def exists(self, ticker: str) -> bool:
+        return bool(self.files(ticker))
+
+    def signature(self, ticker: str) -> Tuple[Tuple[str, int, int], ...]:
+        """Name, size and modification time of each of a ticker's files.
+
+        The signature changes whenever the stored data does, so it can key
+        caches of the data.
+        """
+        signature = []
+        for path in self.files(ticker):
+            stat = path.stat()
+            signature.append((path.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def info(self, ticker: str) -> Optional[Dict]:
+        """Row count and date range of a ticker, from Parquet metadata only.
+
+        Returns:
+            Dict with "rows", "start" and "end", or None if nothing is stored
+        """
+        files = self.files(ticker)
+        if not files:
+            return None
+        rows, start, end = 0, None, None
+        for path in files:
+            file_rows, file_start, file_end = self._file_info(path)
+            rows += file_rows
+            if file_start is not None:
+                start = file_start if start is None else min(start, file_start)
+                end = file_end if end is None else max(end, file_end)
+        return {"rows": rows, "start": start, "end": end}
+
+    def read(self, ticker: str) -> Optional[pd.Series]:
+        """Load the full close price series of a ticker.
+
+        Returns:
+            pd.Series or None if nothing is stored
+        """
+        files = self.files(ticker)
+        if not files:
+            return None
+        parts = [self._read_file(path) for path in files]
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def last_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        """Last stored date of a ticker, from the newest file's metadata."""
+        files = self.files(ticker)
+        if not files:
+            return None
+        return self._file_info(files[-1])[2]
+
+    def write(self, ticker: str, series: pd.Series) -> None:
+        """Replace everything stored for a ticker with `series`."""
+        series = series.sort_index()
+        directory = self.partition_dir(ticker)
+        for path in self.partitions(ticker):
+            path.unlink()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._write_partitions(ticker, series)
+
+        legacy = self.legacy_path(ticker)
+        if legacy.exists():
+            legacy.unlink()
+
+    def append(self, ticker: str, series: pd.Series) -> int:
+        """Append prices after the last stored date.
+
+        Rows at or before the last stored date are ignored, so overlapping
+        fetches are safe.
+
+        Returns:
+            Number of rows appended
+        """
+        last = self.last_date(ticker)
+        if last is not None:
+            series = series[series.index > last]
+        if series.empty:
+            return 0
+
+        if not self.partitions(ticker) and self.legacy_path(ticker).exists():
+            # convert the old single file once, then append to partitions
+            logger.info(f"Converting {ticker} to a date-partitioned store")
+            self.write(ticker, self._read_file(self.legacy_path(ticker)))
+
+        self.partition_dir(ticker).mkdir(parents=True, exist_ok=True)
+        self._write_partitions(ticker, series.sort_index(), merge=True)
+        return len(series)
+
+    def _partition_path(self, ticker: str, year: int) -> Path:
+        return self.partition_dir(ticker) / f"{year}{PARQUET_EXTENSION}"
+
+    def _write_partitions(
+        self, ticker: str, series: pd.Series, merge: bool = False
+    ) -> None:
+        years = pd.DatetimeIndex(series.index).year
+        for year, part in series.groupby(years):
+            path = self._partition_path(ticker, int(year))
+            if merge and path.exists():
+                part = pd.concat([self._read_file(path), part])
+            # write then rename, so an interrupted run never leaves a partial file
+            tmp_path = path.with_name(path.name + ".tmp")
+            part.to_frame(name=ticker).to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _file_info(
+        path: Path,
+    ) -> Tuple[int, Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Row count and first/last index value of a file."""
+        parquet_file = pq.ParquetFile(path)
+        metadata = parquet_file.metadata
+        schema = parquet_file.schema_arrow
+        index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+        if not metadata.num_rows or not index_columns or not isinstance(
+            index_columns[0], str
+        ):
+            return metadata.num_rows, None, None
+
+        column = schema.get_field_index(index_columns[0])
+        start, end = None, None
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(column).statistics
+            if statistics is None or not statistics.has_min_max:
+                # no statistics written: read just the index column
+                index = pq.read_table(path, columns=[index_columns[0]]).column(0)
+                values = index.to_pandas()
+                return metadata.num_rows, values.min(), values.max()
+            start = statistics.min if start is None else min(start, statistics.min)
+            end = statistics.max if end is None else max(end, statistics.max)
+        return metadata.num_rows, pd.Timestamp(start), pd.Timestamp(end)
+
+    @staticmethod
+    def _read_file(path: Path) -> pd.Series:
+        df = pd.read_parquet(path)
+        # Convert DataFrame to Series (take first column if multiple)
+        if isinstance(df, pd.DataFrame):
+            return df.iloc[:, 0]
+        return df
@@ -10,6 +10,7 @@ from strategies.moving_average_strategy import MovingAverageStrategy
 from strategies.volatility_breakout_strategy import VolatilityBreakoutStrategy
 from strategies.macd_strategy import MACDStrategy
 from strategies.rsi_strategy import RSIStrategy
+from strategies.recorder import IndicatorRecorder
 
 __all__ = [
     "Strategy",
@@ -18,4 +19,5 @@ __all__ = [
     "VolatilityBreakoutStrategy",
     "MACDStrategy",
     "RSIStrategy",
+    "IndicatorRecorder",
 ]
@@ -6,9 +6,12 @@ This strategy buys X shares of each ticker on the first day and holds them.
 
 # TODO: Implement the BenchmarkStrategy class
 
-from .strategy import Strategy
+from .strategy import RowActions, Strategy
 from models import MarketDataPoint, Signal
+from datetime import datetime
 from typing import List
+
+import numpy as np
 from models import MarketAction, SignalList
 from config.constants import DEFAULT_INITIAL_CASH
 
@@ -63,5 +66,20 @@ class BenchmarkStrategy(Strategy):
 
         return signals
 
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> RowActions:
+        if not self._is_first_day:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int8)
+
+        if self._quantity is None:
+            total_price = 0
+            for price in prices.tolist():
+                total_price += price
+            self._quantity = int(self._cash / total_price)
+        self.matrix_signal_quantity = self._quantity
+        self._is_first_day = False
+        return np.arange(len(symbols), dtype=np.intp), np.ones(len(symbols), dtype=np.int8)
+
     def plot_indicators(self, symbol: str):
         pass
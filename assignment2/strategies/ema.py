@@ -1,14 +1,145 @@
 """
-Exponential and Simple Moving Average implementations.
+Incremental indicator kernels.
 
-This module provides efficient implementations of exponential moving averages
-and simple moving averages used in technical analysis strategies.
+This module provides the technical indicators used by the strategies:
+exponential and simple moving averages, RSI and rolling variance. Every
+update is O(1). Each calculator accepts either a single value (one series)
+or a 1D array holding one value per ticker (a whole row of the price panel).
+
+The `*_matrix` functions compute the same indicators for a whole panel at
+once with NumPy operations over the time axis. The moving averages and the
+RSI repeat the per-tick arithmetic and return identical values; the rolling
+standard deviation agrees up to floating-point rounding.
 """
 
-from typing import List, Optional
+import math
+import operator
+from abc import ABC, abstractmethod
+from functools import reduce
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# a single value, or one value per ticker
+Value = Union[float, np.ndarray]
+
+
+class Indicator(ABC):
+    """
+    Base class for incremental indicators.
+
+    Subclasses implement `update`, which returns None while the indicator is
+    still warming up.
+    """
+
+    @abstractmethod
+    def update(self, data: Value) -> Optional[Value]:
+        """
+        Update the indicator with new data.
+
+        Args:
+            data: New value, or a row of values (one per ticker)
+
+        Returns:
+            Current indicator value, or None while warming up
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def update_many(self, values: np.ndarray) -> np.ndarray:
+        """
+        Feed values along the first axis, one update per entry.
+
+        A 1D array is fed as single values; a 2D panel (dates x tickers) is
+        fed row by row. This is the reference loop; the `*_matrix` functions
+        are the vectorized panel kernels.
+
+        Args:
+            values: 1D series or 2D panel
+
+        Returns:
+            Array of the same shape with the indicator after each update
+            (NaN while warming up)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        result = np.full(values.shape, np.nan)
+        rows = values.tolist() if values.ndim == 1 else values
+        for i, row in enumerate(rows):
+            value = self.update(row)
+            if value is not None:
+                result[i] = value
+        return result
+
+    def __call__(self, data: Value) -> Optional[Value]:
+        """Allow the indicator to be called as a function."""
+        return self.update(data)
+
+
+class _RollingSum:
+    """
+    Sum over a ring buffer of the last `window` values.
+
+    The running total is recomputed from the buffer, oldest value first,
+    each time the ring wraps around (amortized O(1)), so rounding from the
+    running add/subtract cannot accumulate. It is also recomputed whenever it
+    turns non-finite, since subtracting a NaN or inf that leaves the window
+    cannot undo it. With `exact_zero` the sum of a window holding only zeros
+    is exactly 0.0 (RSI tests the loss sum against 0). _rolling_sum
+    reproduces these steps bit for bit for a whole panel.
+    """
+
+    def __init__(self, window: int, exact_zero: bool = False) -> None:
+        self._window = window
+        self._exact_zero = exact_zero
+        self._values: List[Value] = []
+        self._index = 0
+        self._total: Value = 0.0
+        self._nonzero: Union[int, np.ndarray] = 0
+        # values in the window
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _exact(self, start: int) -> Value:
+        # sum in chronological order, starting at the oldest value
+        values = self._values
+        return reduce(operator.add, values[start:] + values[:start], 0.0)
+
+    def add(self, data: Value) -> Value:
+        values = self._values
+        if self.count == self._window:
+            index = self._index
+            old = values[index]
+            values[index] = data
+            index += 1
+            if index == self._window:
+                index = 0
+                total = self._exact(0)
+            else:
+                total = self._total + data - old
+                if isinstance(total, float):
+                    if not math.isfinite(total):
+                        total = self._exact(index)
+                else:
+                    stale = ~np.isfinite(total)
+                    if stale.any():
+                        total = np.where(stale, self._exact(index), total)
+            self._index = index
+            if self._exact_zero:
+                self._nonzero = self._nonzero + (data != 0) - (old != 0)
+                total = total * (self._nonzero != 0)
+        else:
+            values.append(data)
+            self.count += 1
+            total = self._total + data
+            if self._exact_zero:
+                self._nonzero = self._nonzero + (data != 0)
+                total = total * (self._nonzero != 0)
+        self._total = total
+        return total
 
 
-class ExponentialMovingAverage:
+class ExponentialMovingAverage(Indicator):
     """
     Exponential Moving Average (EMA) calculator.
 
@@ -30,9 +161,9 @@ class ExponentialMovingAverage:
             raise ValueError(f"Period must be a positive integer, got {period}")
 
         self._alpha: float = 2 / (period + 1)
-        self._ema: Optional[float] = None
+        self._ema: Optional[Value] = None
 
-    def update(self, data: float) -> float:
+    def update(self, data: Value) -> Value:
         """
         Update the EMA with new data.
 
@@ -48,16 +179,13 @@ class ExponentialMovingAverage:
             self._ema = self._alpha * data + (1 - self._alpha) * self._ema
         return self._ema
 
-    def __call__(self, data: float) -> float:
-        """Allow the EMA to be called as a function."""
-        return self.update(data)
-
 
-class MovingAverage:
+class MovingAverage(Indicator):
     """
     Simple Moving Average (SMA) calculator.
 
-    Maintains a window of values and calculates the average over that window.
+    Keeps a running sum over a ring buffer of the window. Until the window is
+    full the average is taken over the values seen so far.
     """
 
     def __init__(self, window: int) -> None:
@@ -73,11 +201,10 @@ class MovingAverage:
         if not isinstance(window, int) or window <= 0:
             raise ValueError(f"Window must be a positive integer, got {window}")
 
-        self._window: int = window
-        self._values: List[float] = []
-        self._moving_average: Optional[float] = None
+        self._sum = _RollingSum(window)
+        self._moving_average: Optional[Value] = None
 
-    def update(self, data: float) -> float:
+    def update(self, data: Value) -> Value:
         """
         Update the moving average with new data.
 
@@ -87,16 +214,432 @@ class MovingAverage:
         Returns:
             Current moving average value
         """
-        self._values.append(data)
+        total = self._sum.add(data)
+        self._moving_average = total / self._sum.count
+        return self._moving_average
 
-        if len(self._values) > self._window:
-            self._values.pop(0)
 
-        # Calculate average based on actual number of values we have
-        self._moving_average = sum(self._values) / len(self._values)
+def _gain_loss(delta: Value) -> Tuple[Value, Value]:
+    """Split a price change into a (gain, loss) pair of non-negative values."""
+    if isinstance(delta, np.ndarray):
+        return np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0)
+    return (delta if delta > 0 else 0.0), (-delta if delta < 0 else 0.0)
 
-        return self._moving_average
 
-    def __call__(self, data: float) -> float:
-        """Allow the moving average to be called as a function."""
-        return self.update(data)
+class RelativeStrengthIndex(Indicator):
+    """
+    RSI with simple averages of gains and losses (as used by RSIStrategy).
+
+    Gains and losses are summed over the price changes of the last `period`
+    prices (period - 1 changes) and divided by `period`. The first value is
+    returned at the (period + 1)-th price. The RSI is 0 when the window
+    has no losses.
+    """
+
+    def __init__(self, period: int) -> None:
+        """
+        Initialize the RSI.
+
+        Args:
+            period: The lookback period
+
+        Raises:
+            ValueError: If period is not an integer of at least 2
+        """
+        if not isinstance(period, int) or period < 2:
+            raise ValueError(f"Period must be an integer >= 2, got {period}")
+
+        self._period = period
+        self._gains = _RollingSum(period - 1, exact_zero=True)
+        self._losses = _RollingSum(period - 1, exact_zero=True)
+        self._previous: Optional[Value] = None
+        self._changes = 0
+
+    def update(self, data: Value) -> Optional[Value]:
+        """
+        Update the RSI with a new price.
+
+        Args:
+            data: New price
+
+        Returns:
+            Current RSI (0-100), or None while warming up
+        """
+        previous, self._previous = self._previous, data
+        if previous is None:
+            return None
+
+        gain, loss = _gain_loss(data - previous)
+        up = self._gains.add(gain) / self._period
+        down = self._losses.add(loss) / self._period
+        self._changes += 1
+        if self._changes < self._period:
+            return None
+
+        if isinstance(down, np.ndarray):
+            rs = np.divide(up, down, out=np.zeros_like(down), where=down != 0)
+        else:
+            rs = up / down if down != 0 else 0
+        return 100 - (100 / (1 + rs))
+
+
+class WilderRSI(Indicator):
+    """
+    RSI with Wilder's smoothing.
+
+    The first averages are the simple means of the first `period` gains and
+    losses; after that avg = (avg * (period - 1) + value) / period. The first
+    value is returned at the (period + 1)-th price. The RSI is 100 when the
+    average loss is 0.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        """
+        Initialize the Wilder RSI.
+
+        Args:
+            period: The smoothing period. Defaults to 14.
+
+        Raises:
+            ValueError: If period is not a positive integer
+        """
+        if not isinstance(period, int) or period <= 0:
+            raise ValueError(f"Period must be a positive integer, got {period}")
+
+        self._period = period
+        self._previous: Optional[Value] = None
+        self._changes = 0
+        self._avg_gain: Value = 0.0
+        self._avg_loss: Value = 0.0
+
+    def update(self, data: Value) -> Optional[Value]:
+        """
+        Update the RSI with a new price.
+
+        Args:
+            data: New price
+
+        Returns:
+            Current RSI (0-100), or None while warming up
+        """
+        previous, self._previous = self._previous, data
+        if previous is None:
+            return None
+
+        gain, loss = _gain_loss(data - previous)
+        self._changes += 1
+        if self._changes <= self._period:
+            # seed with the simple mean of the first `period` changes
+            self._avg_gain = self._avg_gain + gain / self._period
+            self._avg_loss = self._avg_loss + loss / self._period
+            if self._changes < self._period:
+                return None
+        else:
+            self._avg_gain = (self._avg_gain * (self._period - 1) + gain) / self._period
+            self._avg_loss = (self._avg_loss * (self._period - 1) + loss) / self._period
+
+        if isinstance(self._avg_loss, np.ndarray):
+            no_loss = self._avg_loss == 0
+            rs = np.divide(
+                self._avg_gain,
+                self._avg_loss,
+                out=np.zeros_like(self._avg_loss),
+                where=~no_loss,
+            )
+            return np.where(no_loss, 100.0, 100 - (100 / (1 + rs)))
+        if self._avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self._avg_gain / self._avg_loss))
+
+
+class RollingVariance(Indicator):
+    """
+    Population variance (ddof=0) over a rolling window, via Welford's updates.
+
+    Adding a value and dropping the oldest one each adjust the running mean and
+    sum of squared deviations in O(1); both are recomputed from the window
+    when a non-finite value leaves it. Returns None until the window is full.
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize the rolling variance.
+
+        Args:
+            window: Number of values in the window
+
+        Raises:
+            ValueError: If window is not a positive integer
+        """
+        if not isinstance(window, int) or window <= 0:
+            raise ValueError(f"Window must be a positive integer, got {window}")
+
+        self._window = window
+        self._values: List[Value] = []
+        self._index = 0
+        self._mean: Value = 0.0
+        self._m2: Value = 0.0
+
+    def _reanchor(self, stale: Union[bool, np.ndarray]) -> None:
+        """Recompute the mean and m2 of the `stale` entries from the window."""
+        values = np.array(self._values)
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        if isinstance(self._mean, np.ndarray):
+            self._mean = np.where(stale, mean, self._mean)
+            self._m2 = np.where(stale, m2, self._m2)
+        else:
+            self._mean, self._m2 = float(mean), float(m2)
+
+    def update(self, data: Value) -> Optional[Value]:
+        """
+        Update the variance with new data.
+
+        Args:
+            data: New data point to include in the calculation
+
+        Returns:
+            Variance of the last `window` values, or None while warming up
+        """
+        if len(self._values) < self._window:
+            self._values.append(data)
+            delta = data - self._mean
+            self._mean = self._mean + delta / len(self._values)
+            self._m2 = self._m2 + delta * (data - self._mean)
+            if len(self._values) < self._window:
+                return None
+        else:
+            old = self._values[self._index]
+            self._values[self._index] = data
+            self._index = (self._index + 1) % self._window
+            old_mean = self._mean
+            self._mean = self._mean + (data - old) / self._window
+            self._m2 = self._m2 + (data - old) * (data - self._mean + old - old_mean)
+            if isinstance(old, np.ndarray):
+                stale = ~np.isfinite(old)
+                if stale.any():
+                    self._reanchor(stale)
+            elif not math.isfinite(old):
+                self._reanchor(True)
+
+        # rounding can push a (near) zero variance slightly below zero
+        if isinstance(self._m2, np.ndarray):
+            return np.maximum(self._m2 / self._window, 0.0)
+        return max(self._m2 / self._window, 0.0)
+
+
+class RollingStandardDeviation(RollingVariance):
+    """Population standard deviation over a rolling window (see RollingVariance)."""
+
+    def update(self, data: Value) -> Optional[Value]:
+        """
+        Update the standard deviation with new data.
+
+        Args:
+            data: New data point to include in the calculation
+
+        Returns:
+            Standard deviation of the last `window` values, or None while
+            warming up
+        """
+        variance = super().update(data)
+        if variance is None:
+            return None
+        if isinstance(variance, np.ndarray):
+            return np.sqrt(variance)
+        return math.sqrt(variance)
+
+
+def _window_sum(values: np.ndarray, row: int, window: int) -> np.ndarray:
+    """Exact sum of the `window` rows ending at `row`, oldest first."""
+    total = np.zeros(values.shape[1:])
+    for lag in range(row - window + 1, row + 1):
+        total = total + values[lag]
+    return total
+
+
+def _rolling_sum(
+    values: np.ndarray, window: int, exact_zero: bool = False
+) -> np.ndarray:
+    """
+    Sum of the last `window` entries along the first axis (fewer while
+    warming up).
+
+    Applies the steps of _RollingSum to all columns at once, one row at a
+    time, so the sums are identical to feeding the rows to _RollingSum: a
+    running sum, replaced by the exact window sum when the ring buffer wraps
+    or the running sum is not finite, and with `exact_zero` reset to 0.0 on
+    all-zero windows.
+    """
+    shape = values.shape
+    # rows of a 1D series are single values; work on (rows x columns)
+    values = values.reshape(len(values), -1)
+    rows = len(values)
+    total = np.zeros(values.shape)
+    if not rows:
+        return total.reshape(shape)
+    # the exact sums at every wrap, one vectorized pass per lag
+    wraps = np.arange(2 * window - 1, rows, window)
+    exact = np.zeros((len(wraps),) + values.shape[1:])
+    for lag in range(window - 1, -1, -1):
+        exact += values[wraps - lag]
+    # finite inputs keep the running sum finite
+    check_finite = not np.isfinite(values).all()
+    if exact_zero:
+        nonzero = np.cumsum(values != 0, axis=0)
+        nonzero[window:] = nonzero[window:] - nonzero[:-window]
+        nonempty = nonzero != 0
+
+    wrap = 0
+    for row in range(rows):
+        current = total[row]
+        if row == 0:
+            np.add(current, values[0], out=current)
+        elif row < window:
+            np.add(total[row - 1], values[row], out=current)
+        elif wrap < len(wraps) and row == wraps[wrap]:
+            current[...] = exact[wrap]
+            wrap += 1
+        else:
+            np.add(total[row - 1], values[row], out=current)
+            np.subtract(current, values[row - window], out=current)
+            if check_finite:
+                stale = ~np.isfinite(current)
+                if stale.any():
+                    current[stale] = _window_sum(values, row, window)[stale]
+        if exact_zero:
+            np.multiply(current, nonempty[row], out=current)
+    return total.reshape(shape)
+
+
+def moving_average_matrix(prices: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple moving average of every column of a price panel.
+
+    Matches MovingAverage.update applied column by column: rows before a
+    full window average the values seen so far.
+
+    Args:
+        prices: 2D array of prices (dates x tickers)
+        window: The window size for the moving average
+
+    Returns:
+        Array of the same shape with the moving average at each row
+
+    Raises:
+        ValueError: If window is not a positive integer
+    """
+    if not isinstance(window, int) or window <= 0:
+        raise ValueError(f"Window must be a positive integer, got {window}")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    counts = np.minimum(np.arange(1, len(prices) + 1), window)
+    return _rolling_sum(prices, window) / counts.reshape((-1,) + (1,) * (prices.ndim - 1))
+
+
+def exponential_moving_average_matrix(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Exponential moving average of every column of a panel.
+
+    The recursion depends on the previous row, so it is applied across all
+    columns at once, one row at a time, with the same arithmetic as
+    ExponentialMovingAverage.update.
+
+    Args:
+        values: 2D array of values (dates x tickers)
+        period: The lookback period for the EMA
+
+    Returns:
+        Array of the same shape with the EMA at each row
+
+    Raises:
+        ValueError: If period is not a positive integer
+    """
+    if not isinstance(period, int) or period <= 0:
+        raise ValueError(f"Period must be a positive integer, got {period}")
+
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2 / (period + 1)
+    ema = np.empty_like(values)
+    if len(values):
+        ema[0] = values[0]
+    for row in range(1, len(values)):
+        ema[row] = alpha * values[row] + (1 - alpha) * ema[row - 1]
+    return ema
+
+
+def relative_strength_index_matrix(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    RelativeStrengthIndex of every column of a price panel.
+
+    Args:
+        prices: 2D array of prices (dates x tickers)
+        period: The lookback period
+
+    Returns:
+        Array of the same shape with the RSI at each row (NaN for the first
+        `period` rows)
+
+    Raises:
+        ValueError: If period is not an integer of at least 2
+    """
+    if not isinstance(period, int) or period < 2:
+        raise ValueError(f"Period must be an integer >= 2, got {period}")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    rsi = np.full(prices.shape, np.nan)
+    if len(prices) <= period:
+        return rsi
+
+    deltas = prices[1:] - prices[:-1]
+    gains, losses = _gain_loss(deltas)
+    up = _rolling_sum(gains, period - 1, exact_zero=True) / period
+    down = _rolling_sum(losses, period - 1, exact_zero=True) / period
+    rs = np.divide(up, down, out=np.zeros_like(down), where=down != 0)
+    rsi[period:] = (100 - (100 / (1 + rs)))[period - 1 :]
+    return rsi
+
+
+def rolling_standard_deviation_matrix(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    RollingStandardDeviation of every column of a panel.
+
+    Window sums of the values and their squares are differences of
+    cumulative sums, taken after centering each column on its mean to keep
+    the cancellation small. Windows containing a non-finite value are NaN.
+
+    Args:
+        values: 2D array of values (dates x tickers)
+        window: Number of values in the window
+
+    Returns:
+        Array of the same shape with the standard deviation at each row
+        (NaN until the window is full)
+
+    Raises:
+        ValueError: If window is not a positive integer
+    """
+    if not isinstance(window, int) or window <= 0:
+        raise ValueError(f"Window must be a positive integer, got {window}")
+
+    values = np.asarray(values, dtype=np.float64)
+    std = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return std
+
+    invalid = ~np.isfinite(values)
+    centered = np.where(invalid, 0.0, values)
+    centered -= centered.mean(axis=0)
+
+    def window_sums(column_values: np.ndarray) -> np.ndarray:
+        cumulative = np.cumsum(column_values, axis=0)
+        sums = cumulative[window - 1 :].copy()
+        sums[1:] -= cumulative[:-window]
+        return sums
+
+    total = window_sums(centered)
+    variance = np.maximum(window_sums(centered * centered) - total * total / window, 0.0)
+    variance /= window
+    variance[window_sums(invalid.astype(np.int64)) > 0] = np.nan
+    std[window - 1 :] = np.sqrt(variance)
+    return std
@@ -7,14 +7,16 @@ and sell signals when it crosses below.
 https://www.investopedia.com/terms/m/macd.asp
 """
 
-from typing import Dict, Any, Optional
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from models import MarketDataPoint, Signal, MarketAction, SignalList
-from .ema import ExponentialMovingAverage
-from .strategy import Strategy
+from models import MarketDataPoint, SignalList
+from .ema import ExponentialMovingAverage, exponential_moving_average_matrix
+from .strategy import RowActions, Strategy
 
 
 class MACDStrategy(Strategy):
@@ -81,6 +83,44 @@ class MACDStrategy(Strategy):
 
         return emas
 
+    def _tick_action(self, symbol: str, price: float) -> int:
+        """
+        Update the EMAs of a symbol and check for a MACD crossover.
+
+        Args:
+            symbol: Ticker symbol
+            price: New price
+
+        Returns:
+            1 (BUY) if MACD crosses above the signal line, -1 (SELL) if it
+            crosses below, 0 (HOLD) otherwise or while warming up
+        """
+        emas = self._get_emas(symbol)
+        emas["length"] += 1
+        short = emas["short"].update(price)
+        long = emas["long"].update(price)
+        macd = short - long
+        sig = emas["signal"].update(macd)
+
+        code = 0
+        # no crossover check until the EMAs are warm and a previous value exists
+        if emas["length"] >= self._macd_length and symbol in self._previous_macd:
+            prev_macd = self._previous_macd[symbol]
+            prev_sig = self._previous_sig[symbol]
+
+            # Buy if MACD crosses above signal line
+            if prev_macd <= prev_sig and macd > sig:
+                code = 1
+            # Sell if MACD crosses below signal line
+            elif prev_macd >= prev_sig and macd < sig:
+                code = -1
+
+        # Update previous values
+        self._previous_macd[symbol] = macd
+        self._previous_sig[symbol] = sig
+        self._record_indicators(symbol, price=price, macd=macd, sig=sig)
+        return code
+
     def generate_signals(self, *data: MarketDataPoint) -> SignalList:
         """
         Generate trading signals based on MACD crossover.
@@ -107,76 +147,71 @@ class MACDStrategy(Strategy):
             if not tick.symbol or not isinstance(tick.symbol, str):
                 raise ValueError(f"Invalid symbol: {tick.symbol}")
 
-            emas = self._get_emas(tick.symbol)
-            emas["length"] += 1
-            short = emas["short"].update(tick.price)
-            long = emas["long"].update(tick.price)
-            macd = short - long
-            sig = emas["signal"].update(macd)
-
-            if emas["length"] < self._macd_length:
-                signals.append(
-                    Signal(
-                        action=MarketAction.HOLD,
-                        symbol=tick.symbol,
-                        quantity=0,
-                        price=tick.price,
-                    )
-                )
-            else:
-                # Initialize previous values if not exists
-                if tick.symbol not in self._previous_macd:
-                    self._previous_macd[tick.symbol] = macd
-                    self._previous_sig[tick.symbol] = sig
-                    signals.append(
-                        Signal(
-                            action=MarketAction.HOLD,
-                            symbol=tick.symbol,
-                            quantity=0,
-                            price=tick.price,
-                        )
-                    )
-                else:
-                    prev_macd = self._previous_macd[tick.symbol]
-                    prev_sig = self._previous_sig[tick.symbol]
-
-                    # Buy if MACD crosses above signal line
-                    if prev_macd <= prev_sig and macd > sig:
-                        signals.append(
-                            Signal(
-                                action=MarketAction.BUY,
-                                symbol=tick.symbol,
-                                quantity=1,
-                                price=tick.price,
-                            )
-                        )
-                    # Sell if MACD crosses below signal line
-                    elif prev_macd >= prev_sig and macd < sig:
-                        signals.append(
-                            Signal(
-                                action=MarketAction.SELL,
-                                symbol=tick.symbol,
-                                quantity=1,
-                                price=tick.price,
-                            )
-                        )
-                    else:
-                        signals.append(
-                            Signal(
-                                action=MarketAction.HOLD,
-                                symbol=tick.symbol,
-                                quantity=0,
-                                price=tick.price,
-                            )
-                        )
-
-            # Update previous values
-            self._previous_macd[tick.symbol] = macd
-            self._previous_sig[tick.symbol] = sig
-            self._update_prices(tick)
-            self._indicator_history[tick.symbol]["macd"].append(macd)
-            self._indicator_history[tick.symbol]["sig"].append(sig)
+            code = self._tick_action(tick.symbol, tick.price)
+            signals.append(self._signal_from_code(code, tick.symbol, tick.price))
+
+        return signals
+
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> RowActions:
+        """
+        Generate MACD crossover actions for one row (no HOLDs).
+
+        Args:
+            timestamp: Timestamp of the row
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            (columns, codes) of the BUY/SELL signals
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        self._validate_price_matrix(prices.reshape(1, -1), symbols)
+        return self._row_actions(symbols, prices)
+
+    def _signal_matrix_params(self) -> Tuple[Any, ...]:
+        return (
+            self._short_window, self._long_window, self._signal_window, self._tolerance,
+        )
+
+    def generate_signal_matrix(
+        self, prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Generate MACD crossover signals for a whole price panel.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column (for indicator history)
+
+        Returns:
+            int8 array of 1 (BUY), -1 (SELL) or 0 (HOLD), same shape as prices
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        self._validate_price_matrix(prices, symbols)
+
+        short = exponential_moving_average_matrix(prices, self._short_window)
+        long = exponential_moving_average_matrix(prices, self._long_window)
+        macd = short - long
+        sig = exponential_moving_average_matrix(macd, self._signal_window)
 
+        # crossovers compare each row with the previous one
+        prev_macd, prev_sig = macd[:-1], sig[:-1]
+        cur_macd, cur_sig = macd[1:], sig[1:]
+        buy = (prev_macd <= prev_sig) & (cur_macd > cur_sig)
+        sell = ~buy & (prev_macd >= prev_sig) & (cur_macd < cur_sig)
+
+        signals = np.zeros(prices.shape, dtype=np.int8)
+        signals[1:][buy] = 1
+        signals[1:][sell] = -1
+        signals[: self._macd_length - 1] = 0
+
+        self._record_indicator_matrix(symbols, price=prices, macd=macd, sig=sig)
         return signals
 
     def plot_indicators(self, symbol: str) -> None:
@@ -189,15 +224,7 @@ class MACDStrategy(Strategy):
         Raises:
             ValueError: If no indicator history exists for the symbol
         """
-        if symbol not in self._indicator_history:
-            raise ValueError(f"No indicator history available for symbol: {symbol}")
-
-        if not self._indicator_history[symbol]:
-            raise ValueError(f"Empty indicator history for symbol: {symbol}")
-
-        df = pd.DataFrame(self._indicator_history[symbol])
-        if df.empty:
-            raise ValueError(f"No indicator data to plot for symbol: {symbol}")
+        df = self._indicator_frame(symbol)
 
         df["hist"] = df["macd"] - df["sig"]
 
@@ -6,15 +6,17 @@ crosses above the long-term moving average, and sell signals when it
 crosses below.
 """
 
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from config.constants import DEFAULT_SHORT_WINDOW, DEFAULT_LONG_WINDOW
-from models import MarketDataPoint, Signal, MarketAction, SignalList
-from .ema import MovingAverage
-from .strategy import Strategy
+from models import MarketDataPoint, SignalList
+from .ema import MovingAverage, moving_average_matrix
+from .strategy import RowActions, Strategy
 
 
 class MovingAverageStrategy(Strategy):
@@ -75,6 +77,29 @@ class MovingAverageStrategy(Strategy):
         self._moving_averages[symbol] = moving_averages
         return moving_averages
 
+    def _tick_action(self, symbol: str, price: float) -> int:
+        """
+        Update the moving averages of a symbol and compare them.
+
+        Args:
+            symbol: Ticker symbol
+            price: New price
+
+        Returns:
+            1 (BUY) if short MA > long MA, -1 (SELL) otherwise, 0 (HOLD)
+            until the long window is full
+        """
+        moving_averages = self._get_moving_average(symbol)
+        moving_averages["length"] += 1
+        short = moving_averages["short"].update(price)
+        long = moving_averages["long"].update(price)
+
+        self._record_indicators(symbol, price=price, short=short, long=long)
+
+        if moving_averages["length"] < self._long_window:
+            return 0
+        return 1 if short > long else -1
+
     def generate_signals(self, *data: MarketDataPoint) -> SignalList:
         """
         Generate trading signals based on moving average crossover.
@@ -101,47 +126,61 @@ class MovingAverageStrategy(Strategy):
             if not tick.symbol or not isinstance(tick.symbol, str):
                 raise ValueError(f"Invalid symbol: {tick.symbol}")
 
-            moving_averages = self._get_moving_average(tick.symbol)
-            moving_averages["length"] += 1
-            short = moving_averages["short"].update(tick.price)
-            long = moving_averages["long"].update(tick.price)
-
-            if moving_averages["length"] < self._long_window:
-                signals.append(
-                    Signal(
-                        action=MarketAction.HOLD,
-                        symbol=tick.symbol,
-                        quantity=0,
-                        price=tick.price,
-                    )
-                )
-            else:
-                if short > long:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.BUY,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-                else:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.SELL,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-
-            # Update internal state
-            self._update_prices(tick)
-            self._indicator_history[tick.symbol]["short"].append(short)
-            self._indicator_history[tick.symbol]["long"].append(long)
+            code = self._tick_action(tick.symbol, tick.price)
+            signals.append(self._signal_from_code(code, tick.symbol, tick.price))
 
         return signals
 
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> RowActions:
+        """
+        Generate moving average crossover actions for one row (no HOLDs).
+
+        Args:
+            timestamp: Timestamp of the row
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            (columns, codes) of the BUY/SELL signals
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        self._validate_price_matrix(prices.reshape(1, -1), symbols)
+        return self._row_actions(symbols, prices)
+
+    def _signal_matrix_params(self) -> Tuple[Any, ...]:
+        return self._short_window, self._long_window
+
+    def generate_signal_matrix(
+        self, prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Generate moving average crossover signals for a whole price panel.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column (for indicator history)
+
+        Returns:
+            int8 array of 1 (BUY), -1 (SELL) or 0 (HOLD), same shape as prices
+
+        Raises:
+            ValueError: If invalid market data is provided
+        """
+        self._validate_price_matrix(prices, symbols)
+
+        short = moving_average_matrix(prices, self._short_window)
+        long = moving_average_matrix(prices, self._long_window)
+
+        signals = np.where(short > long, 1, -1).astype(np.int8)
+        signals[: self._long_window - 1] = 0
+
+        self._record_indicator_matrix(symbols, price=prices, short=short, long=long)
+        return signals
+
     def plot_indicators(self, symbol: str) -> None:
         """
         Plot the moving average indicators for a given symbol.
@@ -152,15 +191,7 @@ class MovingAverageStrategy(Strategy):
         Raises:
             ValueError: If no indicator history exists for the symbol
         """
-        if symbol not in self._indicator_history:
-            raise ValueError(f"No indicator history available for symbol: {symbol}")
-
-        if not self._indicator_history[symbol]:
-            raise ValueError(f"Empty indicator history for symbol: {symbol}")
-
-        df = pd.DataFrame(self._indicator_history[symbol])
-        if df.empty:
-            raise ValueError(f"No indicator data to plot for symbol: {symbol}")
+        df = self._indicator_frame(symbol)
 
         fig, ax = plt.subplots(figsize=(12, 6))
         ax.plot(df.index, df["short"], label=f"Short MA ({self._short_window})")
@@ -0,0 +1,208 @@
+"""
+Indicator history recorder.
+
+This module provides the array-backed store behind Strategy.plot_indicators.
+Recording is off by default; when enabled it keeps either the last N values
+or the full history of every (symbol, indicator) series, optionally
+streaming full histories to disk.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.constants import DEFAULT_INDICATOR_CHUNK_SIZE, F64_EXTENSION
+
+
+class _Series:
+    """
+    One float64 indicator series.
+
+    With `keep` set the values live in a ring buffer of that size. Otherwise
+    the buffer grows by doubling, or, when `path` is given, is appended to
+    that file (raw float64) each time it fills up.
+    """
+
+    def __init__(self, keep: Optional[int], path: Optional[str], chunk_size: int) -> None:
+        self._keep = keep
+        self._path = path
+        self._buffer = np.empty(keep if keep is not None else chunk_size)
+        self._size = 0  # values currently in the buffer
+        self._total = 0  # values recorded so far
+        self._spilled = 0  # values written to `path`
+        if path is not None:
+            open(path, "wb").close()
+
+    @property
+    def dropped(self) -> int:
+        """Number of values no longer retained (last-N mode)."""
+        return self._total - self._spilled - self._size
+
+    def append(self, value: Optional[float]) -> None:
+        value = np.nan if value is None else value
+        if self._keep is not None:
+            self._buffer[self._total % self._keep] = value
+            self._size = min(self._size + 1, self._keep)
+        else:
+            if self._size == len(self._buffer):
+                if self._path is not None:
+                    self.flush()
+                else:
+                    self._buffer = np.resize(self._buffer, 2 * len(self._buffer))
+            self._buffer[self._size] = value
+            self._size += 1
+        self._total += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        count = len(values)
+        if self._keep is not None:
+            tail = values[-self._keep :]
+            first = self._total + count - len(tail)
+            self._buffer[(first + np.arange(len(tail))) % self._keep] = tail
+            self._size = min(self._size + count, self._keep)
+        elif self._path is not None:
+            self.flush()
+            with open(self._path, "ab") as f:
+                np.ascontiguousarray(values, dtype=np.float64).tofile(f)
+            self._spilled += count
+        else:
+            size = self._size + count
+            if size > len(self._buffer):
+                self._buffer = np.resize(self._buffer, max(size, 2 * len(self._buffer)))
+            self._buffer[self._size : size] = values
+            self._size = size
+        self._total += count
+
+    def flush(self) -> None:
+        if self._path is None or not self._size:
+            return
+        with open(self._path, "ab") as f:
+            self._buffer[: self._size].tofile(f)
+        self._spilled += self._size
+        self._size = 0
+
+    def values(self) -> np.ndarray:
+        """Retained values, oldest first."""
+        if self._keep is not None:
+            if self._total <= self._keep:
+                return self._buffer[: self._size].copy()
+            split = self._total % self._keep
+            return np.concatenate([self._buffer[split:], self._buffer[:split]])
+        if self._path is not None:
+            self.flush()
+            return np.fromfile(self._path, dtype=np.float64)
+        return self._buffer[: self._size].copy()
+
+
+class IndicatorRecorder:
+    """
+    Records indicator values per symbol for plotting.
+
+    Retention is set by `keep`: 0 records nothing, N keeps the last N values
+    of each series and None keeps the full history. With `path` (full
+    history only) every series is streamed to `path/<symbol>/<name>.f64` in
+    chunks, so memory stays bounded by `chunk_size` values per series.
+    """
+
+    def __init__(
+        self,
+        keep: Optional[int] = None,
+        path: Optional[str] = None,
+        chunk_size: int = DEFAULT_INDICATOR_CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the IndicatorRecorder.
+
+        Args:
+            keep: 0 (off), N (last N values per series) or None (everything)
+            path: Directory to stream full histories to
+            chunk_size: Values buffered per series before writing to `path`
+
+        Raises:
+            ValueError: If keep is negative, or path is given with keep set
+        """
+        if keep is not None and keep < 0:
+            raise ValueError(f"keep must be None or >= 0, got {keep}")
+        if path is not None and keep is not None:
+            raise ValueError("Spilling to disk requires full retention (keep=None)")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        self._keep = keep
+        self._path = path
+        self._chunk_size = chunk_size
+        self._series: Dict[str, Dict[str, _Series]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether anything is recorded."""
+        return self._keep != 0
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._series
+
+    def _get_series(self, symbol: str, name: str) -> _Series:
+        series = self._series.setdefault(symbol, {})
+        if name not in series:
+            path = None
+            if self._path is not None:
+                directory = os.path.join(self._path, symbol)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, name + F64_EXTENSION)
+            series[name] = _Series(self._keep, path, self._chunk_size)
+        return series[name]
+
+    def record(self, symbol: str, **values: Optional[float]) -> None:
+        """
+        Record one value per indicator for a symbol (None is stored as NaN).
+
+        Args:
+            symbol: Ticker symbol
+            **values: Indicator values keyed by indicator name
+        """
+        if not self.enabled:
+            return
+        for name, value in values.items():
+            self._get_series(symbol, name).append(value)
+
+    def record_matrix(self, symbols: List[str], **indicators: np.ndarray) -> None:
+        """
+        Record whole indicator columns.
+
+        Args:
+            symbols: Ticker symbols, one per column
+            **indicators: 2D arrays (dates x tickers) keyed by indicator name
+        """
+        if not self.enabled:
+            return
+        for name, values in indicators.items():
+            for column, symbol in enumerate(symbols):
+                self._get_series(symbol, name).extend(values[:, column])
+
+    def flush(self) -> None:
+        """Write buffered values to disk (no-op without `path`)."""
+        for series in self._series.values():
+            for values in series.values():
+                values.flush()
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Retained indicator values of a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            DataFrame with one column per indicator, indexed by tick number
+            (empty if nothing was recorded for the symbol)
+        """
+        series = self._series.get(symbol)
+        if not series:
+            return pd.DataFrame()
+        columns = {name: values.values() for name, values in series.items()}
+        # all series of a symbol are recorded together, so they line up
+        start = next(iter(series.values())).dropped
+        length = len(next(iter(columns.values())))
+        return pd.DataFrame(columns, index=pd.RangeIndex(start, start + length))
@@ -4,96 +4,127 @@ RSI Strategy Implementation
 This strategy generates buy signals when RSI < 30 (oversold condition).
 """
 
-# TODO: Fix indicator history tracking for RSI.
+from .strategy import RowActions, Strategy
+from models import MarketDataPoint, SignalList
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-
-from .strategy import Strategy
-from models import MarketDataPoint, Signal, MarketAction, SignalList
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from .ema import (
+    Indicator,
+    RelativeStrengthIndex,
+    WilderRSI,
+    relative_strength_index_matrix,
+)
+
 
 class RSIStrategy(Strategy):
-    def __init__(self):
+    def __init__(self, wilder: bool = False):
+        """
+        Initialize the RSI Strategy.
+
+        Args:
+            wilder: Use Wilder's smoothed RSI instead of the simple-average RSI
+        """
         super().__init__()
         self._buy_threshold = 30
         self._sell_threshold = 70
-        self._rsis = {}
+        self._rsis: dict[str, Indicator] = {}
         self._period = 14
+        self._wilder = wilder
+
+    def _new_rsi(self) -> Indicator:
+        if self._wilder:
+            return WilderRSI(self._period)
+        return RelativeStrengthIndex(self._period)
 
     def _get_rsi(self, symbol: str, price: float) -> float | None:
-        if symbol in self._rsis:
-            data = self._rsis[symbol]
-            if len(data) < self._period:
-                data.append(price)
-                self._rsis[symbol] = data
-                return None
-            else:
-                data.append(price)
-                if len(data) > self._period:
-                    data.pop(0)
-                deltas = np.diff(data)
-
-                up = deltas[deltas > 0].sum() / self._period
-                down = -deltas[deltas < 0].sum() / self._period
-                rs = up / down if down != 0 else 0
-                rsi = 100 - (100 / (1 + rs))
-                return rsi
-
-        data = [price]
-        self._rsis[symbol] = data
+        rsi = self._rsis.get(symbol)
+        if rsi is None:
+            rsi = self._rsis[symbol] = self._new_rsi()
+        return rsi.update(price)
+
+    def _tick_action(self, symbol: str, price: float) -> int:
+        rsi = self._get_rsi(symbol, price)
+        self._record_indicators(symbol, price=price, rsi=rsi)
+        if rsi is None:
+            return 0
+        if rsi < self._buy_threshold:
+            return 1
+        if rsi > self._sell_threshold:
+            return -1
+        return 0
 
     def generate_signals(self, *data: MarketDataPoint) -> SignalList:
-        signals = []
-        for tick in data:
-
-            rsi = self._get_rsi(tick.symbol, tick.price)
-            if rsi is None:
-                signals.append(
-                    Signal(
-                        action=MarketAction.HOLD,
-                        symbol=tick.symbol,
-                        quantity=0,
-                        price=tick.price,
-                    )
-                )
-
-            else:
-                if rsi < self._buy_threshold:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.BUY,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-
-                elif rsi > self._sell_threshold:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.SELL,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-
-                else:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.HOLD,
-                            symbol=tick.symbol,
-                            quantity=0,
-                            price=tick.price,
-                        )
-                    )
-
-            self._update_prices(tick)
-            self._indicator_history[tick.symbol]["rsi"].append(rsi)
-
+        return [
+            self._signal_from_code(
+                self._tick_action(tick.symbol, tick.price), tick.symbol, tick.price
+            )
+            for tick in data
+        ]
+
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> RowActions:
+        return self._row_actions(symbols, prices)
+
+    def _signal_matrix_params(self) -> Tuple[Any, ...]:
+        return self._period, self._wilder, self._buy_threshold, self._sell_threshold
+
+    def generate_signal_matrix(
+        self, prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Generate RSI threshold signals for a whole price panel.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column (for indicator history)
+
+        Returns:
+            int8 array of 1 (BUY), -1 (SELL) or 0 (HOLD), same shape as prices
+        """
+        if self._wilder:
+            # Wilder's smoothing is recursive: one calculator over whole rows
+            rsi = self._new_rsi().update_many(prices)
+        else:
+            rsi = relative_strength_index_matrix(prices, self._period)
+
+        signals = np.zeros(prices.shape, dtype=np.int8)
+        signals[rsi < self._buy_threshold] = 1
+        signals[rsi > self._sell_threshold] = -1
+
+        self._record_indicator_matrix(symbols, price=prices, rsi=rsi)
         return signals
 
-    def plot_indicators(self, symbol: str):
-        pass
+    def plot_indicators(self, symbol: str) -> None:
+        """
+        Plot the RSI and its buy/sell thresholds for a given symbol.
+
+        Args:
+            symbol: The ticker symbol to plot indicators for
+
+        Raises:
+            ValueError: If no indicator history exists for the symbol
+        """
+        df = self._indicator_frame(symbol)
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.plot(df.index, df["rsi"], label=f"RSI ({self._period})")
+        ax.axhline(
+            self._buy_threshold, color="green", linestyle="--", label="Buy threshold"
+        )
+        ax.axhline(
+            self._sell_threshold, color="red", linestyle="--", label="Sell threshold"
+        )
+        ax.set_ylim(0, 100)
+        ax.legend()
+        ax.grid(True)
+        ax.set_title(f"RSI Strategy for {symbol}")
+        ax.set_xlabel("Time")
+        ax.set_ylabel("RSI")
+        plt.tight_layout()
+        plt.show()
@@ -6,10 +6,17 @@ All concrete strategy implementations must inherit from this class.
 """
 
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from typing import Dict, List
+from datetime import datetime
+from typing import Any, Hashable, List, Optional, Tuple
 
-from models import MarketDataPoint, Signal, SignalList
+import numpy as np
+import pandas as pd
+
+from models import MarketAction, MarketDataPoint, Signal, SignalList
+from .recorder import IndicatorRecorder
+
+# sparse signals of one row: (column indices, int8 codes 1 = BUY / -1 = SELL)
+RowActions = Tuple[np.ndarray, np.ndarray]
 
 
 class Strategy(ABC):
@@ -21,22 +28,78 @@ class Strategy(ABC):
     provides the framework for signal generation.
     """
 
+    # quantity of every BUY/SELL signal taken from generate_signal_matrix or
+    # generate_row_actions
+    matrix_signal_quantity: int = 1
+
     def __init__(self) -> None:
-        """Initialize the strategy with empty price and indicator histories."""
-        self._prices: Dict[str, List[float]] = defaultdict(list)
-        self._indicator_history: Dict[str, Dict[str, List[float]]] = defaultdict(
-            lambda: defaultdict(list)
-        )
+        """Initialize the strategy with indicator recording turned off."""
+        self._indicator_history = IndicatorRecorder(keep=0)
+
+    def record_indicators(
+        self, keep: Optional[int] = None, path: Optional[str] = None
+    ) -> None:
+        """
+        Turn on indicator recording (needed for plot_indicators).
+
+        Call before running the strategy; previously recorded values are
+        discarded.
+
+        Args:
+            keep: None records the full history, N the last N values per
+                indicator and symbol, 0 turns recording off
+            path: Directory to stream the full history to instead of keeping
+                it in memory
+        """
+        self._indicator_history = IndicatorRecorder(keep=keep, path=path)
 
     def _update_prices(self, *data: MarketDataPoint) -> None:
         """
-        Update internal price history with new market data.
+        Record the prices of new market data (when recording is on).
 
         Args:
             *data: Variable number of MarketDataPoint objects
         """
+        if not self._indicator_history.enabled:
+            return
         for point in data:
-            self._prices[point.symbol].append(point.price)
+            self._indicator_history.record(point.symbol, price=point.price)
+
+    def _record_indicators(self, symbol: str, **values: Optional[float]) -> None:
+        """
+        Record one tick of indicator values for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            **values: Indicator values keyed by name (None while warming up)
+        """
+        if self._indicator_history.enabled:
+            self._indicator_history.record(symbol, **values)
+
+    def _indicator_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Recorded indicators of a symbol, for plot_indicators.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            DataFrame with one column per indicator
+
+        Raises:
+            ValueError: If nothing was recorded for the symbol
+        """
+        if not self._indicator_history.enabled:
+            raise ValueError(
+                "Indicator recording is off; call record_indicators() before running"
+            )
+        if symbol not in self._indicator_history:
+            raise ValueError(f"No indicator history available for symbol: {symbol}")
+
+        df = self._indicator_history.frame(symbol)
+        if df.empty:
+            raise ValueError(f"No indicator data to plot for symbol: {symbol}")
+        return df
 
     @abstractmethod
     def generate_signals(self, *data: MarketDataPoint) -> SignalList:
@@ -58,6 +121,200 @@ class Strategy(ABC):
         """
         raise NotImplementedError("Subclasses must implement this method")
 
+    def generate_signals_from_row(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> SignalList:
+        """
+        Generate trading signals from one row of the price panel.
+
+        The engine calls this with the raw price vector of a trading day. The
+        default wraps each price in a MarketDataPoint and delegates to
+        generate_signals; strategies that can work on the vector directly may
+        override it to skip building the data points.
+
+        Args:
+            timestamp: Timestamp of the row
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            List of trading signals to execute
+        """
+        return self.generate_signals(
+            *[
+                MarketDataPoint(timestamp=timestamp, symbol=symbol, price=price)
+                for symbol, price in zip(symbols, prices.tolist())
+            ]
+        )
+
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> Optional[RowActions]:
+        """
+        Generate only the actionable signals of one row of the price panel.
+
+        Optional sparse counterpart of generate_signals_from_row: instead of
+        one Signal per symbol (mostly HOLDs) it returns the columns that trade
+        and their action codes, each for matrix_signal_quantity units.
+        Implementations must make the same decisions and state updates as
+        generate_signals. The engine uses this path when it returns arrays
+        and falls back to generate_signals_from_row (skipping HOLDs)
+        otherwise.
+
+        Args:
+            timestamp: Timestamp of the row
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            (columns, codes) arrays, or None if the strategy only produces
+            Signal lists
+        """
+        return None
+
+    def _tick_action(self, symbol: str, price: float) -> int:
+        """
+        Update a symbol's state with a new price and decide what to do.
+
+        Strategies deciding one symbol at a time implement this once and get
+        both generate_signals (via _signal_from_code) and generate_row_actions
+        (via _row_actions) from it.
+
+        Args:
+            symbol: Ticker symbol
+            price: New price
+
+        Returns:
+            1 (BUY), -1 (SELL) or 0 (HOLD)
+        """
+        raise NotImplementedError("Subclass has not implemented this method")
+
+    def _signal_from_code(self, code: int, symbol: str, price: float) -> Signal:
+        """
+        Build the Signal of an action code (HOLDs have quantity 0).
+
+        Args:
+            code: 1 (BUY), -1 (SELL) or 0 (HOLD)
+            symbol: Ticker symbol
+            price: Price of the signal
+
+        Returns:
+            The trading signal
+        """
+        if code > 0:
+            action = MarketAction.BUY
+        elif code < 0:
+            action = MarketAction.SELL
+        else:
+            return Signal(action=MarketAction.HOLD, symbol=symbol, quantity=0, price=price)
+        return Signal(
+            action=action, symbol=symbol, quantity=self.matrix_signal_quantity, price=price
+        )
+
+    def _row_actions(self, symbols: List[str], prices: np.ndarray) -> RowActions:
+        """
+        Run _tick_action over a row and keep the non-HOLD results.
+
+        Args:
+            symbols: Ticker symbols, one per column
+            prices: float64 vector of prices aligned with symbols
+
+        Returns:
+            (columns, codes) of the actionable signals
+        """
+        columns: List[int] = []
+        codes: List[int] = []
+        for column, (symbol, price) in enumerate(zip(symbols, prices.tolist())):
+            code = self._tick_action(symbol, price)
+            if code:
+                columns.append(column)
+                codes.append(code)
+        return np.array(columns, dtype=np.intp), np.array(codes, dtype=np.int8)
+
+    def generate_signal_matrix(
+        self, prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Generate signals for a whole price panel at once.
+
+        Optional vectorized counterpart of generate_signals for strategies whose
+        signals depend only on the price history. Implementations must produce
+        the same decisions as feeding the panel row by row to generate_signals
+        on a fresh instance. The engine uses this path when it returns an array
+        and falls back to the per-tick path otherwise.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column; when given, indicator
+                history is recorded for plot_indicators
+
+        Returns:
+            int8 array of the same shape with 1 (BUY), -1 (SELL) or 0 (HOLD),
+            or None if the strategy only supports the per-tick path
+        """
+        return None
+
+    def signal_matrix_key(self) -> Optional[Hashable]:
+        """
+        Identify the signal matrix this strategy produces.
+
+        Two strategies with equal keys produce the same generate_signal_matrix
+        for the same panel, so engines running them may share one matrix
+        (see MultiEngine).
+
+        Returns:
+            Hashable key, or None if the matrix must not be shared (no
+            parameters declared, or indicator history is being recorded)
+        """
+        params = self._signal_matrix_params()
+        if params is None or self._indicator_history.enabled:
+            return None
+        return type(self), self.matrix_signal_quantity, params
+
+    def _signal_matrix_params(self) -> Optional[Tuple[Any, ...]]:
+        """
+        Parameters that determine generate_signal_matrix.
+
+        Returns:
+            Tuple of hashable values, or None if the strategy does not declare
+            them (its matrix is then never shared)
+        """
+        return None
+
+    @staticmethod
+    def _validate_price_matrix(
+        prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> None:
+        """
+        Apply the per-tick price check (price >= 0.01) to a whole panel.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column
+
+        Raises:
+            ValueError: If any price is invalid (the first in row order is reported)
+        """
+        invalid = prices < 0.01
+        if invalid.any():
+            row, col = np.argwhere(invalid)[0]
+            symbol = symbols[col] if symbols is not None else f"column {col}"
+            raise ValueError(f"Invalid price {prices[row, col]} for {symbol}")
+
+    def _record_indicator_matrix(
+        self, symbols: Optional[List[str]], **indicators: np.ndarray
+    ) -> None:
+        """
+        Record whole indicator columns in the indicator history.
+
+        Args:
+            symbols: Ticker symbols, one per column (nothing is stored if None)
+            **indicators: 2D arrays (dates x tickers) keyed by indicator name
+        """
+        if symbols is None or not self._indicator_history.enabled:
+            return
+        self._indicator_history.record_matrix(symbols, **indicators)
+
     @abstractmethod
     def plot_indicators(self, symbol: str) -> None:
         """
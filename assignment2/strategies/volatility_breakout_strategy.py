@@ -6,93 +6,91 @@ This strategy generates buy signals when daily return > rolling 20-day std dev.
 
 # TODO: Implement the VolatilityBreakoutStrategy class
 
-from .strategy import Strategy
-from models import MarketDataPoint, Signal, MarketAction, SignalList
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from .ema import RollingStandardDeviation, rolling_standard_deviation_matrix
+from .strategy import RowActions, Strategy
+from models import MarketDataPoint, SignalList
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
 
 class VolatilityBreakoutStrategy(Strategy):
-    def __init__(self):
-        super().__init__()
-        self._price_history: dict[str, list[float]] = {}
-        self._return_history: dict[str, list[float]] = {}
-
-
-    def _rolling_vol(self, returns: list[float], window: int = 20) -> float | None:
-        if len(returns) < window:
-            return None
-        return np.std(returns[-window:])
-
+    def __init__(self, window: int = 20):
+        """
+        Initialize the Volatility Breakout Strategy.
 
+        Args:
+            window: Number of returns in the rolling standard deviation
+        """
+        super().__init__()
+        self._window = window
+        self._last_price: dict[str, float] = {}
+        self._volatility: dict[str, RollingStandardDeviation] = {}
+
+    def _tick_action(self, symbol: str, price: float) -> int:
+        # Update last price and get return
+        previous = self._last_price.get(symbol)
+        self._last_price[symbol] = price
+        if previous is None:
+            return 0
+        ret = (price - previous) / previous
+
+        if symbol not in self._volatility:
+            self._volatility[symbol] = RollingStandardDeviation(self._window)
+        vol = self._volatility[symbol].update(ret)
+
+        if vol is None:
+            return 0
+        if ret > vol:
+            return 1
+        if ret < -vol:
+            return -1
+        return 0
 
     def generate_signals(self, *data: MarketDataPoint) -> SignalList:
-        signals = []
-        for tick in data:
-            # Update price history and get return
-            if tick.symbol in self._price_history:
-                self._price_history[tick.symbol].append(tick.price)
-                ret = (tick.price - self._price_history[tick.symbol][-2]) / self._price_history[tick.symbol][-2]
-                if tick.symbol in self._return_history:
-                    self._return_history[tick.symbol].append(ret)
-                else:
-                    self._return_history[tick.symbol] = [ret]
-
-                vol = self._rolling_vol(self._return_history[tick.symbol])
-
-
-
-                if ret is None or vol is None:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.HOLD,
-                            symbol=tick.symbol,
-                            quantity=0,
-                            price=tick.price,
-                        )
-                    )
-                    continue
-
-                if ret > vol:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.BUY,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-                elif ret < -vol:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.SELL,
-                            symbol=tick.symbol,
-                            quantity=1,
-                            price=tick.price,
-                        )
-                    )
-                else:
-                    signals.append(
-                        Signal(
-                            action=MarketAction.HOLD,
-                            symbol=tick.symbol,
-                            quantity=0,
-                            price=tick.price,
-                        )
-                    )
-
-            else:
-                self._price_history[tick.symbol] = [tick.price]
-                signals.append(
-                    Signal(
-                        action=MarketAction.HOLD,
-                        symbol=tick.symbol,
-                        quantity=0,
-                        price=tick.price,
-                    )
-                )
-
+        return [
+            self._signal_from_code(
+                self._tick_action(tick.symbol, tick.price), tick.symbol, tick.price
+            )
+            for tick in data
+        ]
+
+    def generate_row_actions(
+        self, timestamp: datetime, symbols: List[str], prices: np.ndarray
+    ) -> RowActions:
+        return self._row_actions(symbols, prices)
+
+    def _signal_matrix_params(self) -> Tuple[Any, ...]:
+        return (self._window,)
+
+    def generate_signal_matrix(
+        self, prices: np.ndarray, symbols: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Generate volatility breakout signals for a whole price panel.
+
+        Args:
+            prices: float64 array of prices (dates x tickers)
+            symbols: Ticker symbols, one per column (unused, no indicators kept)
+
+        Returns:
+            int8 array of 1 (BUY), -1 (SELL) or 0 (HOLD), same shape as prices
+        """
+        returns = (prices[1:] - prices[:-1]) / prices[:-1]
+
+        # vol[t] is the std of the `window` returns ending at row t
+        vol = np.full(prices.shape, np.nan)
+        vol[1:] = rolling_standard_deviation_matrix(returns, self._window)
+
+        ret = np.full(prices.shape, np.nan)
+        ret[1:] = returns
+
+        signals = np.zeros(prices.shape, dtype=np.int8)
+        signals[ret > vol] = 1
+        signals[ret < -vol] = -1
         return signals
 
     def plot_indicators(self, symbol):
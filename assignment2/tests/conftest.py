@@ -0,0 +1,50 @@
+# tests/conftest.py
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def tick_only(strategy):
+    # hide the vectorized path so the engine feeds the strategy row by row
+    strategy.generate_signal_matrix = lambda prices, symbols=None: None
+    return strategy
+
+
+def assert_same_run(expected, actual, rtol=0.0):
+    # same trades, and the same NAV up to rtol (exactly by default)
+    trades = expected.get_signal_dataframe()
+    assert not trades.empty
+    pd.testing.assert_frame_equal(trades, actual.get_signal_dataframe(), check_exact=True)
+    nav = {"rtol": rtol} if rtol else {"check_exact": True}
+    pd.testing.assert_frame_equal(
+        expected.get_nav_dataframe(), actual.get_nav_dataframe(), **nav
+    )
+
+
+@pytest.fixture
+def prices():
+    # deterministic random walk: 300 trading days x 5 tickers
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0003, 0.02, (300, 5))
+    index = pd.bdate_range("2020-01-01", periods=300, name="Date")
+    return pd.DataFrame(
+        100 * np.exp(np.cumsum(returns, axis=0)),
+        index=index,
+        columns=[f"T{i}" for i in range(5)],
+    )
+
+
+@pytest.fixture
+def flat_prices():
+    # cent-rounded random walk with trading halts: each ticker is flat for
+    # whole 20-day stretches, where moving averages of the same price must tie
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.0003, 0.02, (600, 20))
+    halted = rng.random((30, 20)) < 0.4
+    returns[np.repeat(halted, 20, axis=0)] = 0.0
+    index = pd.bdate_range("2020-01-01", periods=600, name="Date")
+    return pd.DataFrame(
+        np.round(100 * np.exp(np.cumsum(returns, axis=0)), 2),
+        index=index,
+        columns=[f"T{i}" for i in range(20)],
+    )
@@ -0,0 +1,94 @@
+# tests/test_execution.py
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import assert_same_run, tick_only
+
+from engine import Engine
+from portfolio import ArrayPortfolio, CostModel, ExecutionModel
+from strategies import MACDStrategy, MovingAverageStrategy, RSIStrategy
+
+MODELS = {
+    "costs": CostModel(commission=1.0, commission_bps=5.0, slippage_bps=10.0),
+    "capped": CostModel(slippage_bps=5.0, max_order_quantity=1),
+    "target": CostModel(commission=2.0, target_weight=0.3),
+}
+PORTFOLIOS = {
+    "long": {},
+    "short": {"short": True},
+    "leveraged": {"short": True, "negative_cash": True},
+}
+
+
+def run(strategy, prices, **options):
+    engine = Engine(strategy, **options)
+    engine.run(prices)
+    return engine.get_report()
+
+
+@pytest.mark.parametrize("portfolio", PORTFOLIOS)
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("strategy", [MovingAverageStrategy, MACDStrategy, RSIStrategy])
+def test_vectorized_fills_match_per_order_fills(prices, strategy, model, portfolio):
+    options = {"execution": MODELS[model], **PORTFOLIOS[portfolio]}
+    per_order = run(strategy(), prices, **options)
+    vectorized = run(strategy(), prices, array_portfolio=True, **options)
+    # the dict Portfolio sums the NAV in a different order
+    assert_same_run(per_order, vectorized, rtol=1e-12)
+
+
+def test_vectorized_fills_from_signal_lists(prices):
+    options = {"execution": MODELS["costs"], "short": True}
+    per_order = run(MACDStrategy(), prices, **options)
+    vectorized = run(tick_only(MACDStrategy()), prices, array_portfolio=True, **options)
+    # the dict Portfolio sums the NAV in a different order
+    assert_same_run(per_order, vectorized, rtol=1e-12)
+
+
+@pytest.mark.parametrize("array_portfolio", [False, True])
+def test_frictionless_model_matches_default(prices, array_portfolio):
+    default = run(MACDStrategy(), prices, array_portfolio=array_portfolio)
+    frictionless = run(
+        MACDStrategy(), prices, array_portfolio=array_portfolio, execution=ExecutionModel()
+    )
+    pd.testing.assert_frame_equal(
+        default.get_signal_dataframe(), frictionless.get_signal_dataframe(), check_exact=True
+    )
+    pd.testing.assert_frame_equal(
+        default.get_nav_dataframe(), frictionless.get_nav_dataframe(), check_exact=True
+    )
+
+
+@pytest.mark.parametrize("short", [False, True])
+def test_execute_fills_matches_execute_fill(short):
+    symbols = ["A", "B", "C", "D", "E"]
+    # C overdraws cash, E shorts; D still fits in the cash C left over
+    columns = np.array([0, 1, 2, 3, 4])
+    quantities = np.array([5.0, -3.0, 40.0, 2.0, -4.0])
+    prices = np.array([10.0, 20.0, 25.0, 30.0, 12.5])
+    fees = np.array([1.0, 1.0, 1.0, 1.0, 0.5])
+
+    expected = ArrayPortfolio(symbols, cash=500.0, short=short)
+    expected.execute_fill("B", 4.0, 18.0)
+    actual = ArrayPortfolio(symbols, cash=500.0, short=short)
+    actual.execute_fill("B", 4.0, 18.0)
+
+    executed = []
+    for column, quantity, price, fee in zip(columns, quantities, prices, fees):
+        try:
+            expected.execute_fill(symbols[column], quantity, price, fee)
+        except Exception:
+            executed.append(False)
+        else:
+            executed.append(True)
+
+    mask = actual.execute_fills(columns, quantities, prices, fees)
+    assert mask.tolist() == executed == [True, True, False, True, short]
+    assert actual.assets == expected.assets
+
+    timestamp = datetime(2024, 1, 1)
+    expected.update_history(timestamp)
+    actual.update_history(timestamp)
+    assert actual.history == expected.history
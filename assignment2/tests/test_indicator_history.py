@@ -0,0 +1,34 @@
+# tests/test_indicator_history.py
+import matplotlib
+import numpy as np
+import pytest
+from conftest import tick_only
+
+from engine import Engine
+from strategies import RSIStrategy
+
+matplotlib.use("Agg")
+
+
+@pytest.mark.parametrize("path", [lambda s: s, tick_only], ids=["matrix", "per_tick"])
+def test_rsi_records_and_plots_indicators(path, prices, monkeypatch):
+    strategy = path(RSIStrategy())
+    strategy.record_indicators()
+    Engine(strategy).run(prices)
+
+    frame = strategy._indicator_frame("T0")
+    assert list(frame.columns) == ["price", "rsi"]
+    assert len(frame) == len(prices)
+    np.testing.assert_array_equal(frame["price"], prices["T0"].to_numpy())
+    assert frame["rsi"].iloc[:14].isna().all()
+    assert frame["rsi"].iloc[14:].between(0, 100).all()
+
+    monkeypatch.setattr("matplotlib.pyplot.show", lambda: None)
+    strategy.plot_indicators("T0")
+
+
+def test_rsi_plot_requires_recording(prices):
+    strategy = RSIStrategy()
+    Engine(strategy).run(prices)
+    with pytest.raises(ValueError, match="record_indicators"):
+        strategy.plot_indicators("T0")
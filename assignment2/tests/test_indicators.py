@@ -0,0 +1,104 @@
+# tests/test_indicators.py
+import numpy as np
+import pytest
+
+from strategies.ema import (
+    ExponentialMovingAverage,
+    MovingAverage,
+    RelativeStrengthIndex,
+    RollingStandardDeviation,
+    exponential_moving_average_matrix,
+    moving_average_matrix,
+    relative_strength_index_matrix,
+    rolling_standard_deviation_matrix,
+)
+
+
+def reference_moving_average(values, window):
+    # mean of the values seen so far, over at most `window` of them
+    return np.array(
+        [np.mean(values[max(0, i + 1 - window) : i + 1]) for i in range(len(values))]
+    )
+
+
+@pytest.fixture
+def panel(prices):
+    return prices.to_numpy()
+
+
+def test_moving_average_recovers_after_nan_gap():
+    values = np.linspace(100.0, 130.0, 60)
+    values[20:23] = np.nan
+    expected = reference_moving_average(values, 5)
+
+    ma = MovingAverage(5)
+    per_tick = np.array([ma.update(value) for value in values.tolist()])
+
+    # NaN while the gap is in the window, exact averages again afterwards
+    assert np.isnan(per_tick[20:27]).all()
+    np.testing.assert_allclose(per_tick, expected, rtol=1e-12)
+    np.testing.assert_allclose(moving_average_matrix(values, 5), expected, rtol=1e-12)
+
+
+def test_moving_average_rows_recover_after_nan_gap(panel):
+    panel = panel.copy()
+    panel[50:52, 1] = np.nan
+    rows = MovingAverage(10).update_many(panel)
+    expected = moving_average_matrix(panel, 10)
+
+    assert np.isnan(rows[50:61, 1]).all()
+    assert np.isfinite(rows[61:]).all()
+    np.testing.assert_allclose(rows, expected, rtol=1e-12)
+
+
+def test_rolling_standard_deviation_recovers_after_nan_gap(panel):
+    panel = panel.copy()
+    panel[50, 3] = np.nan
+    rows = RollingStandardDeviation(20).update_many(panel)
+    std = RollingStandardDeviation(20)
+    column = [std.update(value) for value in panel[:, 3].tolist()]
+    expected = rolling_standard_deviation_matrix(panel, 20)
+
+    assert np.isnan(expected[50:70, 3]).all()
+    assert np.isfinite(expected[70:]).all()
+    np.testing.assert_allclose(rows, expected, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(
+        np.array(column[19:], dtype=float), expected[19:, 3], rtol=1e-9, atol=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "make, matrix, size",
+    [
+        (MovingAverage, moving_average_matrix, 20),
+        (ExponentialMovingAverage, exponential_moving_average_matrix, 12),
+        (RelativeStrengthIndex, relative_strength_index_matrix, 14),
+        (RollingStandardDeviation, rolling_standard_deviation_matrix, 20),
+    ],
+    ids=["sma", "ema", "rsi", "std"],
+)
+def test_matrix_kernels_match_per_tick(make, matrix, size, panel):
+    per_tick = np.column_stack(
+        [make(size).update_many(panel[:, column]) for column in range(panel.shape[1])]
+    )
+    np.testing.assert_allclose(matrix(panel, size), per_tick, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "make, matrix, size",
+    [
+        (MovingAverage, moving_average_matrix, 20),
+        (MovingAverage, moving_average_matrix, 50),
+        (ExponentialMovingAverage, exponential_moving_average_matrix, 12),
+        (RelativeStrengthIndex, relative_strength_index_matrix, 14),
+    ],
+    ids=["sma20", "sma50", "ema", "rsi"],
+)
+def test_matrix_kernels_are_identical_on_flat_prices(make, matrix, size, flat_prices):
+    panel = flat_prices.to_numpy(copy=True)
+    panel[100:103, 2] = np.nan
+    per_tick = np.column_stack(
+        [make(size).update_many(panel[:, column]) for column in range(panel.shape[1])]
+    )
+    np.testing.assert_array_equal(matrix(panel, size), per_tick)
+    np.testing.assert_array_equal(make(size).update_many(panel), per_tick)
@@ -0,0 +1,110 @@
+# tests/test_multi_engine.py
+import pytest
+from conftest import assert_same_run, tick_only
+
+from engine import Engine, MultiEngine
+from portfolio import CostModel
+from strategies import (
+    BenchmarkStrategy,
+    MACDStrategy,
+    MovingAverageStrategy,
+    RSIStrategy,
+    VolatilityBreakoutStrategy,
+)
+
+OPTIONS = {
+    "long": {},
+    "short": {"short": True, "negative_cash": True},
+    "costs": {"execution": CostModel(commission=1.0, slippage_bps=5.0)},
+}
+
+
+def separate(engines, prices):
+    for engine in engines.values():
+        engine.run(prices)
+    return engines
+
+
+def make_engines():
+    return {
+        f"{strategy.__name__} {setting}": Engine(strategy(), **options)
+        for strategy in [MovingAverageStrategy, MACDStrategy, RSIStrategy]
+        for setting, options in OPTIONS.items()
+    }
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_shared_matrices_match_separate_runs(prices, processes):
+    expected = separate(make_engines(), prices)
+    multi = MultiEngine(make_engines(), processes=processes)
+    multi.run(prices)
+
+    assert list(multi.engines) == list(expected)
+    for name, engine in multi.engines.items():
+        assert_same_run(expected[name].get_report(), engine.get_report())
+
+
+def test_engines_are_grouped_by_signal_matrix_key():
+    multi = MultiEngine(
+        {
+            "ma": MovingAverageStrategy(),
+            "ma short": Engine(MovingAverageStrategy(), short=True),
+            "ma slow": MovingAverageStrategy(short_window=50, long_window=200),
+            "vol": VolatilityBreakoutStrategy(),
+            "benchmark": BenchmarkStrategy(),
+            "benchmark 2": BenchmarkStrategy(),
+        }
+    )
+    assert multi._groups() == [
+        ["ma", "ma short"],
+        ["ma slow"],
+        ["vol"],
+        ["benchmark"],
+        ["benchmark 2"],
+    ]
+
+
+def test_recording_strategies_are_not_shared():
+    recording = MovingAverageStrategy()
+    recording.record_indicators()
+    assert recording.signal_matrix_key() is None
+    assert MovingAverageStrategy().signal_matrix_key() is not None
+
+
+def test_per_tick_strategies_run_on_their_own(prices):
+    names = ["long", "short"]
+    expected = {
+        name: Engine(tick_only(MACDStrategy()), **OPTIONS[name]) for name in names
+    }
+    separate(expected, prices)
+    multi = MultiEngine(
+        {name: Engine(tick_only(MACDStrategy()), **OPTIONS[name]) for name in names}
+    )
+    multi.run(prices)
+    for name in names:
+        assert_same_run(
+            expected[name].get_report(), multi.engines[name].get_report()
+        )
+
+
+def test_sequence_of_engines_is_named_after_their_strategies():
+    multi = MultiEngine([Engine(MACDStrategy()), RSIStrategy()])
+    assert list(multi.engines) == ["MACDStrategy", "RSIStrategy"]
+
+
+def test_stepping_api_matches_run(prices):
+    expected = Engine(MovingAverageStrategy())
+    expected.run(prices)
+
+    engine = Engine(MovingAverageStrategy())
+    data = Engine.prepare(prices)
+    engine.start(data, engine.signal_matrix(data))
+    for i in range(len(data.timestamps)):
+        engine.step(i)
+    engine.finish()
+    assert_same_run(expected.get_report(), engine.get_report())
+
+
+def test_step_requires_start():
+    with pytest.raises(ValueError, match="start"):
+        Engine(MovingAverageStrategy()).step(0)
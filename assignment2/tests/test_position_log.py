@@ -0,0 +1,53 @@
+# tests/test_position_log.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from portfolio import PositionLog
+
+START = datetime(2024, 1, 1)
+
+
+def day(i):
+    return START + timedelta(days=i)
+
+
+@pytest.fixture
+def log():
+    log = PositionLog({"CASH": {"quantity": 100.0, "avg_price": 1.0}})
+    for i in range(10):
+        if i in (2, 7):
+            log.record("AAPL", float(i), 10.0 + i)
+            log.record("CASH", 100.0 - i, 1.0)
+        log.commit(day(i))
+    return log
+
+
+def test_only_days_with_changes_store_deltas(log):
+    assert len(log) == 10
+    assert log.timestamps == [day(i) for i in range(10)]
+    assert len(log._deltas) == 2
+
+
+def test_positions_at(log):
+    assert log.positions_at(day(-1)) == {"CASH": {"quantity": 100.0, "avg_price": 1.0}}
+    assert log.positions_at(day(1)) == {"CASH": {"quantity": 100.0, "avg_price": 1.0}}
+    assert log.positions_at(day(5))["AAPL"] == {"quantity": 2.0, "avg_price": 12.0}
+    assert log.positions_at(day(9))["AAPL"] == {"quantity": 7.0, "avg_price": 17.0}
+    assert log.positions_at(day(9))["CASH"]["quantity"] == 93.0
+
+
+def test_to_dict_matches_positions_at(log):
+    history = log.to_dict()
+    assert list(history) == log.timestamps
+    for timestamp, positions in history.items():
+        assert positions == log.positions_at(timestamp)
+
+
+def test_recommit_merges_and_earlier_timestamp_raises(log):
+    log.record("MSFT", 1.0, 50.0)
+    log.commit(day(9))
+    assert len(log) == 10
+    assert log.positions_at(day(9))["MSFT"] == {"quantity": 1.0, "avg_price": 50.0}
+    with pytest.raises(ValueError):
+        log.commit(day(8))
@@ -0,0 +1,50 @@
+# tests/test_signal_matrix.py
+import pytest
+from conftest import assert_same_run, tick_only
+
+from engine import Engine
+from strategies import (
+    MACDStrategy,
+    MovingAverageStrategy,
+    RSIStrategy,
+    VolatilityBreakoutStrategy,
+)
+
+STRATEGIES = [MovingAverageStrategy, MACDStrategy, RSIStrategy, VolatilityBreakoutStrategy]
+
+
+def run(strategy, prices):
+    engine = Engine(strategy)
+    engine.run(prices)
+    return engine.get_report()
+
+
+@pytest.mark.parametrize("panel", ["prices", "flat_prices"])
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: s.__name__)
+def test_signal_matrix_matches_per_tick(strategy, panel, request):
+    # flat_prices has cent-rounded flat stretches, where indicators tie
+    prices = request.getfixturevalue(panel)
+    assert strategy().generate_signal_matrix(prices.to_numpy()) is not None
+
+    matrix = run(strategy(), prices)
+    per_tick = run(tick_only(strategy()), prices)
+
+    assert_same_run(matrix, per_tick)
+
+
+@pytest.mark.parametrize(
+    "strategy", [MovingAverageStrategy, MACDStrategy], ids=lambda s: s.__name__
+)
+@pytest.mark.parametrize("path", [lambda s: s, tick_only], ids=["matrix", "per_tick"])
+def test_price_below_minimum_raises(strategy, path, prices):
+    prices.iloc[100, 2] = 0.005
+    with pytest.raises(ValueError, match="Invalid price 0.005 for T2"):
+        run(path(strategy()), prices)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: s.__name__)
+@pytest.mark.parametrize("path", [lambda s: s, tick_only], ids=["matrix", "per_tick"])
+def test_non_positive_price_raises(strategy, path, prices):
+    prices.iloc[100, 2] = 0.0
+    with pytest.raises(ValueError, match="Invalid price 0.0 for T2"):
+        run(path(strategy()), prices)
@@ -0,0 +1,74 @@
+# tests/test_walk_forward.py
+import pandas as pd
+import pytest
+from conftest import tick_only
+
+from engine import Engine, WalkForward
+from strategies import MovingAverageStrategy
+
+GRID = {"short_window": [5, 10], "long_window": [20, 40]}
+
+
+def evaluate(prices, processes=None):
+    evaluation = WalkForward(
+        MovingAverageStrategy, GRID, train_size=100, test_size=50, processes=processes
+    )
+    evaluation.run(prices)
+    return evaluation
+
+
+def test_windows_cover_the_data(prices):
+    results = evaluate(prices).get_results()
+    assert len(results) == 4
+    assert list(results["test_start"]) == list(prices.index[[100, 150, 200, 250]])
+    assert results["test_end"].iloc[-1] == prices.index[-1]
+
+
+def test_test_windows_match_engine_runs(prices):
+    evaluation = evaluate(prices)
+    results = evaluation.get_results()
+    for (_, row), report in zip(results.iterrows(), evaluation.get_reports()):
+        # the train rows only warm the strategy up
+        window = prices.loc[row["train_start"] : row["test_end"]]
+        engine = Engine(MovingAverageStrategy(**row["params"]))
+        engine.run_prepared(
+            Engine.prepare(window), warmup=window.index.get_loc(row["test_start"])
+        )
+        pd.testing.assert_frame_equal(
+            engine.get_report().get_nav_dataframe(), report.get_nav_dataframe()
+        )
+
+
+def test_test_windows_trade_before_indicators_warm_up_in_window(prices):
+    evaluation = evaluate(prices)
+    params = evaluation.get_results()["params"]
+    for report, long_window in zip(evaluation.get_reports(), params.str["long_window"]):
+        # a cold long moving average has no value before its last window row
+        nav = report.get_nav_dataframe()
+        assert report.get_signal_dataframe().index.min() < nav.index[long_window - 1]
+
+
+def test_per_tick_warm_up_matches_signal_matrix(prices):
+    matrix = evaluate(prices)
+    per_tick = WalkForward(
+        lambda **params: tick_only(MovingAverageStrategy(**params)),
+        GRID,
+        train_size=100,
+        test_size=50,
+    )
+    per_tick.run(prices)
+    pd.testing.assert_series_equal(
+        matrix.get_equity_curve(), per_tick.get_equity_curve(), check_exact=True
+    )
+
+
+def test_processes_match_serial(prices):
+    serial = evaluate(prices)
+    parallel = evaluate(prices, processes=2)
+    pd.testing.assert_series_equal(serial.get_equity_curve(), parallel.get_equity_curve())
+    assert list(serial.get_results()["params"]) == list(parallel.get_results()["params"])
+
+
+def test_too_little_data_raises(prices):
+    with pytest.raises(ValueError, match="walk-forward window"):
+        evaluate(prices.iloc[:100])